@@ -2,7 +2,7 @@
 
 import traceback
 from concurrent.futures import ThreadPoolExecutor
-from datetime import timedelta
+from pathlib import Path
 from queue import SimpleQueue
 
 import structlog
@@ -15,13 +15,20 @@ from .app.tool.json_encoder import ModelEncoder
 from .config import settings
 from .domain.service.factory import ServiceFactory
 from .domain.service.identity import IdentityService
-from .infra.data.cache import TimeBasedCache
+from .infra.data.cache import LRUCache, PersistentCache
 from .infra.data.manager import DataManager, StorageType
+from .infra.data.metadata import MetadataStore
+from .infra.data.migration import migrate_json_to_journal, migrate_json_to_sqlite
 from .infra.data.repo.factory import RepoFactory
 from .infra.facade import InfraFacade
 from .infra.io.factory import IoFactory
 from .infra.log.module import init as init_logging
+from .infra.media.bandwidth import BandwidthGovernor
+from .infra.media.downloader import METADATA_OPTIONS
+from .infra.media.extraction import MetadataExtractor
 from .infra.media.factory import MediaFactory
+from .infra.media.format import FormatPolicy
+from .infra.media.scheduler import DownloadScheduler
 from .infra.service.factory import ServiceFactory as InfraServiceFactory
 
 
@@ -40,6 +47,40 @@ def run_server(logger, infra_facade):
     return True
 
 
+def connect_database(data_manager):
+    storage = StorageType[settings["database.storage"].upper()]
+    if storage is StorageType.SQLITE:
+        sqlite_file = settings["database.sqlite_file"]
+        if not Path(sqlite_file).exists() and Path(settings["database.file"]).exists():
+            migrate_json_to_sqlite(settings["database.file"], sqlite_file)
+        return data_manager.connect(storage, path=sqlite_file, cls=ModelEncoder)
+    if storage is StorageType.JOURNAL:
+        journal_file = settings["database.journal_file"]
+        if not Path(journal_file).exists() and Path(settings["database.file"]).exists():
+            migrate_json_to_journal(settings["database.file"], journal_file)
+        return data_manager.connect(
+            storage,
+            path=journal_file,
+            snapshot_changes=settings["database.snapshot_changes"],
+            cls=ModelEncoder,
+        )
+
+    storage_options = {}
+    if storage is StorageType.BUFFERED_JSON:
+        storage_options = {
+            "flush_interval": settings["database.flush_interval"],
+            "flush_changes": settings["database.flush_changes"],
+        }
+    return data_manager.connect(
+        storage,
+        path=settings["database.file"],
+        indent=4,
+        separators=(",", ": "),
+        cls=ModelEncoder,
+        **storage_options,
+    )
+
+
 def run_init_workflow(app_facade, data_facade):
     queue = SimpleQueue()
 
@@ -74,20 +115,59 @@ def main(argv=None):
     infra_service_factory = InfraServiceFactory()
     service_factory = ServiceFactory(infra_service_factory)
 
-    repo_factory = RepoFactory()
+    repo_factory = RepoFactory(indexed=settings["database.indexed"])
     data_manager = DataManager(repo_factory)
-    data_facade = data_manager.connect(
-        StorageType.JSON,
-        path=settings["database.file"],
-        indent=4,
-        separators=(",", ": "),
-        cls=ModelEncoder,
-    )
+    data_facade = connect_database(data_manager)
 
     io_factory = IoFactory()
-    downloader_executor = ThreadPoolExecutor(settings["downloader.max_concurrency"])
-    media_cache = TimeBasedCache(max_duration=timedelta(minutes=2))
-    media_factory = MediaFactory(VlcInstance(), downloader_executor, media_cache)
+    download_scheduler = DownloadScheduler(
+        settings["downloader.max_concurrency"],
+        settings["downloader.aging_interval"],
+        settings["downloader.max_host_connections"],
+    )
+    media_cache = LRUCache(
+        max_entries=settings["cache.max_entries"],
+        max_size=settings["cache.max_size"] * 1024 * 1024,
+        ttl=settings["cache.ttl"],
+        cleanup_interval=settings["cache.cleanup_interval"],
+    )
+    metadata_store = None
+    if settings["cache.persistent"]:
+        metadata_store = MetadataStore(
+            settings["cache.metadata_file"],
+            max_size=settings["cache.metadata_max_size"] * 1024 * 1024,
+            ttls=settings["cache.metadata_ttl"],
+            volatile_ttl=settings["cache.stream_ttl"],
+        )
+    metadata_extractor = None
+    if settings["downloader.metadata_processes"]:
+        metadata_extractor = MetadataExtractor(
+            settings["downloader.metadata_processes"], METADATA_OPTIONS
+        )
+    deezer_cache = PersistentCache(
+        settings["cache.deezer_file"],
+        max_entries=settings["cache.deezer_max_entries"],
+        ttl=settings["cache.deezer_ttl"],
+        negative_ttl=settings["cache.deezer_negative_ttl"],
+    )
+    media_factory = MediaFactory(
+        VlcInstance(),
+        download_scheduler,
+        media_cache,
+        metadata_store,
+        deezer_cache,
+        progress_rate=settings["downloader.progress_rate"],
+        bandwidth_governor=BandwidthGovernor(
+            rate=settings["downloader.max_rate"] * 1024,
+            stream_reserve=settings["downloader.stream_reserve"] * 1024,
+        ),
+        metadata_extractor=metadata_extractor,
+        format_policy=FormatPolicy(
+            settings["downloader.max_height"],
+            settings["downloader.max_fps"],
+            settings["downloader.codecs"],
+        ),
+    )
     player = media_factory.make_player(app_facade.evt_dispatcher)
     infra_facade = InfraFacade(io_factory, media_factory, infra_service_factory, player)
 
@@ -96,3 +176,11 @@ def main(argv=None):
 
     if run_init_workflow(app_facade, data_facade):
         run_server(logger, infra_facade)
+
+    download_scheduler.shutdown(wait=False)
+    media_factory.close()
+    media_cache.close()
+    deezer_cache.close()
+    if metadata_store is not None:
+        metadata_store.close()
+    data_facade.close()
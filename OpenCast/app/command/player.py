@@ -1,5 +1,7 @@
 """ Player commands """
 
+from typing import List
+
 from .command import Command, ModelId, command
 
 
@@ -41,3 +43,8 @@ class ToggleSubtitle(Command):
 @command
 class UpdateSubtitleDelay(Command):
     delay: int
+
+
+@command
+class PrefetchStreamLinks(Command):
+    video_ids: List[ModelId]
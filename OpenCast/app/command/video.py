@@ -1,5 +1,7 @@
 """ Video commands """
 
+from OpenCast.infra.media.scheduler import Priority
+
 from .command import Command, Id, command
 
 
@@ -14,9 +16,20 @@ class DeleteVideo(Command):
     pass
 
 
+@command
+class EvictVideo(Command):
+    output_directory: str
+
+
 @command
 class RetrieveVideo(Command):
     output_directory: str
+    priority: Priority = Priority.BACKGROUND
+
+
+@command
+class PrioritizeVideo(Command):
+    priority: Priority
 
 
 @command
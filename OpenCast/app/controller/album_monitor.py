@@ -34,7 +34,7 @@ class AlbumMonitController(MonitorController):
         },
     )
     async def list(self, _):
-        albums = self._album_repo.list()
+        albums = self._album_repo.snapshot().list()
         return self._ok({"albums": albums})
 
     @docs(
@@ -58,7 +58,7 @@ class AlbumMonitController(MonitorController):
     )
     async def get(self, req):
         id = Id(req.match_info["id"])
-        album = self._album_repo.get(id)
+        album = self._album_repo.snapshot().get(id)
         if album is None:
             return self._not_found()
         return self._ok(album)
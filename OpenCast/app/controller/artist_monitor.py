@@ -34,7 +34,7 @@ class ArtistMonitController(MonitorController):
         },
     )
     async def list(self, _):
-        artists = self._artist_repo.list()
+        artists = self._artist_repo.snapshot().list()
         return self._ok({"artists": artists})
 
     @docs(
@@ -58,7 +58,7 @@ class ArtistMonitController(MonitorController):
     )
     async def get(self, req):
         id = Id(req.match_info["id"])
-        artist = self._artist_repo.get(id)
+        artist = self._artist_repo.snapshot().get(id)
         if artist is None:
             return self._not_found()
         return self._ok(artist)
@@ -3,6 +3,7 @@
 from OpenCast.app.controller.player import PlayerController
 from OpenCast.app.controller.player_monitor import PlayerMonitController
 from OpenCast.app.controller.playlist_monitor import PlaylistMonitController
+from OpenCast.app.controller.prefetch import PrefetchController
 from OpenCast.app.controller.root_monitor import RootMonitController
 from OpenCast.app.controller.video_monitor import VideoMonitController
 
@@ -31,3 +32,6 @@ class ControllerModule:
         self._player_controller = PlayerController(
             app_facade, data_facade, service_factory
         )
+        self._prefetch_controller = PrefetchController(
+            app_facade, infra_facade, data_facade, service_factory
+        )
@@ -38,6 +38,10 @@ class MonitorController(Controller):
     def _no_content(self):
         return self._make_response(204, None)
 
+    def _bad_request(self, message: str, details: dict = {}):
+        body = ErrorSchema().load({"message": message, "details": details})
+        return self._make_response(400, body)
+
     def _forbidden(self, message: str, details: dict = {}):
         body = ErrorSchema().load({"message": message, "details": details})
         return self._make_response(403, body)
@@ -11,6 +11,21 @@ class Videos(Schema):
     videos = fields.List(fields.Nested(VideoSchema))
 
 
+class DownloadQueue(Schema):
+    interactive = fields.Integer()
+    next = fields.Integer()
+    background = fields.Integer()
+    running = fields.Integer()
+
+
+class Bandwidth(Schema):
+    rate = fields.Integer()
+    stream_reserve = fields.Integer()
+    streaming = fields.Boolean()
+    available_rate = fields.Integer()
+    connections = fields.Dict(keys=fields.String(), values=fields.Integer())
+
+
 class ErrorSchema(Schema):
     message = fields.String()
     details = fields.Dict(keys=fields.String(), values=fields.Raw())
@@ -3,7 +3,9 @@
 import structlog
 
 from OpenCast.app.command import player as Cmd
+from OpenCast.app.workflow.player import StreamVideoWorkflow, Video
 from OpenCast.config import settings
+from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.service.identity import IdentityService
 from OpenCast.infra.event import player as PlayerEvt
 
@@ -15,7 +17,9 @@ class PlayerController(Controller):
         logger = structlog.get_logger(__name__)
         super().__init__(logger, app_facade)
 
+        self._data_facade = data_facade
         self._player_repo = data_facade.player_repo
+        self._video_repo = data_facade.video_repo
         self._queueing_service = service_factory.make_queueing_service(
             data_facade.player_repo, data_facade.playlist_repo, data_facade.video_repo
         )
@@ -30,8 +34,22 @@ class PlayerController(Controller):
             player.queue, player.video_id, settings["player.loop_last"]
         )
         self._dispatch(Cmd.StopPlayer)
-        if video_id is not None:
+        if video_id is None:
+            return
+
+        video = self._video_repo.get(video_id)
+        if video is None or video.state is not VideoState.EVICTED:
             self._dispatch(Cmd.PlayVideo, video_id)
+            return
+
+        # The media is retrieved again before being played
+        self._start_workflow(
+            StreamVideoWorkflow,
+            video_id,
+            self._data_facade,
+            Video(video.id, video.source, video.collection_id),
+            player.queue,
+        )
 
     def _dispatch(self, cmd_cls, *args, **kwargs):
         player_id = IdentityService.id_player()
@@ -1,8 +1,7 @@
 """ Player capabilities monitoring routes """
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from functools import partial
+from threading import Thread
 
 import structlog
 from aiohttp_apispec import docs
@@ -22,6 +21,7 @@ from OpenCast.domain.constant import HOME_PLAYLIST
 from OpenCast.domain.event import player as PlayerEvt
 from OpenCast.domain.model import Id
 from OpenCast.domain.model.player import PlayerSchema
+from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.service.identity import IdentityService
 
 from .monitor import MonitorController
@@ -66,7 +66,7 @@ class PlayerMonitController(MonitorController):
         },
     )
     async def get(self, _):
-        player = self._player_repo.get_player()
+        player = next(iter(self._player_repo.snapshot()), None)
         return self._ok(player)
 
     @docs(
@@ -91,52 +91,13 @@ class PlayerMonitController(MonitorController):
     async def stream(self, req):
         source = req.query["url"]
         video_id = IdentityService.id_video(source)
-        playlist_id = self._player_repo.get_player().queue
+        playlist_id = self._player_repo.get_queue()
 
         if self._source_service.is_playlist(source):
-            collection_id = IdentityService.random()
-            self._evt_dispatcher.dispatch(
-                Notification(
-                    collection_id,
-                    NotifLevel.INFO,
-                    "unfolding playlist",
-                    {"source": source},
-                )
+            return await self._unfold_playlist(
+                StreamPlaylistWorkflow, source, playlist_id
             )
 
-            loop = asyncio.get_running_loop()
-            with ThreadPoolExecutor() as pool:
-                sources = await loop.run_in_executor(
-                    pool, partial(self._source_service.unfold, source)
-                )
-                if not sources:
-                    return self._internal_error("Could not unfold the playlist URL")
-
-                self._evt_dispatcher.dispatch(
-                    Notification(
-                        collection_id,
-                        NotifLevel.INFO,
-                        "downloading playlist",
-                        {"source": source, "count": f"{len(sources)} media"},
-                    )
-                )
-                videos = [
-                    Video(IdentityService.id_video(source), source, collection_id)
-                    for source in sources
-                ]
-
-                workflow_id = IdentityService.id_workflow(
-                    StreamPlaylistWorkflow, video_id
-                )
-                self._start_workflow(
-                    StreamPlaylistWorkflow,
-                    workflow_id,
-                    self._data_facade,
-                    videos,
-                    playlist_id,
-                )
-                return self._no_content()
-
         video = Video(video_id, source, collection_id=None)
         self._start_workflow(
             StreamVideoWorkflow, video_id, self._data_facade, video, playlist_id
@@ -166,52 +127,13 @@ class PlayerMonitController(MonitorController):
     async def queue(self, req):
         source = req.query["url"]
         video_id = IdentityService.id_video(source)
-        playlist_id = self._player_repo.get_player().queue
+        playlist_id = self._player_repo.get_queue()
 
         if self._source_service.is_playlist(source):
-            collection_id = IdentityService.random()
-            self._evt_dispatcher.dispatch(
-                Notification(
-                    collection_id,
-                    NotifLevel.INFO,
-                    "unfolding playlist",
-                    {"source": source},
-                )
+            return await self._unfold_playlist(
+                QueuePlaylistWorkflow, source, playlist_id
             )
 
-            loop = asyncio.get_running_loop()
-            with ThreadPoolExecutor() as pool:
-                sources = await loop.run_in_executor(
-                    pool, partial(self._source_service.unfold, source)
-                )
-                if not sources:
-                    return self._internal_error("Could not unfold the playlist URL")
-
-                self._evt_dispatcher.dispatch(
-                    Notification(
-                        collection_id,
-                        NotifLevel.INFO,
-                        "downloading playlist",
-                        {"source": source, "count": f"{len(sources)} media"},
-                    )
-                )
-                videos = [
-                    Video(IdentityService.id_video(source), source, collection_id)
-                    for source in sources
-                ]
-
-                workflow_id = IdentityService.id_workflow(
-                    QueuePlaylistWorkflow, video_id
-                )
-                self._start_workflow(
-                    QueuePlaylistWorkflow,
-                    workflow_id,
-                    self._data_facade,
-                    videos,
-                    playlist_id,
-                )
-                return self._no_content()
-
         video = Video(video_id, source, collection_id=None)
         self._start_workflow(
             QueueVideoWorkflow,
@@ -240,6 +162,7 @@ class PlayerMonitController(MonitorController):
         ],
         responses={
             200: {"description": "Successful operation"},
+            204: {"description": "Evicted media being retrieved"},
             404: {"description": "Video not found"},
             500: {"description": "Internal error", "schema": ErrorSchema},
         },
@@ -253,11 +176,98 @@ class PlayerMonitController(MonitorController):
         if video_id not in playlist.ids:
             return self._forbidden("the video is not queued")
 
+        video = self._video_repo.get(video_id)
+        if video.state is VideoState.EVICTED:
+            # The media is retrieved again before being played
+            self._start_workflow(
+                StreamVideoWorkflow,
+                video_id,
+                self._data_facade,
+                Video(video.id, video.source, video.collection_id),
+                playlist.id,
+            )
+            return self._no_content()
+
         handlers, channel = self._make_default_handlers(PlayerEvt.PlayerStateUpdated)
         self._observe_dispatch(handlers, Cmd.PlayVideo, video_id)
 
         return await channel.receive()
 
+    async def _unfold_playlist(self, workflow_cls, source, playlist_id):
+        """Start the workflow with the first video of the playlist and feed it the rest
+
+        The playlist is listed without extracting its videos, so that the first one
+        is processed while the next ones are being listed.
+        """
+        collection_id = IdentityService.random()
+        self._evt_dispatcher.dispatch(
+            Notification(
+                collection_id,
+                NotifLevel.INFO,
+                "unfolding playlist",
+                {"source": source},
+            )
+        )
+
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+        playlist_video_id = IdentityService.id_video(source)
+        workflow_id = IdentityService.id_workflow(workflow_cls, playlist_video_id)
+
+        def notify_started(result: bool):
+            if not started.done():
+                started.set_result(result)
+
+        def unfold():
+            count = 0
+            try:
+                for entry in self._source_service.unfold_stream(source):
+                    videos = [
+                        Video(IdentityService.id_video(entry), entry, collection_id)
+                    ]
+                    count += 1
+                    if count > 1:
+                        self._evt_dispatcher.dispatch(
+                            workflow_cls.VideosUnfolded(workflow_id, videos, False)
+                        )
+                        continue
+
+                    started_workflow = self._start_workflow(
+                        workflow_cls,
+                        playlist_video_id,
+                        self._data_facade,
+                        videos,
+                        playlist_id,
+                        unfolding=True,
+                    )
+                    loop.call_soon_threadsafe(notify_started, True)
+                    if not started_workflow:
+                        return  # The playlist is already being processed
+            except Exception as e:
+                self._logger.error("Playlist unfolding error", source=source, error=e)
+
+            if count == 0:
+                loop.call_soon_threadsafe(notify_started, False)
+                return
+
+            self._evt_dispatcher.dispatch(
+                workflow_cls.VideosUnfolded(workflow_id, [], True)
+            )
+            self._evt_dispatcher.dispatch(
+                Notification(
+                    collection_id,
+                    NotifLevel.INFO,
+                    "downloading playlist",
+                    {"source": source, "count": f"{count} media"},
+                )
+            )
+
+        # Listing a playlist may take minutes, keep it off the shared executor
+        Thread(target=unfold, name="playlist-unfold", daemon=True).start()
+        if not await started:
+            return self._internal_error("Could not unfold the playlist URL")
+        return self._no_content()
+
     @docs(
         tags=["player"],
         summary="Stop player",
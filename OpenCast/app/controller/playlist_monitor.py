@@ -81,7 +81,7 @@ class PlaylistMonitController(MonitorController):
         },
     )
     async def list(self, req):
-        playlists = self._playlist_repo.list()
+        playlists = self._playlist_repo.snapshot().list()
         return self._ok({"playlists": playlists})
 
     @docs(
@@ -105,7 +105,7 @@ class PlaylistMonitController(MonitorController):
     )
     async def get(self, req):
         id = Id(req.match_info["id"])
-        playlist = self._playlist_repo.get(id)
+        playlist = self._playlist_repo.snapshot().get(id)
         if playlist is None:
             return self._not_found()
         return self._ok(playlist)
@@ -134,11 +134,11 @@ class PlaylistMonitController(MonitorController):
     )
     async def list_videos(self, req):
         id = Id(req.match_info["id"])
-        playlist = self._playlist_repo.get(id)
+        playlist = self._playlist_repo.snapshot().get(id)
         if playlist is None:
             return self._not_found()
 
-        videos = self._video_repo.list(playlist.ids)
+        videos = self._video_repo.snapshot().list(playlist.ids)
         return self._ok({"videos": videos})
 
     @docs(
@@ -0,0 +1,96 @@
+""" Preparation of the upcoming queue entries """
+
+import structlog
+
+from OpenCast.app.command import player as PlayerCmd
+from OpenCast.app.command import video as VideoCmd
+from OpenCast.app.workflow.video import Video, VideoWorkflow
+from OpenCast.config import settings
+from OpenCast.domain.event import player as PlayerEvt
+from OpenCast.domain.event import playlist as PlaylistEvt
+from OpenCast.domain.event import video as VideoEvt
+from OpenCast.domain.model.video import State as VideoState
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.media.scheduler import Priority
+
+from .controller import Controller
+
+
+class PrefetchController(Controller):
+    """Keep the next entries of the queue ready to be played
+
+    The entries being collected are downloaded ahead of the background downloads,
+    and the evicted ones are retrieved again while the scheduler has idle workers so
+    that the prefetch never delays the downloads requested by the user. The links of
+    the upcoming streams are resolved ahead of time.
+    """
+
+    def __init__(self, app_facade, infra_facade, data_facade, service_factory):
+        logger = structlog.get_logger(__name__)
+        super().__init__(logger, app_facade)
+
+        self._data_facade = data_facade
+        self._player_repo = data_facade.player_repo
+        self._scheduler = infra_facade.media_factory.download_scheduler
+        self._queueing_service = service_factory.make_queueing_service(
+            data_facade.player_repo, data_facade.playlist_repo, data_facade.video_repo
+        )
+
+        self._evt_dispatcher.observe(
+            {
+                PlayerEvt.PlayerVideoUpdated: self._player_video_updated,
+                PlaylistEvt.PlaylistContentUpdated: self._playlist_content_updated,
+                VideoEvt.VideoStateUpdated: self._video_state_updated,
+            }
+        )
+
+    # Domain event handler interface implementation
+
+    def _player_video_updated(self, evt):
+        self._prefetch(evt.new_video_id)
+
+    def _playlist_content_updated(self, evt):
+        player = self._player_repo.get_player()
+        if player is not None and evt.model_id == player.queue:
+            self._prefetch(player.video_id)
+
+    def _video_state_updated(self, evt):
+        # A download completed, its worker may be used by the next entries
+        if evt.old_state is VideoState.COLLECTING:
+            player = self._player_repo.get_player()
+            if player is not None:
+                self._prefetch(player.video_id)
+
+    def _prefetch(self, video_id):
+        count = settings["player.prefetch"]
+        player = self._player_repo.get_player()
+        if count == 0 or player is None:
+            return
+
+        videos = self._queueing_service.upcoming_videos(player.queue, video_id, count)
+        idle_workers = self._scheduler.idle_workers()
+        for video in videos:
+            workflow_id = IdentityService.id_workflow(VideoWorkflow, video.id)
+            if self._workflow_manager.is_running(workflow_id):
+                if video.state is VideoState.COLLECTING:
+                    self._dispatch(VideoCmd.PrioritizeVideo, video.id, Priority.NEXT)
+            elif video.state is VideoState.EVICTED and idle_workers > 0:
+                self._retrieve(workflow_id, video)
+                idle_workers -= 1
+
+        video_ids = [video.id for video in videos if video.streamable()]
+        if video_ids:
+            self._dispatch(
+                PlayerCmd.PrefetchStreamLinks, IdentityService.id_player(), video_ids
+            )
+
+    def _retrieve(self, workflow_id, video):
+        self._logger.info("Prefetching video", video=video)
+        workflow = self._workflow_factory.make_video_workflow(
+            workflow_id,
+            self._app_facade,
+            self._data_facade,
+            Video(video.id, video.source, video.collection_id),
+            priority=Priority.NEXT,
+        )
+        self._workflow_manager.start(workflow)
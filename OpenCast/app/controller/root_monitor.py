@@ -7,6 +7,11 @@ from aiohttp import WSMsgType
 from aiohttp_apispec import docs
 
 from OpenCast.app.controller.monitor import MonitorController
+from OpenCast.app.controller.monitoring_schema import (
+    Bandwidth,
+    DownloadQueue,
+    ErrorSchema,
+)
 from OpenCast.app.notification import Notification, WSResponse
 from OpenCast.domain.event import album as AlbumEvt
 from OpenCast.domain.event import artist as ArtistEvt
@@ -24,8 +29,96 @@ class RootMonitController(MonitorController):
         super().__init__(logger, app_facade, infra_facade, "")
 
         self._player = infra_facade.player
+        self._download_scheduler = infra_facade.media_factory.download_scheduler
+        self._bandwidth = infra_facade.media_factory.bandwidth_governor
 
         self._route("GET", "/events", self.stream_events)
+        self._route("GET", "/downloads", self.download_queue)
+        self._route("GET", "/downloads/bandwidth", self.bandwidth)
+        self._route("POST", "/downloads/bandwidth", self.update_bandwidth)
+
+    @docs(
+        tags=["downloads"],
+        summary="Get the download queue",
+        description="Count the pending downloads per priority and the running ones",
+        operationId="getDownloadQueue",
+        responses={
+            200: {"description": "Successful operation", "schema": DownloadQueue},
+        },
+    )
+    async def download_queue(self, _):
+        return self._ok(self._download_scheduler.depth())
+
+    @docs(
+        tags=["downloads"],
+        summary="Get the download bandwidth",
+        description="Get the bandwidth limits in KB/s and the connections per host",
+        operationId="getDownloadBandwidth",
+        responses={
+            200: {"description": "Successful operation", "schema": Bandwidth},
+        },
+    )
+    async def bandwidth(self, _):
+        return self._ok(self._bandwidth_status())
+
+    @docs(
+        tags=["downloads"],
+        summary="Update the download bandwidth",
+        description="Update the bandwidth limits of the downloads",
+        operationId="updateDownloadBandwidth",
+        parameters=[
+            {
+                "in": "query",
+                "name": "rate",
+                "description": "The bandwidth shared by the downloads in KB/s, "
+                "0 for no limit",
+                "type": "integer",
+                "format": "int32",
+                "required": False,
+            },
+            {
+                "in": "query",
+                "name": "stream_reserve",
+                "description": "The bandwidth in KB/s kept for the playing stream, "
+                "requires a bandwidth limit",
+                "type": "integer",
+                "format": "int32",
+                "required": False,
+            },
+        ],
+        responses={
+            200: {"description": "Successful operation", "schema": Bandwidth},
+            400: {"description": "Invalid parameters", "schema": ErrorSchema},
+        },
+    )
+    async def update_bandwidth(self, req):
+        limits = {}
+        for name in ("rate", "stream_reserve"):
+            if name not in req.query:
+                continue
+            value = req.query[name]
+            if not value.isdigit():
+                return self._bad_request("Invalid bandwidth", {name: value})
+            limits[name] = int(value) * 1024
+
+        # The reserve is only taken out of a limited bandwidth
+        rate = limits.get("rate", self._bandwidth.status()["rate"])
+        if limits.get("stream_reserve") and not rate:
+            return self._bad_request(
+                "Stream reserve without bandwidth limit",
+                {"stream_reserve": req.query["stream_reserve"]},
+            )
+
+        self._bandwidth.configure(**limits)
+        self._logger.info("Download bandwidth updated", **limits)
+        return self._ok(self._bandwidth_status())
+
+    def _bandwidth_status(self):
+        status = self._bandwidth.status()
+        for name in ("rate", "stream_reserve", "available_rate"):
+            status[name] = int(status[name]) // 1024
+        status["connections"] = self._download_scheduler.hosts()
+        return status
 
     @docs(
         tags=["events"],
@@ -35,7 +35,7 @@ class VideoMonitController(MonitorController):
         },
     )
     async def list(self, req):
-        videos = self._video_repo.list()
+        videos = self._video_repo.snapshot().list()
         return self._ok({"videos": videos})
 
     @docs(
@@ -59,7 +59,7 @@ class VideoMonitController(MonitorController):
     )
     async def get(self, req):
         id = Id(req.match_info["id"])
-        video = self._video_repo.get(id)
+        video = self._video_repo.snapshot().get(id)
         if video is None:
             return self._not_found()
         return self._ok(video)
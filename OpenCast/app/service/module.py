@@ -11,7 +11,7 @@ class ServiceModule:
     def __init__(self, app_facade, infra_facade, data_facade, service_factory):
         media_factory = infra_facade.media_factory
         self._player_service = PlayerService(
-            app_facade, data_facade, infra_facade.player
+            app_facade, service_factory, data_facade, media_factory, infra_facade.player
         )
         self._video_service = VideoService(
             app_facade, service_factory, data_facade, media_factory
@@ -13,7 +13,7 @@ from .service import Service
 
 
 class PlayerService(Service):
-    def __init__(self, app_facade, data_facade, player):
+    def __init__(self, app_facade, service_factory, data_facade, media_factory, player):
         logger = structlog.get_logger(__name__)
         super().__init__(app_facade, logger, player_cmds)
 
@@ -22,7 +22,16 @@ class PlayerService(Service):
 
         self._player_repo = data_facade.player_repo
         self._video_repo = data_facade.video_repo
+        self._playlist_repo = data_facade.playlist_repo
         self._player = player
+        source_service = service_factory.make_source_service(
+            media_factory.make_downloader(app_facade.evt_dispatcher),
+            media_factory.make_video_parser(),
+        )
+        self._stream_links = service_factory.make_stream_link_service(
+            source_service, settings["player.stream_link_ttl"]
+        )
+        self._bandwidth = media_factory.bandwidth_governor
 
         player = self._player_repo.get_player()
         if player is not None:
@@ -38,27 +47,40 @@ class PlayerService(Service):
         self._start_transaction(self._player_repo, cmd.id, impl)
 
     def _play_video(self, cmd):
-        def impl(player):
-            video = self._video_repo.get(cmd.video_id)
+        def impl(player, video, location):
             # Stop the player so that it triggers observers of PlayerStateUpdated
             if player.state != PlayerState.STOPPED:
                 player.stop()
             player.play(video.id)
             video.start()
 
-            self._player.play(video.location, video.streamable())
+            self._player.play(location, video.streamable())
+            # Keep bandwidth for the stream out of the downloads
+            self._bandwidth.set_streaming(video.streamable())
 
             if player.subtitle_state is True:
                 sub_stream = video.stream("subtitle", settings["subtitle.language"])
                 if sub_stream is not None:
                     self._player.select_subtitle_stream(sub_stream.index)
 
-        self._update(cmd.id, impl)
+        video = self._video_repo.get(cmd.video_id)
+        location = video.location
+        if video.streamable():
+            # Stream links expire, they are resolved when played
+            location = self._stream_links.resolve(video.source)
+            if location is None:
+                self._abort_operation(
+                    cmd.id, "Unavailable stream URL", {"title": video.title}, cmd=cmd
+                )
+                return
+
+        self._update(cmd.id, impl, video, location)
 
     def _stop_player(self, cmd):
         def impl(model):
             model.stop()
             self._player.stop()
+            self._bandwidth.set_streaming(False)
 
         self._update(cmd.id, impl)
 
@@ -100,6 +122,12 @@ class PlayerService(Service):
 
         self._update(cmd.id, impl)
 
+    def _prefetch_stream_links(self, cmd):
+        videos = self._video_repo.list(cmd.video_ids)
+        self._stream_links.prefetch(
+            [video.source for video in videos if video.streamable()]
+        )
+
     # Event handler implementation
 
     def _player_created(self, evt):
@@ -7,6 +7,7 @@ import structlog
 from OpenCast.app.command import video as video_cmds
 from OpenCast.app.notification import Level as NotifLevel
 from OpenCast.app.notification import Notification
+from OpenCast.config import settings
 from OpenCast.domain.event import player as PlayerEvt
 from OpenCast.domain.model.player import State as PlayerState
 from OpenCast.domain.model.video import State as VideoState
@@ -32,6 +33,10 @@ class VideoService(Service):
             self._downloader, media_factory.make_video_parser()
         )
         self._subtitle_service = service_factory.make_subtitle_service(self._downloader)
+        self._media_store = service_factory.make_media_store_service(
+            settings["downloader.quota"] * 1024 * 1024,
+            settings["downloader.low_water"] * 1024 * 1024,
+        )
 
     # Command handler implementation
     def _create_video(self, cmd):
@@ -69,8 +74,22 @@ class VideoService(Service):
 
         self._start_transaction(self._video_repo, cmd.id, impl)
 
+    def _evict_video(self, cmd):
+        def impl(ctx, files):
+            video = self._video_repo.get(cmd.model_id)
+            files.extend(
+                self._media_store.stored_files(video, Path(cmd.output_directory))
+            )
+            video.evict()
+            ctx.update(video)
+
+        files = []
+        self._start_transaction(self._video_repo, cmd.id, impl, files)
+        self._media_store.release(cmd.model_id)
+        self._media_store.remove(cmd.model_id, files)
+
     def _retrieve_video(self, cmd):
-        def impl(ctx, video):
+        def impl(ctx, video, incoming, evicted):
             video.state = VideoState.COLLECTING
 
             # Video source is a filesystem path
@@ -79,34 +98,30 @@ class VideoService(Service):
                 ctx.update(video)
                 return
 
-            # Video source points to a stream
+            # Video source points to a stream, its link is resolved when played
             if video.streamable():
-                link = self._source_service.fetch_stream_link(video.source)
-                if link is None:
-                    self._abort_operation(
-                        cmd.id,
-                        "Unavailable stream URL",
-                        {"title": video.title},
-                        cmd=cmd,
-                    )
-                    return
-
-                video.location = link
+                video.location = video.source
                 ctx.update(video)
                 return
 
             ctx.update(video)
+            evicted.update(
+                self._make_room(ctx, video, Path(cmd.output_directory), incoming)
+            )
             video_location = str(Path(cmd.output_directory) / f"{video.title}.mp4")
 
             # Video source points downloadable media
-            def video_downloaded(_):
+            def video_downloaded(evt):
                 def impl(ctx):
+                    video.download_format = evt.format
                     video.location = video_location
                     ctx.update(video)
 
+                self._media_store.stored(video.id, Path(video_location))
                 self._start_transaction(self._video_repo, cmd.id, impl)
 
             def abort_operation(evt):
+                self._media_store.release(video.id)
                 self._abort_operation(cmd.id, evt.error, {}, cmd=cmd)
 
             self._evt_dispatcher.observe_result(
@@ -130,11 +145,62 @@ class VideoService(Service):
 
             # TODO: Move this part out of the repo transaction
             self._downloader.download_video(
-                cmd.id, video.id, video.source, video_location, on_dl_starting
+                cmd.id,
+                video.id,
+                video.source,
+                video_location,
+                on_dl_starting,
+                cmd.priority,
             )
 
         video = self._video_repo.get(cmd.model_id)
-        self._start_transaction(self._video_repo, cmd.id, impl, video)
+        incoming = 0
+        if self._media_store.limited() and not (
+            video.from_disk() or video.streamable()
+        ):
+            # The metadata may be extracted, keep it out of the transaction
+            incoming = self._source_service.estimate_size(video.source)
+        # The files of the evicted videos are kept until their eviction is committed
+        evicted = {}
+        self._start_transaction(
+            self._video_repo, cmd.id, impl, video, incoming, evicted
+        )
+        for video_id, files in evicted.items():
+            self._media_store.remove(video_id, files)
+
+    def _make_room(self, ctx, video, directory: Path, incoming: int) -> dict:
+        """Evict the least recently played downloads to keep the disk quota
+
+        Return the files of the evicted videos by video id.
+        """
+        evicted_files = {}
+        if not self._media_store.limited():
+            return evicted_files
+
+        if not self._media_store.loaded():
+            self._media_store.load(self._video_repo.list(), directory)
+        stored_ids = self._media_store.stored_ids()
+        videos = self._video_repo.list(stored_ids)
+        if len(videos) < len(stored_ids):
+            self._media_store.forget(set(stored_ids) - {stored.id for stored in videos})
+
+        for evicted in self._media_store.evictions(videos, incoming):
+            self._logger.info(
+                "Evicting video", video=evicted.title, location=evicted.location
+            )
+            evicted_files[evicted.id] = self._media_store.stored_files(
+                evicted, directory
+            )
+            evicted.evict()
+            ctx.update(evicted)
+        self._media_store.reserve(video.id, incoming)
+        return evicted_files
+
+    def _prioritize_video(self, cmd):
+        if self._downloader.reprioritize_video(cmd.model_id, cmd.priority):
+            self._logger.info(
+                "Download reprioritized", video=cmd.model_id, priority=cmd.priority
+            )
 
     def _parse_video(self, cmd):
         def impl(ctx):
@@ -12,8 +12,10 @@ from OpenCast.app.command import video as VideoCmd
 from OpenCast.domain.constant import HOME_PLAYLIST
 from OpenCast.domain.event import player as PlayerEvt
 from OpenCast.domain.event import video as VideoEvt
+from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.service.identity import IdentityService
 
+from .video import Video, VideoWorkflow
 from .workflow import Workflow, make_cmd
 
 
@@ -60,6 +62,7 @@ class InitWorkflow(Workflow):
         self._video_repo = data_facade.video_repo
 
         self._missing_videos = []
+        self._interrupted_videos = []
 
     # States
     def on_enter_CREATING_PLAYER(self):
@@ -80,11 +83,19 @@ class InitWorkflow(Workflow):
     def on_enter_PURGING_VIDEOS(self, *_):
         if not self._missing_videos:
             videos = self._video_repo.list()
+            self._interrupted_videos = [
+                video for video in videos if self._download_interrupted(video)
+            ]
+            interrupted_ids = {video.id for video in self._interrupted_videos}
             self._missing_videos = [
                 video.id
                 for video in videos
-                if video.location is None
-                or not (video.streamable() or Path(video.location).exists())
+                if video.id not in interrupted_ids
+                and video.state is not VideoState.EVICTED
+                and (
+                    video.location is None
+                    or not (video.streamable() or Path(video.location).exists())
+                )
             ]
             if not self._missing_videos:
                 self.to_COMPLETED()
@@ -94,6 +105,16 @@ class InitWorkflow(Workflow):
         self._observe_dispatch(VideoEvt.VideoDeleted, VideoCmd.DeleteVideo, video_id)
 
     def on_enter_COMPLETED(self, *_):
+        # Downloads resume from the partial files in the background
+        for video in self._interrupted_videos:
+            workflow_id = IdentityService.id_workflow(VideoWorkflow, video.id)
+            workflow = self._factory.make_video_workflow(
+                workflow_id,
+                self._app_facade,
+                self._data_facade,
+                Video(video.id, video.source, video.collection_id),
+            )
+            self._start_workflow(workflow, resume=True)
         self._complete()
 
     def on_enter_ABORTED(self, *_):
@@ -105,3 +126,10 @@ class InitWorkflow(Workflow):
 
     def videos_purged(self, *_):
         return len(self._missing_videos) == 0
+
+    def _download_interrupted(self, video):
+        return (
+            video.location is None
+            and video.state is VideoState.COLLECTING
+            and not video.streamable()
+        )
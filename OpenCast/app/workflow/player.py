@@ -2,10 +2,12 @@
 
 from collections import namedtuple
 from enum import Enum, auto
-from typing import List
+from threading import RLock
+from typing import List, Optional
 
 import structlog
 
+from OpenCast.app.command import make_cmd
 from OpenCast.app.command import player as PlayerCmd
 from OpenCast.app.command import playlist as PlaylistCmd
 from OpenCast.app.command import video as VideoCmd
@@ -14,6 +16,7 @@ from OpenCast.domain.event import playlist as PlaylistEvt
 from OpenCast.domain.event import video as VideoEvt
 from OpenCast.domain.model import Id as ModelId
 from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.media.scheduler import Priority
 
 from .video import Video, VideoWorkflow
 from .workflow import Workflow
@@ -56,6 +59,7 @@ class QueueVideoWorkflow(Workflow):
         video: Video,
         playlist_id: ModelId,
         queue_front: bool,
+        priority: Optional[Priority] = None,
     ):
         logger = structlog.get_logger(__name__)
         super().__init__(
@@ -67,13 +71,20 @@ class QueueVideoWorkflow(Workflow):
         self.video = video
         self.playlist_id = playlist_id
         self._queue_front = queue_front
+        if priority is None:
+            priority = Priority.NEXT if queue_front else Priority.BACKGROUND
+        self._priority = priority
         self._data_facade = data_facade
 
     # States
     def on_enter_COLLECTING(self):
         workflow_id = IdentityService.id_workflow(VideoWorkflow, self.video.id)
         workflow = self._factory.make_video_workflow(
-            workflow_id, self._app_facade, self._data_facade, self.video
+            workflow_id,
+            self._app_facade,
+            self._data_facade,
+            self.video,
+            priority=self._priority,
         )
 
         create_cmd_id = IdentityService.id_command(VideoCmd.CreateVideo, self.video.id)
@@ -116,7 +127,70 @@ class QueueVideoWorkflow(Workflow):
         return self.video.id in playlist.ids
 
 
-class QueuePlaylistWorkflow(Workflow):
+class PlaylistWorkflow(Workflow):
+    """Base of the workflows processing the videos of a playlist one by one
+
+    The videos of a playlist still being unfolded are fed to the workflow as they
+    are listed, with VideosUnfolded events carrying the workflow's ID. The workflow
+    waits for them when it runs out of videos before the unfolding is complete.
+    """
+
+    VideosUnfolded = namedtuple("VideosUnfolded", ("id", "videos", "complete"))
+
+    def __init__(
+        self,
+        logger,
+        id,
+        app_facade,
+        data_facade,
+        videos: List[Video],
+        playlist_id: ModelId,
+        unfolding: bool,
+        initial,
+    ):
+        super().__init__(logger, id, app_facade, initial=initial)
+        self.videos = videos[::-1]
+        self.playlist_id = playlist_id
+        self._data_facade = data_facade
+        self._unfolding = unfolding
+        # The videos are fed by the unfolding thread
+        self._lock = RLock()
+
+    def start(self):
+        # Observed once started, a workflow already running is not started
+        if self._unfolding:
+            self._observe(self.id, [self.VideosUnfolded])
+
+    def on_enter_WAITING(self, evt):
+        # Videos may have been fed while the state was entered
+        with self._lock:
+            if self.is_WAITING() and (self.videos or not self._unfolding):
+                self._videos_available(evt)
+
+    def _videos_unfolded(self, evt):
+        with self._lock:
+            self.videos[:0] = evt.videos[::-1]
+            self._unfolding = not evt.complete
+            if self._unfolding:
+                self._observe(self.id, [self.VideosUnfolded])
+            if self.is_WAITING():
+                self._videos_available(evt)
+
+    def _next_video(self):
+        with self._lock:
+            return self.videos.pop()
+
+    # Conditions
+    def _is_last_video(self, _):
+        with self._lock:
+            return len(self.videos) == 0 and not self._unfolding
+
+    def _is_waiting(self, _):
+        with self._lock:
+            return len(self.videos) == 0
+
+
+class QueuePlaylistWorkflow(PlaylistWorkflow):
     Completed = namedtuple("QueuePlaylistWorkflowCompleted", ("id"))
     Aborted = namedtuple("QueuePlaylistWorkflowAborted", ("id"))
 
@@ -124,6 +198,7 @@ class QueuePlaylistWorkflow(Workflow):
     class States(Enum):
         INITIAL = auto()
         QUEUEING = auto()
+        WAITING = auto()
         COMPLETED = auto()
 
     # Trigger - Source - Dest - Conditions - Unless - Before - After - Prepare
@@ -131,9 +206,14 @@ class QueuePlaylistWorkflow(Workflow):
         ["_queue_videos",                      States.INITIAL,    States.QUEUEING],
 
         ["_queue_video_workflow_completed",    States.QUEUEING,   States.COMPLETED, "_is_last_video"],  # noqa: E501
+        ["_queue_video_workflow_completed",    States.QUEUEING,   States.WAITING,   "_is_waiting"],  # noqa: E501
         ["_queue_video_workflow_completed",    States.QUEUEING,   "="],
         ["_queue_video_workflow_aborted",      States.QUEUEING,   States.COMPLETED, "_is_last_video"],  # noqa: E501
+        ["_queue_video_workflow_aborted",      States.QUEUEING,   States.WAITING,   "_is_waiting"],  # noqa: E501
         ["_queue_video_workflow_aborted",      States.QUEUEING,   "="],
+
+        ["_videos_available",                  States.WAITING,    States.COMPLETED, "_is_last_video"],  # noqa: E501
+        ["_videos_available",                  States.WAITING,    States.QUEUEING],
     ]
     # fmt: on
 
@@ -144,24 +224,27 @@ class QueuePlaylistWorkflow(Workflow):
         data_facade,
         videos: List[Video],
         playlist_id: ModelId,
+        unfolding: bool = False,
     ):
         logger = structlog.get_logger(__name__)
         super().__init__(
             logger,
             id,
             app_facade,
+            data_facade,
+            videos,
+            playlist_id,
+            unfolding,
             initial=StreamVideoWorkflow.States.INITIAL,
         )
-        self.videos = videos[::-1]
-        self.playlist_id = playlist_id
-        self._data_facade = data_facade
 
     def start(self):
+        super().start()
         self._queue_videos(None)
 
     # States
     def on_enter_QUEUEING(self, _):
-        video = self.videos.pop()
+        video = self._next_video()
         workflow_id = IdentityService.id_workflow(QueueVideoWorkflow, video.id)
         workflow = self._factory.make_queue_video_workflow(
             workflow_id,
@@ -176,10 +259,6 @@ class QueuePlaylistWorkflow(Workflow):
     def on_enter_COMPLETED(self, _):
         self._complete()
 
-    # Conditions
-    def _is_last_video(self, _):
-        return len(self.videos) == 0
-
 
 class StreamVideoWorkflow(Workflow):
     Completed = namedtuple("StreamVideoWorkflowCompleted", ("id", "model_id"))
@@ -236,6 +315,7 @@ class StreamVideoWorkflow(Workflow):
             self.video,
             self.playlist_id,
             queue_front=True,
+            priority=Priority.INTERACTIVE,
         )
 
         video_workflow_id = IdentityService.id_workflow(VideoWorkflow, self.video.id)
@@ -243,6 +323,11 @@ class StreamVideoWorkflow(Workflow):
             video_workflow_id,
             [VideoWorkflow.Completed],
         )
+        if self._app_facade.workflow_manager.is_running(video_workflow_id):
+            # The video is already being collected, e.g. along with a playlist
+            self._cmd_dispatcher.dispatch(
+                make_cmd(VideoCmd.PrioritizeVideo, self.video.id, Priority.INTERACTIVE)
+            )
         self._observe_start(queue_workflow)
 
     def on_enter_SYNCHRONIZING(self, _):
@@ -263,7 +348,7 @@ class StreamVideoWorkflow(Workflow):
         self._cancel(self.video.id)
 
 
-class StreamPlaylistWorkflow(Workflow):
+class StreamPlaylistWorkflow(PlaylistWorkflow):
     Completed = namedtuple("StreamPlaylistWorkflowCompleted", ("id"))
     Aborted = namedtuple("StreamPlaylistWorkflowAborted", ("id"))
 
@@ -272,6 +357,7 @@ class StreamPlaylistWorkflow(Workflow):
         INITIAL = auto()
         STARTING = auto()
         QUEUEING = auto()
+        WAITING = auto()
         COMPLETED = auto()
 
     # Trigger - Source - Dest - Conditions - Unless - Before - After - Prepare
@@ -279,14 +365,21 @@ class StreamPlaylistWorkflow(Workflow):
         ["_play_video",                      States.INITIAL,  States.STARTING],
 
         ["_stream_video_workflow_completed", States.STARTING, States.COMPLETED, "_is_last_video"],   # noqa: E501
+        ["_stream_video_workflow_completed", States.STARTING, States.WAITING,   "_is_waiting"],   # noqa: E501
         ["_stream_video_workflow_completed", States.STARTING, States.QUEUEING],
         ["_stream_video_workflow_aborted",   States.STARTING, States.COMPLETED, "_is_last_video"],   # noqa: E501
+        ["_stream_video_workflow_aborted",   States.STARTING, States.WAITING,   "_is_waiting"],   # noqa: E501
         ["_stream_video_workflow_aborted",   States.STARTING, "="],
 
         ["_queue_video_workflow_completed",  States.QUEUEING, States.COMPLETED, "_is_last_video"],  # noqa: E501
+        ["_queue_video_workflow_completed",  States.QUEUEING, States.WAITING,   "_is_waiting"],  # noqa: E501
         ["_queue_video_workflow_completed",  States.QUEUEING, "="],
         ["_queue_video_workflow_aborted",    States.QUEUEING, States.COMPLETED, "_is_last_video"],  # noqa: E501
+        ["_queue_video_workflow_aborted",    States.QUEUEING, States.WAITING,   "_is_waiting"],  # noqa: E501
         ["_queue_video_workflow_aborted",    States.QUEUEING, "="],
+
+        ["_videos_available",                States.WAITING,  States.COMPLETED, "_is_last_video"],  # noqa: E501
+        ["_videos_available",                States.WAITING,  States.QUEUEING],
     ]
     # fmt: on
 
@@ -297,25 +390,27 @@ class StreamPlaylistWorkflow(Workflow):
         data_facade,
         videos: List[Video],
         playlist_id: ModelId,
+        unfolding: bool = False,
     ):
         logger = structlog.get_logger(__name__)
         super().__init__(
             logger,
             id,
             app_facade,
+            data_facade,
+            videos,
+            playlist_id,
+            unfolding,
             initial=StreamVideoWorkflow.States.INITIAL,
         )
 
-        self.videos = videos[::-1]
-        self.playlist_id = playlist_id
-        self._data_facade = data_facade
-
     def start(self):
+        super().start()
         self._play_video(None)
 
     # States
     def on_enter_STARTING(self, _):
-        video = self.videos.pop()
+        video = self._next_video()
         workflow_id = IdentityService.id_workflow(StreamVideoWorkflow, video.id)
         workflow = self._factory.make_stream_video_workflow(
             workflow_id, self._app_facade, self._data_facade, video, self.playlist_id
@@ -325,7 +420,7 @@ class StreamPlaylistWorkflow(Workflow):
         )
 
     def on_enter_QUEUEING(self, _):
-        video = self.videos.pop()
+        video = self._next_video()
         workflow_id = IdentityService.id_workflow(QueueVideoWorkflow, video.id)
         workflow = self._factory.make_queue_video_workflow(
             workflow_id,
@@ -341,7 +436,3 @@ class StreamPlaylistWorkflow(Workflow):
 
     def on_enter_COMPLETED(self, _):
         self._complete()
-
-    # Conditions
-    def _is_last_video(self, _):
-        return len(self.videos) == 0
@@ -14,6 +14,8 @@ from OpenCast.app.service.error import OperationError
 from OpenCast.config import settings
 from OpenCast.domain.event import video as VideoEvt
 from OpenCast.domain.model import Id
+from OpenCast.domain.model.video import State as VideoState
+from OpenCast.infra.media.scheduler import Priority
 
 from .workflow import Workflow
 
@@ -41,6 +43,7 @@ class VideoWorkflow(Workflow):
         SUB_RETRIEVING = auto()
         FINALIZING = auto()
         COMPLETED = auto()
+        EVICTING = auto()
         DELETING = auto()
         ABORTED = auto()
 
@@ -48,6 +51,7 @@ class VideoWorkflow(Workflow):
     transitions = [
         ["_create",                 States.INITIAL,        States.COMPLETED,  "is_complete"],  # noqa: E501
         ["_create",                 States.INITIAL,        States.CREATING],
+        ["_resume",                 States.INITIAL,        States.RETRIEVING],
         ["_video_created",          States.CREATING,       States.RETRIEVING],
         ["_video_retrieved",        States.RETRIEVING,     States.FINALIZING,  "is_stream"],  # noqa: E501
         ["_video_retrieved",        States.RETRIEVING,     States.PARSING],
@@ -57,12 +61,23 @@ class VideoWorkflow(Workflow):
         ["_video_state_updated",    States.FINALIZING,     States.COMPLETED],
 
         ["_operation_error",        States.CREATING,       States.ABORTED],
+        ["_operation_error",        States.EVICTING,       States.ABORTED],
+        ["_operation_error",        '*',                   States.ABORTED,    ["is_resumed", "is_evicted"]],  # noqa: E501
+        ["_operation_error",        '*',                   States.EVICTING,   "is_resumed"],  # noqa: E501
         ["_operation_error",        '*',                   States.DELETING],
+        ["_video_state_updated",    States.EVICTING,       States.ABORTED],
         ["_video_deleted",          States.DELETING,       States.ABORTED],
     ]
     # fmt: on
 
-    def __init__(self, id, app_facade, data_facade, video: Video):
+    def __init__(
+        self,
+        id,
+        app_facade,
+        data_facade,
+        video: Video,
+        priority: Priority = Priority.BACKGROUND,
+    ):
         logger = structlog.get_logger(__name__)
         super().__init__(
             logger,
@@ -72,9 +87,17 @@ class VideoWorkflow(Workflow):
         )
         self._video_repo = data_facade.video_repo
         self._video = video
-
-    def start(self):
-        self._create()
+        self._priority = priority
+        self._resumed = False
+
+    def start(self, resume: bool = False):
+        # Retrieve again a created video whose download was interrupted or evicted
+        if resume or self.is_evicted():
+            # The video stays in the library when its retrieval fails
+            self._resumed = True
+            self._resume(None)
+        else:
+            self._create()
 
     # States
     def on_enter_CREATING(self):
@@ -88,6 +111,7 @@ class VideoWorkflow(Workflow):
             Cmd.RetrieveVideo,
             self._video.id,
             settings["downloader.output_directory"],
+            self._priority,
         )
 
     def on_enter_PARSING(self, _):
@@ -112,6 +136,17 @@ class VideoWorkflow(Workflow):
             self._video.id,
         )
 
+    def on_enter_EVICTING(self, evt):
+        self._evt_dispatcher.dispatch(
+            Notification(evt.id, NotifLevel.ERROR, evt.error, evt.details)
+        )
+        self._observe_dispatch(
+            VideoEvt.VideoStateUpdated,
+            Cmd.EvictVideo,
+            self._video.id,
+            settings["downloader.output_directory"],
+        )
+
     def on_enter_DELETING(self, evt):
         self._evt_dispatcher.dispatch(
             Notification(evt.id, NotifLevel.ERROR, evt.error, evt.details)
@@ -129,6 +164,13 @@ class VideoWorkflow(Workflow):
         self._cancel(self._video.id)
 
     # Conditions
+    def is_evicted(self, *_):
+        video = self._video_repo.get(self._video.id)
+        return video is not None and video.state is VideoState.EVICTED
+
+    def is_resumed(self, _):
+        return self._resumed
+
     def is_complete(self):
         return self._video_repo.exists(self._video.id)
 
@@ -23,11 +23,49 @@ settings.validators.register(
     Validator("SERVER.HOST", default="0.0.0.0"),
     Validator("SERVER.PORT", default=2020),
     Validator("DATABASE.FILE", default="opencast.db"),
+    Validator("DATABASE.INDEXED", default=True, is_in=[True, False]),
+    Validator("DATABASE.SQLITE_FILE", default="opencast.sqlite"),
+    Validator("DATABASE.JOURNAL_FILE", default="opencast.journal"),
+    Validator(
+        "DATABASE.STORAGE",
+        default="json",
+        is_in=["json", "buffered_json", "sqlite", "journal"],
+    ),
+    Validator("DATABASE.FLUSH_INTERVAL", default=5, gt=0),
+    Validator("DATABASE.FLUSH_CHANGES", default=100, gt=0),
+    Validator("DATABASE.SNAPSHOT_CHANGES", default=1000, gt=0),
     Validator(
         "PLAYER.LOOP_LAST", default="album", is_in=[False, "track", "album", "playlist"]
     ),
+    Validator("PLAYER.STREAM_LINK_TTL", default=3600, gt=0),
+    Validator("PLAYER.PREFETCH", default=2, gte=0),
     Validator("DOWNLOADER.OUTPUT_DIRECTORY", must_exist=True),
     Validator("DOWNLOADER.MAX_CONCURRENCY", default=3, gt=0, lt=10),
+    Validator("DOWNLOADER.AGING_INTERVAL", default=60, gt=0),
+    Validator("DOWNLOADER.PROGRESS_RATE", default=4, gt=0),
+    Validator("DOWNLOADER.MAX_RATE", default=0, gte=0),
+    Validator("DOWNLOADER.STREAM_RESERVE", default=0, gte=0),
+    Validator("DOWNLOADER.MAX_HOST_CONNECTIONS", default=2, gt=0),
+    Validator("DOWNLOADER.METADATA_PROCESSES", default=0, gte=0, lt=10),
+    Validator("DOWNLOADER.QUOTA", default=0, gte=0),
+    Validator("DOWNLOADER.LOW_WATER", default=0, gte=0),
+    Validator("DOWNLOADER.MAX_HEIGHT", default=1080, gt=0),
+    Validator("DOWNLOADER.MAX_FPS", default=60, gt=0),
+    Validator("DOWNLOADER.CODECS", default=["avc1"]),
+    Validator("CACHE.MAX_ENTRIES", default=50, gt=0),
+    Validator("CACHE.MAX_SIZE", default=64, gt=0),
+    Validator("CACHE.TTL", default=120, gt=0),
+    Validator("CACHE.CLEANUP_INTERVAL", default=30, gt=0),
+    Validator("CACHE.PERSISTENT", default=False, is_in=[True, False]),
+    Validator("CACHE.METADATA_FILE", default="opencast.metadata"),
+    Validator("CACHE.METADATA_MAX_SIZE", default=32, gt=0),
+    Validator("CACHE.METADATA_TTL", default={"default": 604800}),
+    Validator("CACHE.METADATA_TTL.DEFAULT", must_exist=True, gt=0),
+    Validator("CACHE.STREAM_TTL", default=3600, gt=0),
+    Validator("CACHE.DEEZER_FILE", default="opencast.deezer"),
+    Validator("CACHE.DEEZER_MAX_ENTRIES", default=5000, gt=0),
+    Validator("CACHE.DEEZER_TTL", default=2592000, gt=0),
+    Validator("CACHE.DEEZER_NEGATIVE_TTL", default=86400, gt=0),
     Validator("SUBTITLE.ENABLED", default=True, is_in=[True, False]),
     Validator("SUBTITLE.LANGUAGE", default="eng", len_eq=3),
 )
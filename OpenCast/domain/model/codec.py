@@ -0,0 +1,98 @@
+""" Entity (de)serialization compiled from the entity schemas """
+
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from marshmallow import fields
+from marshmallow_enum import EnumField
+
+
+def _identity(value):
+    return value
+
+
+def _load_uuid(value):
+    return value if isinstance(value, UUID) else UUID(value)
+
+
+def _converters(field):
+    """Return the (dump, load) functions equivalent to the marshmallow field"""
+    if isinstance(field, fields.UUID):
+        return str, _load_uuid
+    if isinstance(field, (fields.String, fields.Integer, fields.Boolean)):
+        return _identity, _identity
+    if (
+        isinstance(field, fields.TimeDelta)
+        and field.precision == fields.TimeDelta.SECONDS
+    ):
+        return (
+            lambda value: int(value.total_seconds()),
+            lambda value: timedelta(seconds=int(value)),
+        )
+    if isinstance(field, fields.DateTime) and field.format in (None, "iso"):
+        return datetime.isoformat, datetime.fromisoformat
+    if isinstance(field, EnumField) and not field.by_value:
+        return lambda value: value.name, lambda value: field.enum[value]
+    if isinstance(field, fields.List):
+        dump, load = _converters(field.inner)
+        return (
+            lambda values: [None if v is None else dump(v) for v in values],
+            lambda values: [None if v is None else load(v) for v in values],
+        )
+    if isinstance(field, fields.Nested) and (field.many or field.schema.many):
+        codec = Codec(field.schema)
+        return (
+            lambda values: [codec.dump(value) for value in values],
+            lambda values: [codec.load(value, trusted=True) for value in values],
+        )
+
+    # Delegate to the field for types without a dedicated converter
+    return (
+        lambda value: field._serialize(value, field.name, None),
+        lambda value: field.deserialize(value),
+    )
+
+
+class Codec:
+    """Convert entity data to and from documents
+
+    The conversion functions are built once from the fields of the schema. Dumping
+    produces the same documents as the schema. Loading validates the documents
+    through the schema, unless they are trusted, e.g. read back from our own
+    database, in which case the values are converted without any check.
+    """
+
+    def __init__(self, schema):
+        self._schema = schema
+        self._fields = [
+            (name, field.data_key or name, *_converters(field))
+            for name, field in schema.fields.items()
+        ]
+        self._loaders = {name: (key, load) for name, key, _, load in self._fields}
+
+    def dump(self, data) -> dict:
+        document = {}
+        for name, key, dump, _ in self._fields:
+            value = data[name] if isinstance(data, dict) else getattr(data, name)
+            document[key] = None if value is None else dump(value)
+        return document
+
+    def load(self, document: dict, trusted: bool = False) -> dict:
+        if not trusted:
+            return self._schema.load(document)
+
+        data = {}
+        for name, key, _, load in self._fields:
+            if key in document:
+                value = document[key]
+                data[name] = None if value is None else load(value)
+        return data
+
+    def load_fields(self, document: dict, names) -> dict:
+        """Convert the trusted values of the named fields only"""
+        data = {}
+        for name in names:
+            key, load = self._loaders[name]
+            value = document.get(key)
+            data[name] = None if value is None else load(value)
+        return data
@@ -2,6 +2,8 @@
 
 from copy import deepcopy
 
+from .codec import Codec
+
 
 class Entity:
     def __init__(self, data_cls, *args, **kwargs):
@@ -18,12 +20,30 @@ class Entity:
         return f"{type(self).__name__}({self._data})"
 
     @classmethod
-    def from_dict(cls, data: dict):
-        clsdata = cls.Schema().load(data)
-        entity = cls(cls.Data(**clsdata))
-        entity._events.clear()
+    def from_dict(cls, data: dict, trusted: bool = False):
+        """Make an entity from its serialized data
+
+        Trusted data, e.g. coming from the database, is not validated.
+        """
+        clsdata = cls._codec().load(data, trusted)
+        entity = cls.__new__(cls)
+        Entity.__init__(entity, cls.Data, cls.Data(**clsdata))
         return entity
 
+    @classmethod
+    def fields_from_dict(cls, data: dict, names) -> dict:
+        """Read the named fields from trusted serialized data"""
+        return cls._codec().load_fields(data, names)
+
+    @classmethod
+    def _codec(cls):
+        # Built once per entity class, the codec is not inherited
+        codec = cls.__dict__.get("_codec_instance")
+        if codec is None:
+            codec = Codec(cls.Schema())
+            cls._codec_instance = codec
+        return codec
+
     @property
     def id(self):
         return self._data.id
@@ -34,7 +54,7 @@ class Entity:
         return events
 
     def to_dict(self):
-        return self.Schema().dump(self._data)
+        return self._codec().dump(self._data)
 
     def _record(self, evtcls, *args):
         self._events.append({evtcls: (self.id,) + args})
@@ -24,6 +24,7 @@ class State(Enum):
     READY = 3
     PAUSED = 4
     PLAYING = 5
+    EVICTED = 6  # The downloaded media was removed, it must be retrieved again
 
 
 @dataclass
@@ -55,6 +56,7 @@ class VideoSchema(Schema):
     streams = fields.Nested(StreamSchema(many=True))
     subtitle = fields.String(allow_none=True)
     state = EnumField(State)
+    download_format = fields.String(allow_none=True)
 
 
 T = TypeVar("T")
@@ -120,6 +122,7 @@ class Video(Entity):
         streams: List[Stream] = field(default_factory=list)
         subtitle: Optional[str] = None
         state: State = State.CREATED
+        download_format: Optional[str] = None
 
         def __post_init__(self):
             for i, stream in enumerate(self.streams):
@@ -169,10 +172,22 @@ class Video(Entity):
             else None
         )
 
+    @property
+    def total_playing_duration(self):
+        return self._data.total_playing_duration
+
+    @property
+    def last_play(self):
+        return self._data.last_play
+
     @property
     def location(self):
         return self._data.location
 
+    @property
+    def download_format(self):
+        return self._data.download_format
+
     @property
     def streams(self):
         return self._data.streams
@@ -190,6 +205,10 @@ class Video(Entity):
         self._data.location = location
         self._record(Evt.VideoRetrieved, self._data.location)
 
+    @download_format.setter
+    def download_format(self, download_format: Optional[str]):
+        self._data.download_format = download_format
+
     @streams.setter
     def streams(self, streams: List[Stream]):
         self._data.streams = streams
@@ -260,5 +279,16 @@ class Video(Entity):
         self._data.total_playing_duration += datetime.now() - self._data.last_play
         self.state = State.READY
 
+    def evict(self):
+        # A video being collected is evicted when its retrieval failed
+        if self.state not in [State.READY, State.COLLECTING]:
+            raise DomainError(
+                "the video cannot be evicted", title=self.title, state=self.state
+            )
+        self._data.location = None
+        self._data.download_format = None
+        self._data.subtitle = None
+        self.state = State.EVICTED
+
     def delete(self):
         self._record(Evt.VideoDeleted)
@@ -1,7 +1,9 @@
 """ Factory for creating domain services """
 
+from .media_store import MediaStoreService
 from .player import QueueingService
 from .source import SourceService
+from .stream_link import StreamLinkService
 from .subtitle import SubtitleService
 
 
@@ -19,8 +21,14 @@ class ServiceFactory:
     def make_source_service(self, *args):
         return SourceService(*args)
 
+    def make_stream_link_service(self, *args):
+        return StreamLinkService(*args)
+
     def make_subtitle_service(self, *args):
         return SubtitleService(self._infra_service_factory.make_file_service(), *args)
 
     def make_queueing_service(self, *args):
         return QueueingService(*args)
+
+    def make_media_store_service(self, *args):
+        return MediaStoreService(*args)
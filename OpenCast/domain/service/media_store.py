@@ -0,0 +1,151 @@
+""" Disk quota of the downloaded media """
+
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import List
+
+import structlog
+
+from OpenCast.domain.model import Id
+from OpenCast.domain.model.video import State as VideoState
+
+
+class MediaStoreService:
+    """Keep the media downloaded to a directory under a quota of bytes
+
+    When a download would bring the stored media over the quota, the least
+    recently played videos are evicted until the store falls under the low-water
+    mark, leaving room for the next downloads. Without a low-water mark, only the
+    room needed by the download is made. Among the videos played as long ago, the
+    least played ones go first. Videos never played are evicted last as they were
+    queued to be watched. A quota of 0 disables the eviction.
+
+    The size of the stored media is measured once, then kept up to date as the
+    downloads complete and the videos are evicted. The bytes expected by the
+    downloads in flight are reserved so that they don't overrun the quota together.
+    """
+
+    def __init__(self, quota: int, low_water: int):
+        self._logger = structlog.get_logger(__name__)
+        self._quota = quota
+        self._low_water = min(low_water or quota, quota)
+        self._lock = Lock()
+        self._sizes = None
+        self._reserved = {}
+
+    def limited(self) -> bool:
+        return self._quota > 0
+
+    def loaded(self) -> bool:
+        return self._sizes is not None
+
+    def load(self, videos, directory: Path):
+        """Measure the media stored by the videos"""
+        sizes = {video.id: self._stored_size(video, directory) for video in videos}
+        with self._lock:
+            self._sizes = {id_: size for id_, size in sizes.items() if size > 0}
+
+    def stored_ids(self) -> List[Id]:
+        with self._lock:
+            return list(self._sizes)
+
+    def usage(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values()) + sum(self._reserved.values())
+
+    def reserve(self, video_id: Id, incoming: int):
+        with self._lock:
+            self._reserved[video_id] = incoming
+
+    def release(self, video_id: Id):
+        """Drop the reservation of a download that failed"""
+        with self._lock:
+            self._reserved.pop(video_id, None)
+
+    def stored(self, video_id: Id, location: Path):
+        """Replace the reservation of a download by the size of its media"""
+        size = location.stat().st_size if location.is_file() else 0
+        with self._lock:
+            self._reserved.pop(video_id, None)
+            if self._sizes is not None and size > 0:
+                self._sizes[video_id] = size
+
+    def evictions(self, videos, incoming: int = 0) -> List:
+        """Return the stored videos to evict before downloading incoming bytes"""
+        if not self.limited():
+            return []
+
+        usage = self.usage()
+        if usage + incoming <= self._quota:
+            return []
+
+        with self._lock:
+            sizes = {video.id: self._sizes.get(video.id, 0) for video in videos}
+        target = min(self._low_water, self._quota - incoming)
+        candidates = sorted(
+            (
+                video
+                for video in videos
+                if video.state is VideoState.READY and sizes[video.id] > 0
+            ),
+            key=self._eviction_order,
+        )
+        evicted = []
+        for video in candidates:
+            if usage <= target:
+                break
+            evicted.append(video)
+            usage -= sizes[video.id]
+
+        self._logger.debug(
+            "Media store over quota",
+            usage=usage,
+            incoming=incoming,
+            evicted=len(evicted),
+        )
+        return evicted
+
+    def stored_files(self, video, directory: Path) -> List[Path]:
+        """Return the media and subtitle files of the video kept in the store"""
+        paths = (
+            self._stored_path(location, directory)
+            for location in (video.location, video.subtitle)
+        )
+        return [path for path in paths if path is not None]
+
+    def remove(self, video_id: Id, files: List[Path]):
+        """Delete the files of an evicted video once its eviction is committed"""
+        for path in files:
+            path.unlink(missing_ok=True)
+        with self._lock:
+            if self._sizes is not None:
+                self._sizes.pop(video_id, None)
+
+    def forget(self, video_ids: List[Id]):
+        """Stop accounting for the media of deleted videos"""
+        with self._lock:
+            for video_id in video_ids:
+                self._sizes.pop(video_id, None)
+
+    def _eviction_order(self, video):
+        never_played = video.last_play is None
+        return (
+            never_played,
+            video.last_play or datetime.min,
+            video.total_playing_duration,
+        )
+
+    def _stored_size(self, video, directory: Path) -> int:
+        if video.location == video.source:  # Files from disk or streams
+            return 0
+        path = self._stored_path(video.location, directory)
+        if path is None or not path.is_file():
+            return 0
+        return path.stat().st_size
+
+    def _stored_path(self, location, directory: Path):
+        if location is None:
+            return None
+        path = Path(location)
+        return path if directory in path.parents else None
@@ -30,20 +30,17 @@ class QueueingService:
         )
         # Position the video after the last one of the same collection
         video = self._video_repo.get(video_id)
-        videos = self._video_repo.list(playlist.ids[player_video_idx:])
+        videos = self._video_repo.iterate(
+            playlist.ids[player_video_idx:], keep_missing=True
+        )
         insert_idx = player_video_idx
         collection_match = False
         if video.collection_id is not None:
             for playlist_video in videos:
-                if (
-                    not collection_match
-                    and video.collection_id == playlist_video.collection_id
-                ):
+                collection_id = playlist_video and playlist_video.collection_id
+                if not collection_match and video.collection_id == collection_id:
                     collection_match = True
-                if (
-                    collection_match
-                    and video.collection_id != playlist_video.collection_id
-                ):
+                if collection_match and video.collection_id != collection_id:
                     break
                 insert_idx += 1
         if not collection_match:
@@ -53,6 +50,15 @@ class QueueingService:
         playlist.ids.insert(insert_idx, video_id)
         return playlist.ids
 
+    def upcoming_videos(self, playlist_id: Id, video_id: Id, count: int) -> List:
+        """Return the videos queued after video_id, from the start when not queued"""
+        playlist = self._playlist_repo.get(playlist_id)
+        if playlist is None:
+            return []
+
+        start = playlist.ids.index(video_id) + 1 if video_id in playlist.ids else 0
+        return self._video_repo.list(playlist.ids[start : start + count])
+
     def next_video(
         self, playlist_id: Id, video_id: Id, loop_last: Union[bool, str]
     ) -> Optional[Id]:
@@ -61,22 +67,27 @@ class QueueingService:
             self._logger.warning("unknown video", video=video_id, playlist=playlist)
             return None
 
-        videos = self._video_repo.list(playlist.ids)
-        playlist_size = len(playlist.ids)
         video_idx = playlist.ids.index(video_id)
-        for i in range(video_idx + 1, playlist_size, 1):
-            if videos[i].state == VideoState.READY:
-                return videos[i].id
+        for video in self._video_repo.iterate(playlist.ids[video_idx + 1 :]):
+            # Evicted videos are retrieved again when played
+            if video.state in [VideoState.READY, VideoState.EVICTED]:
+                return video.id
 
         if loop_last == "track":
             return playlist.ids[video_idx]
         if loop_last == "album":
-            while (
-                video_idx > 0
-                and videos[video_idx].collection_id is not None
-                and videos[video_idx].collection_id
-                == videos[video_idx - 1].collection_id
-            ):
+            video = self._video_repo.get(video_id)
+            previous_videos = self._video_repo.iterate(
+                playlist.ids[video_idx - 1 :: -1] if video_idx > 0 else [],
+                keep_missing=True,
+            )
+            for previous_video in previous_videos:
+                if (
+                    video.collection_id is None
+                    or previous_video is None
+                    or previous_video.collection_id != video.collection_id
+                ):
+                    break
                 video_idx -= 1
             return playlist.ids[video_idx]
         if loop_last == "playlist":
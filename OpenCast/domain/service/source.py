@@ -1,7 +1,7 @@
 """ Media source operations """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import structlog
 
@@ -18,27 +18,30 @@ class SourceService:
         }
 
     def is_playlist(self, source: str) -> bool:
-        data = self._downloader.download_metadata(source, process_ie_data=False)
+        data = self._downloader.download_metadata(
+            source, process_ie_data=False, stable_only=True
+        )
         if data is None:
             return False
 
         return data.get("_type", None) == "playlist"
 
-    def unfold(self, source: str) -> List[str]:
-        self._logger.info("Unfolding playlist", url=source)
-        data = self._downloader.download_metadata(source, process_ie_data=True)
-        if data is None:
-            return []
-
-        entries = data.get("entries", [])
-        return [
-            entry["webpage_url"]
-            for entry in entries
-            if entry and "webpage_url" in entry
-        ]
+    def unfold_stream(self, source: str) -> Iterator[str]:
+        """Yield the sources of a playlist as they are listed, before extraction"""
+        self._logger.info("Unfolding playlist", url=source, streaming=True)
+        for entry in self._downloader.iterate_playlist(source):
+            # Flat entries reference the page of the media
+            if entry.get("_type") in ["url", "url_transparent"]:
+                url = entry.get("url")
+            else:
+                url = entry.get("webpage_url")
+            if url:
+                yield url
 
     def pick_stream_metadata(self, source: str) -> Optional[dict]:
-        data = self._downloader.download_metadata(source, process_ie_data=True)
+        data = self._downloader.download_metadata(
+            source, process_ie_data=True, stable_only=True
+        )
         if data is None:
             return None
 
@@ -60,13 +63,26 @@ class SourceService:
 
         return metadata
 
+    def estimate_size(self, source: str) -> int:
+        """Return the expected size in bytes of the downloaded media, 0 if unknown"""
+        data = self._downloader.download_metadata(
+            source, process_ie_data=True, stable_only=True
+        )
+        if data is None:
+            return 0
+
+        # The formats selected for the device may differ from the default ones
+        return self._downloader.expected_size(data)
+
     def pick_file_metadata(self, source: Path) -> dict:
         metadata = {field.name: None for field in METADATA_FIELDS}
         metadata["title"] = source.stem
         return metadata
 
-    def fetch_stream_link(self, source: str) -> Optional[str]:
-        data = self._downloader.download_metadata(source, process_ie_data=True)
+    def fetch_stream_link(self, source: str, fresh: bool = False) -> Optional[str]:
+        data = self._downloader.download_metadata(
+            source, process_ie_data=True, fresh=fresh
+        )
         if data is None:
             return None
 
@@ -0,0 +1,91 @@
+""" Stream links resolution """
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import time
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import structlog
+
+EXPIRY_PATH = re.compile(r"/expire/(\d+)")
+
+
+def link_expiry(link: str) -> Optional[float]:
+    """Return the expiry timestamp carried by a signed link, if any"""
+    url = urlparse(link)
+    query = {key.lower(): values for key, values in parse_qs(url.query).items()}
+    for key in ("expire", "expires"):
+        if key in query and query[key][0].isdigit():
+            return float(query[key][0])
+
+    match = EXPIRY_PATH.search(url.path)
+    return float(match.group(1)) if match else None
+
+
+class StreamLinkService:
+    """Resolve the links of streamed media when they are about to be played
+
+    Stream links are signed URLs expiring after a few hours. A resolved link is
+    kept until shortly before the expiry parsed from it, or default_ttl seconds when
+    the link doesn't tell. A link already expired when resolved, e.g. served from
+    stale metadata, is extracted again bypassing the metadata caches. Links can be
+    resolved ahead of time in the background.
+    """
+
+    # Don't hand out links expiring before the media is opened
+    EXPIRY_MARGIN = 60
+
+    def __init__(self, source_service, default_ttl: float, executor=None):
+        self._logger = structlog.get_logger(__name__)
+        self._source_service = source_service
+        self._default_ttl = default_ttl
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stream-link"
+        )
+        self._lock = Lock()
+        self._links = {}
+
+    def resolve(self, source: str) -> Optional[str]:
+        link = self._cached(source)
+        if link is not None:
+            return link
+
+        link = self._source_service.fetch_stream_link(source)
+        if link is not None and self._expired(link_expiry(link)):
+            self._logger.debug("Stream link expired", source=source)
+            link = self._source_service.fetch_stream_link(source, fresh=True)
+        if link is None:
+            return None
+
+        expiry = link_expiry(link) or time() + self._default_ttl
+        if self._expired(expiry):
+            self._logger.warning("Fresh stream link expired", source=source)
+            return link
+        with self._lock:
+            self._links[source] = (link, expiry)
+        self._logger.debug("Stream link resolved", source=source, expiry=expiry)
+        return link
+
+    def prefetch(self, sources: List[str]):
+        for source in sources:
+            if self._cached(source) is None:
+                self._executor.submit(self._prefetch, source)
+
+    def _cached(self, source: str) -> Optional[str]:
+        with self._lock:
+            link, expiry = self._links.get(source, (None, 0))
+            if not self._expired(expiry):
+                return link
+            self._links.pop(source, None)
+            return None
+
+    def _expired(self, expiry: Optional[float]) -> bool:
+        return expiry is not None and expiry - self.EXPIRY_MARGIN <= time()
+
+    def _prefetch(self, source: str):
+        try:
+            self.resolve(source)
+        except Exception as e:
+            self._logger.error("Stream link prefetch error", source=source, error=e)
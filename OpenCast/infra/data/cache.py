@@ -1,31 +1,352 @@
 """ Data caching module """
 
-
+import json
+import sqlite3
+import sys
+import zlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from threading import Event, Lock, RLock, Thread
+from time import monotonic, time
+from typing import Any, Callable, Optional
+
+
+def deep_sizeof(data) -> int:
+    """Estimate the memory used by data made of builtin containers"""
+    seen = set()
+    stack = [data]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class CacheStats:
+    """Count the cache lookups and the entries dropped from the cache"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
 
+class LRUCache:
+    """Cache bounded in entry count and size, evicting the least recently used
+
+    Entries expire ttl seconds after being registered. As they all live for the
+    same duration, the registration order is also the expiry order, so expired
+    entries are dropped from the front of that order in constant time. Expired
+    entries are never returned, a janitor thread drops them every cleanup_interval
+    seconds so that they don't hold memory until the next lookup.
+    """
 
-class TimeBasedCache:
     @dataclass
-    class TimeBasedData:
-        data: dict
-        creation_time: datetime
+    class Entry:
+        data: Any
+        size: int
+        expiry: float
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_size: int,
+        ttl: float,
+        cleanup_interval: Optional[float] = None,
+        sizeof: Callable[[Any], int] = deep_sizeof,
+    ):
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._ttl = ttl
+        self._sizeof = sizeof
+        self._lock = Lock()
+        self._entries = OrderedDict()  # Least recently used first
+        self._expiries = OrderedDict()  # Oldest registration first
+        self._size = 0
+        self.stats = CacheStats()
+
+        self._closed = Event()
+        self._janitor = None
+        if cleanup_interval is not None:
+            self._janitor = Thread(
+                target=self._run, args=(cleanup_interval,), name="cache-janitor"
+            )
+            self._janitor.daemon = True
+            self._janitor.start()
+
+    def __len__(self):
+        return len(self._entries)
 
-    def __init__(self, max_duration: timedelta) -> None:
-        self._max_duration = max_duration
-        self._cache = {}
+    @property
+    def size(self):
+        return self._size
 
     def get(self, key: str):
-        entry = self._cache.get(key)
-        if entry is None:
-            return entry
-        return entry.data
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expiry <= monotonic():
+                self._drop(key)
+                self.stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.data
 
     def register(self, key: str, data):
-        self._cache[key] = self.TimeBasedData(data, datetime.now())
+        size = self._sizeof(data)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self._max_size:
+                return
+
+            self._entries[key] = self.Entry(data, size, monotonic() + self._ttl)
+            self._expiries[key] = None
+            self._size += size
+            while len(self._entries) > self._max_entries or self._size > self._max_size:
+                self._drop(next(iter(self._entries)))
+                self.stats.evictions += 1
 
     def clean(self):
-        now = datetime.now()
-        for key in list(self._cache.keys()):
-            if now - self._cache[key].creation_time > self._max_duration:
-                del self._cache[key]
+        now = monotonic()
+        with self._lock:
+            while self._expiries:
+                key = next(iter(self._expiries))
+                if self._entries[key].expiry > now:
+                    break
+                self._drop(key)
+                self.stats.expirations += 1
+
+    def close(self):
+        self._closed.set()
+        if self._janitor is not None:
+            self._janitor.join()
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        del self._expiries[key]
+        self._size -= entry.size
+
+    def _run(self, interval: float):
+        while not self._closed.wait(interval):
+            self.clean()
+
+
+class SQLiteCache:
+    """Cache persisted in a SQLite file, evicting the least recently used entries
+
+    The values are stored compressed in the columns declared by the subclasses,
+    along with their size, expiry and last access. The cache is bounded in entry
+    count by max_entries and in bytes by max_size, a bound of 0 being unlimited.
+    Entries larger than max_size are not stored.
+    """
+
+    TABLE = "cache"
+    COLUMNS = {"value": "BLOB NOT NULL"}
+
+    def __init__(self, path: str, max_entries: int = 0, max_size: int = 0):
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._lock = RLock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{name} {kind}" for name, kind in self.COLUMNS.items())
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} (key TEXT PRIMARY KEY, "
+            f"{columns}, size INTEGER NOT NULL, expiry REAL NOT NULL, "
+            "accessed REAL NOT NULL)"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.TABLE}_accessed "
+            f"ON {self.TABLE} (accessed)"
+        )
+        self.stats = CacheStats()
+        self.clean()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def size(self):
+        return self._size
+
+    def clean(self):
+        with self._lock:
+            self._execute(f"DELETE FROM {self.TABLE} WHERE expiry <= ?", (time(),))
+            self._count, self._size = self._execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}"
+            )[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _lookup(self, key: str, valid: Callable = None):
+        """Return the columns of an unexpired entry accepted by valid(row, now)"""
+        now = time()
+        with self._lock:
+            rows = self._execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM {self.TABLE} "
+                "WHERE key = ? AND expiry > ?",
+                (key, now),
+            )
+            if not rows or (valid is not None and not valid(rows[0], now)):
+                self.stats.misses += 1
+                return None
+
+            self.stats.hits += 1
+            self._execute(
+                f"UPDATE {self.TABLE} SET accessed = ? WHERE key = ?", (now, key)
+            )
+            return rows[0]
+
+    def _store(self, key: str, values: dict, ttl: float):
+        size = sum(len(value) for value in values.values() if isinstance(value, bytes))
+        if self._max_size and size > self._max_size:
+            return
+
+        now = time()
+        row = {"key": key, **values, "size": size, "expiry": now + ttl, "accessed": now}
+        with self._lock:
+            self._remove(key)
+            self._execute(
+                f"INSERT INTO {self.TABLE} ({', '.join(row)}) "
+                f"VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values()),
+            )
+            self._count += 1
+            self._size += size
+            self._evict()
+
+    def _remove(self, key: str):
+        rows = self._execute(f"SELECT size FROM {self.TABLE} WHERE key = ?", (key,))
+        if rows:
+            self._execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+            self._count -= 1
+            self._size -= rows[0][0]
+
+    def _full(self):
+        return (self._max_entries and self._count > self._max_entries) or (
+            self._max_size and self._size > self._max_size
+        )
+
+    def _evict(self):
+        while self._full():
+            key, size = self._execute(
+                f"SELECT key, size FROM {self.TABLE} ORDER BY accessed LIMIT 1"
+            )[0]
+            self._execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+            self._count -= 1
+            self._size -= size
+            self.stats.evictions += 1
+
+    def _execute(self, sql: str, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @staticmethod
+    def _encode(data) -> bytes:
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+    @staticmethod
+    def _decode(data: bytes):
+        return json.loads(zlib.decompress(data))
+
+
+class PersistentCache(SQLiteCache):
+    """Cache persisted in a SQLite file, bounded in entry count
+
+    Entries expire ttl seconds after being registered, empty values after
+    negative_ttl seconds so that missing results are retried sooner.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float, negative_ttl: float):
+        super().__init__(path, max_entries=max_entries)
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+
+    def get(self, key: str):
+        row = self._lookup(key)
+        return None if row is None else self._decode(row[0])
+
+    def register(self, key: str, data):
+        ttl = self._ttl if data else self._negative_ttl
+        self._store(key, {"value": self._encode(data)}, ttl)
+
+
+class FlightStats:
+    """Count the calls made through a single flight and the ones sharing a result"""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+
+    def shared_ratio(self):
+        return self.shared / self.calls if self.calls else 0
+
+
+class SingleFlight:
+    """Execute a single call at a time per key
+
+    Concurrent callers for a key being processed wait for the in-flight call and
+    share its result, or its exception, instead of repeating the work.
+    """
+
+    class Call:
+        def __init__(self):
+            self.done = Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}
+        self.stats = FlightStats()
+
+    def do(self, key: str, func: Callable[[], Any]):
+        """Return the result of func, and whether it was shared with another call"""
+        with self._lock:
+            self.stats.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self.Call()
+            else:
+                self.stats.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -1,10 +1,9 @@
 """ The facade exposing persistence capabilities """
-from threading import RLock
 
 
 class DataFacade:
-    def __init__(self, database, repo_factory):
-        db_lock = RLock()
+    def __init__(self, database, repo_factory, db_lock):
+        self._database = database
         self._player_repo = repo_factory.make_player_repo(database, db_lock)
         self._video_repo = repo_factory.make_video_repo(database, db_lock)
         self._playlist_repo = repo_factory.make_playlist_repo(database, db_lock)
@@ -30,3 +29,6 @@ class DataFacade:
     @property
     def artist_repo(self):
         return self._artist_repo
+
+    def close(self):
+        self._database.close()
@@ -0,0 +1,249 @@
+""" Database persisted as an append-only journal of changes and periodic snapshots """
+
+import json
+import os
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import List
+
+import structlog
+
+
+class JournalTable:
+    """Expose the documents of an entity table keyed by their id"""
+
+    def __init__(self, database, name: str, documents: dict):
+        self._db = database
+        self._name = name
+        self._documents = documents
+
+    def insert(self, document: dict):
+        self._db.record(self._name, "insert", document["id"], document)
+
+    def update(self, document: dict):
+        id_ = document["id"]
+        self._db.record(self._name, "update", id_, {**self._documents[id_], **document})
+
+    def remove(self, id_: str):
+        if id_ in self._documents:
+            self._db.record(self._name, "remove", id_, None)
+
+    def get(self, id_: str):
+        return self._documents.get(id_)
+
+    def contains(self, id_: str):
+        return id_ in self._documents
+
+    def get_many(self, ids: List[str]):
+        return [self._documents.get(id_) for id_ in ids]
+
+    def all(self):
+        return list(self._documents.values())
+
+    def search(self, cond):
+        return [document for document in self._documents.values() if cond(document)]
+
+    def transaction(self):
+        return self._db.transaction()
+
+    def reload(self):
+        pass
+
+
+class JournalDatabase:
+    """Keep the entities in memory and persist their changes to an append-only log
+
+    Each transaction is appended to the log as a single checksummed line, so that
+    committing costs one small append instead of rewriting the whole database. The
+    log is compacted into a snapshot every snapshot_changes transactions. Opening
+    the database loads the snapshot and replays the log tail, a torn or corrupted
+    tail is discarded. The log doubles as an audit trail of the recent changes.
+    """
+
+    def __init__(self, path: str, lock, snapshot_changes: int = 1000, **kwargs):
+        self._logger = structlog.get_logger(__name__)
+        self._log_path = Path(path)
+        self._snapshot_path = self._log_path.with_name(
+            f"{self._log_path.name}.snapshot"
+        )
+        self._lock = lock
+        self._snapshot_changes = snapshot_changes
+        self._dumps = partial(json.dumps, separators=(",", ":"), **kwargs)
+
+        self._tables = {}
+        self._depth = 0
+        self._pending = []
+        self._undo = []
+
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._sequence = self._load_snapshot()
+        self._snapshot_sequence = self._sequence
+        self._replay()
+        self._log = open(self._log_path, "ab")
+
+    def table(self, name: str):
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = JournalTable(self, name, {})
+            return self._tables[name]
+
+    def tables(self):
+        return set(self._tables.keys())
+
+    def record(self, table: str, operation: str, id_: str, document):
+        with self.transaction():
+            documents = self.table(table)._documents
+            self._undo.append((documents, id_, documents.get(id_)))
+            self._apply(documents, operation, id_, document)
+            self._pending.append([table, operation, id_, document])
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._rollback()
+                raise
+            self._depth -= 1
+            if self._depth == 0 and self._pending:
+                try:
+                    self._append()
+                except BaseException:
+                    self._rollback()
+                    raise
+
+    def snapshot(self):
+        """Compact the log into a new snapshot"""
+        with self._lock:
+            if self._sequence == self._snapshot_sequence:
+                return
+
+            content = self._dumps(
+                {
+                    "sequence": self._sequence,
+                    "tables": {
+                        name: list(table._documents.values())
+                        for name, table in self._tables.items()
+                    },
+                }
+            )
+            tmp_path = self._snapshot_path.with_name(f"{self._snapshot_path.name}.tmp")
+            with open(tmp_path, "w") as file:
+                file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self._snapshot_path)
+
+            # Records up to the snapshot sequence are skipped when replaying,
+            # a crash before truncating the log is therefore harmless
+            self._log.truncate(0)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._snapshot_sequence = self._sequence
+            self._logger.debug("Database snapshot", sequence=self._sequence)
+
+    def close(self):
+        with self._lock:
+            if self._log.closed:
+                return
+            self.snapshot()
+            self._log.close()
+
+    def _append(self):
+        self._sequence += 1
+        record = self._dumps(
+            {
+                "seq": self._sequence,
+                "time": datetime.now().isoformat(),
+                "ops": self._pending,
+            }
+        ).encode()
+        line = b"%08x %s\n" % (zlib.crc32(record), record)
+        # The position is not moved by truncating the log after a snapshot
+        offset = os.fstat(self._log.fileno()).st_size
+        try:
+            self._log.write(line)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        except BaseException:
+            # Never leave a partial line before the next records
+            self._log.truncate(offset)
+            self._sequence -= 1
+            raise
+
+        self._pending = []
+        self._undo = []
+        if self._sequence - self._snapshot_sequence >= self._snapshot_changes:
+            self.snapshot()
+
+    def _rollback(self):
+        for documents, id_, document in reversed(self._undo):
+            if document is None:
+                documents.pop(id_, None)
+            else:
+                documents[id_] = document
+        self._pending = []
+        self._undo = []
+
+    def _apply(self, documents: dict, operation: str, id_: str, document):
+        if operation == "remove":
+            documents.pop(id_, None)
+        else:
+            documents[id_] = document
+
+    def _load_snapshot(self):
+        if not self._snapshot_path.exists():
+            return 0
+
+        with open(self._snapshot_path) as file:
+            snapshot = json.load(file)
+        for name, documents in snapshot["tables"].items():
+            self._tables[name] = JournalTable(
+                self, name, {document["id"]: document for document in documents}
+            )
+        return snapshot["sequence"]
+
+    def _replay(self):
+        if not self._log_path.exists():
+            return
+
+        valid_size = 0
+        replayed = 0
+        with open(self._log_path, "rb") as file:
+            for line in file:
+                record = self._parse(line)
+                if record is None:
+                    self._logger.warning(
+                        "Discarding corrupted journal tail", offset=valid_size
+                    )
+                    break
+
+                valid_size += len(line)
+                if record["seq"] <= self._sequence:
+                    continue
+                for table, operation, id_, document in record["ops"]:
+                    self._apply(self.table(table)._documents, operation, id_, document)
+                self._sequence = record["seq"]
+                replayed += 1
+
+        if valid_size != self._log_path.stat().st_size:
+            os.truncate(self._log_path, valid_size)
+        self._logger.debug("Journal replayed", records=replayed)
+
+    def _parse(self, line: bytes):
+        if not line.endswith(b"\n") or len(line) < 10:
+            return None
+        checksum, record = line[:8], line[9:-1]
+        try:
+            if int(checksum, 16) != zlib.crc32(record):
+                return None
+            return json.loads(record)
+        except ValueError:
+            return None
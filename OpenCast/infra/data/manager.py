@@ -1,15 +1,22 @@
 from enum import Enum, auto
+from threading import RLock
 
 import structlog
 from tinydb import TinyDB
 from tinydb.storages import JSONStorage, MemoryStorage
 
 from .facade import DataFacade
+from .journal import JournalDatabase
+from .sqlite import SQLiteDatabase
+from .storage import BufferedJSONStorage, TransactionMiddleware
 
 
 class StorageType(Enum):
     JSON = auto()
     MEMORY = auto()
+    BUFFERED_JSON = auto()
+    SQLITE = auto()
+    JOURNAL = auto()
 
 
 class DataManager(object):
@@ -18,6 +25,18 @@ class DataManager(object):
         self._repo_factory = repo_factory
 
     def connect(self, storage: StorageType, **kwargs):
-        storage = JSONStorage if storage == StorageType.JSON else MemoryStorage
-        database = TinyDB(storage=storage, **kwargs)
-        return DataFacade(database, self._repo_factory)
+        db_lock = RLock()
+        if storage == StorageType.SQLITE:
+            database = SQLiteDatabase(lock=db_lock, **kwargs)
+        elif storage == StorageType.JOURNAL:
+            database = JournalDatabase(lock=db_lock, **kwargs)
+        elif storage == StorageType.BUFFERED_JSON:
+            database = TinyDB(
+                storage=TransactionMiddleware(BufferedJSONStorage),
+                lock=db_lock,
+                **kwargs,
+            )
+        else:
+            storage = JSONStorage if storage == StorageType.JSON else MemoryStorage
+            database = TinyDB(storage=TransactionMiddleware(storage), **kwargs)
+        return DataFacade(database, self._repo_factory, db_lock)
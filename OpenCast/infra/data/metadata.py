@@ -0,0 +1,103 @@
+""" Persistent cache of the media metadata """
+
+from time import time
+from typing import Dict, Optional
+
+import structlog
+
+from .cache import SQLiteCache
+
+# Fields only valid for a short time, e.g. signed stream URLs
+VOLATILE_FIELDS = {
+    "url",
+    "manifest_url",
+    "fragment_base_url",
+    "fragments",
+    "formats",
+    "requested_formats",
+    "requested_downloads",
+    "requested_subtitles",
+    "subtitles",
+    "automatic_captions",
+    "http_headers",
+}
+
+
+def split_volatile(metadata: dict):
+    """Separate the volatile fields from the stable ones, playlist entries included"""
+    stable = {}
+    volatile = {}
+    for key, value in metadata.items():
+        if key in VOLATILE_FIELDS:
+            volatile[key] = value
+        elif key == "entries" and isinstance(value, list):
+            parts = [split_volatile(entry) if entry else (entry, {}) for entry in value]
+            stable[key] = [entry for entry, _ in parts]
+            volatile[key] = [entry_volatile for _, entry_volatile in parts]
+        else:
+            stable[key] = value
+    return stable, volatile
+
+
+def merge_volatile(stable: dict, volatile: dict):
+    metadata = {**stable, **volatile}
+    if isinstance(stable.get("entries"), list):
+        metadata["entries"] = [
+            merge_volatile(entry, entry_volatile) if entry else entry
+            for entry, entry_volatile in zip(stable["entries"], volatile["entries"])
+        ]
+    return metadata
+
+
+class MetadataStore(SQLiteCache):
+    """Persist the extracted metadata across restarts
+
+    The stable fields, e.g. title or duration, expire after the TTL of the
+    extractor that produced them, or the default one. The volatile fields expire
+    after volatile_ttl, after which only the stable fields can be retrieved. Both
+    are stored compressed and the least recently used entries are evicted when the
+    stored size exceeds max_size bytes.
+    """
+
+    TABLE = "metadata"
+    COLUMNS = {
+        "stable": "BLOB NOT NULL",
+        "volatile": "BLOB NOT NULL",
+        "volatile_expiry": "REAL NOT NULL",
+    }
+
+    def __init__(
+        self, path: str, max_size: int, ttls: Dict[str, float], volatile_ttl: float
+    ):
+        super().__init__(path, max_size=max_size)
+        self._logger = structlog.get_logger(__name__)
+        self._ttls = {extractor.lower(): ttl for extractor, ttl in ttls.items()}
+        self._volatile_ttl = volatile_ttl
+
+    def get(self, key: str, stable_only: bool = False) -> Optional[dict]:
+        """Return the metadata, or only its stable fields if the caller allows it"""
+        row = self._lookup(key, lambda row, now: stable_only or row[2] > now)
+        if row is None:
+            return None
+
+        stable, volatile, volatile_expiry = row
+        stable = self._decode(stable)
+        if volatile_expiry <= time():
+            return stable
+        return merge_volatile(stable, self._decode(volatile))
+
+    def register(self, key: str, metadata: dict):
+        extractor = metadata.get("extractor_key") or metadata.get("ie_key") or ""
+        ttl = self._ttls.get(extractor.lower(), self._ttls["default"])
+        try:
+            stable, volatile = (self._encode(part) for part in split_volatile(metadata))
+        except (TypeError, ValueError) as e:
+            self._logger.warning("Uncacheable metadata", key=key, error=e)
+            return
+
+        values = {
+            "stable": stable,
+            "volatile": volatile,
+            "volatile_expiry": time() + self._volatile_ttl,
+        }
+        self._store(key, values, ttl)
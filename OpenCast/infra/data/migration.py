@@ -0,0 +1,72 @@
+""" Database migration operations """
+
+import os
+from threading import RLock
+
+import structlog
+from tinydb import TinyDB
+from tinydb.storages import JSONStorage
+
+from .journal import JournalDatabase
+from .sqlite import SQLiteDatabase
+
+
+def migrate_json_to_sqlite(json_path: str, sqlite_path: str, **kwargs):
+    """Copy every table of a TinyDB JSON database into a new SQLite database
+
+    The database is built apart and moved to its path once complete, an interrupted
+    migration leaves no database so that it is run again on the next start.
+    """
+    tmp_path = f"{sqlite_path}.migrating"
+    tmp_files = [tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"]
+    # Left by an interrupted migration
+    _remove(*tmp_files)
+    try:
+        _copy_json(json_path, SQLiteDatabase(tmp_path, RLock(), **kwargs))
+        os.replace(tmp_path, sqlite_path)
+    finally:
+        _remove(*tmp_files)
+
+
+def migrate_json_to_journal(json_path: str, journal_path: str, **kwargs):
+    """Copy every table of a TinyDB JSON database into a new journal
+
+    The copy is appended as a single journal record and compacted into a snapshot
+    when closing the journal. The journal is built apart and moved to its path once
+    complete, as for the SQLite database.
+    """
+    tmp_path = f"{journal_path}.migrating"
+    tmp_files = [tmp_path, f"{tmp_path}.snapshot"]
+    _remove(*tmp_files)
+    try:
+        _copy_json(json_path, JournalDatabase(tmp_path, RLock(), **kwargs))
+        if os.path.exists(tmp_files[1]):
+            os.replace(tmp_files[1], f"{journal_path}.snapshot")
+        # Moved last, the log marks a completed migration
+        os.replace(tmp_path, journal_path)
+    finally:
+        _remove(*tmp_files)
+
+
+def _copy_json(json_path: str, destination):
+    logger = structlog.get_logger(__name__)
+    source = TinyDB(json_path, storage=JSONStorage, access_mode="r")
+    try:
+        with destination.transaction():
+            for name in source.tables():
+                documents = source.table(name).all()
+                table = destination.table(name)
+                for document in documents:
+                    table.insert(dict(document))
+                logger.info("Table migrated", table=name, count=len(documents))
+    finally:
+        source.close()
+        destination.close()
+
+
+def _remove(*paths: str):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
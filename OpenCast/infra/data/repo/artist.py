@@ -1,18 +1,10 @@
 """ Artist repository """
 
 from OpenCast.domain.model.artist import Artist
-from OpenCast.infra import Id
 
-from .repository import Repository
+from .container import ContainerRepo
 
 
-class ArtistRepo(Repository):
-    def __init__(self, database, db_lock):
-        super().__init__(database, db_lock, Artist)
-
-    def list_containing(self, video_id: Id):
-        with self._lock:
-            results = self._collection.search(
-                lambda entity: str(video_id) in entity["ids"]
-            )
-        return [self._entity.from_dict(result) for result in results]
+class ArtistRepo(ContainerRepo):
+    def __init__(self, database, db_lock, indexed=False):
+        super().__init__(database, db_lock, Artist, indexed)
@@ -0,0 +1,116 @@
+""" Document collections backing the repositories """
+
+from contextlib import nullcontext
+from typing import List
+
+from tinydb import where
+from tinydb.table import Table
+
+from ..storage import TransactionMiddleware
+
+
+def make_collection(table, indexed: bool):
+    # Tables from other databases already look documents up by id
+    if not isinstance(table, Table):
+        return table
+    return IndexedCollection(table) if indexed else Collection(table)
+
+
+class Collection:
+    """Access the documents of a table by scanning it"""
+
+    def __init__(self, table):
+        self._table = table
+
+    def insert(self, document: dict):
+        self._table.insert(document)
+
+    def update(self, document: dict):
+        self._table.update(document, where("id") == document["id"])
+
+    def remove(self, id_: str):
+        self._table.remove(where("id") == id_)
+
+    def get(self, id_: str):
+        results = self._table.search(where("id") == id_)
+        return results[0] if results else None
+
+    def contains(self, id_: str):
+        return self._table.contains(where("id") == id_)
+
+    def get_many(self, ids: List[str]):
+        wanted = set(ids)
+        documents = {
+            document["id"]: document
+            for document in self._table.search(where("id").one_of(wanted))
+        }
+        return [documents.get(id_) for id_ in ids]
+
+    def all(self):
+        return self._table.all()
+
+    def search(self, cond):
+        return self._table.search(cond)
+
+    def transaction(self):
+        storage = self._table.storage
+        if isinstance(storage, TransactionMiddleware):
+            return storage.transaction()
+        return nullcontext()
+
+    def reload(self):
+        self._table.clear_cache()
+
+
+class IndexedCollection(Collection):
+    """Access the documents of a table through an in-memory id index
+
+    The index maps each entity id to its document and to the document id used by
+    the table, so that lookups never hit the table and writes target a single
+    document.
+    """
+
+    def __init__(self, table):
+        super().__init__(table)
+        self.reload()
+
+    def reload(self):
+        super().reload()
+        self._doc_ids = {}
+        self._documents = {}
+        for document in self._table.all():
+            self._doc_ids[document["id"]] = document.doc_id
+            self._documents[document["id"]] = dict(document)
+
+    def insert(self, document: dict):
+        doc_id = self._table.insert(document)
+        self._doc_ids[document["id"]] = doc_id
+        self._documents[document["id"]] = document
+
+    def update(self, document: dict):
+        id_ = document["id"]
+        self._table.update(document, doc_ids=[self._doc_ids[id_]])
+        self._documents[id_] = {**self._documents[id_], **document}
+
+    def remove(self, id_: str):
+        doc_id = self._doc_ids.pop(id_, None)
+        if doc_id is None:
+            return
+
+        self._table.remove(doc_ids=[doc_id])
+        del self._documents[id_]
+
+    def get(self, id_: str):
+        return self._documents.get(id_)
+
+    def contains(self, id_: str):
+        return id_ in self._documents
+
+    def get_many(self, ids: List[str]):
+        return [self._documents.get(id_) for id_ in ids]
+
+    def all(self):
+        return list(self._documents.values())
+
+    def search(self, cond):
+        return [document for document in self._documents.values() if cond(document)]
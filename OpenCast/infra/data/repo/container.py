@@ -0,0 +1,39 @@
+""" Abstraction of a repository storing entities grouping videos """
+
+from OpenCast.infra import Id
+
+from .context import Operation
+from .membership import MembershipIndex
+from .repository import Repository
+
+
+class ContainerRepo(Repository):
+    def __init__(self, database, db_lock, entity, indexed=False):
+        super().__init__(database, db_lock, entity, indexed)
+        self._membership = MembershipIndex()
+        with self._lock:
+            self._index_all()
+
+    def list_containing(self, video_id: Id):
+        with self._lock:
+            results = [
+                self._collection.get(container_id)
+                for container_id in self._membership.containers(str(video_id))
+            ]
+        return [self._load(result) for result in results]
+
+    def _apply(self, operation, document: dict):
+        super()._apply(operation, document)
+        if operation is Operation.DELETE:
+            self._membership.remove(document["id"])
+        else:
+            self._membership.update(document["id"], document["ids"])
+
+    def _reload(self):
+        super()._reload()
+        self._membership = MembershipIndex()
+        self._index_all()
+
+    def _index_all(self):
+        for document in self._collection.all():
+            self._membership.update(document["id"], document["ids"])
@@ -2,6 +2,14 @@
 Database context in charge of recording and applying transactions on repositories
 """
 
+from enum import Enum, auto
+
+
+class Operation(Enum):
+    CREATE = auto()
+    UPDATE = auto()
+    DELETE = auto()
+
 
 class Context:
     def __init__(self, repo):
@@ -9,17 +17,16 @@ class Context:
         self._transactions = []
 
     def add(self, entity):
-        self._transactions.append((entity, self._repo.create))
+        self._transactions.append((entity, Operation.CREATE))
 
     def update(self, entity):
-        self._transactions.append((entity, self._repo.update))
+        self._transactions.append((entity, Operation.UPDATE))
 
     def delete(self, entity):
-        self._transactions.append((entity, self._repo.delete))
+        self._transactions.append((entity, Operation.DELETE))
 
     def entities(self):
         return [transaction[0] for transaction in self._transactions]
 
     def commit(self):
-        for entity, transaction in self._transactions:
-            transaction(entity)
+        self._repo.commit(self._transactions)
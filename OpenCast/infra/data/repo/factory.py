@@ -9,17 +9,20 @@ from .video import VideoRepo
 
 
 class RepoFactory:
+    def __init__(self, indexed: bool = False):
+        self._indexed = indexed
+
     def make_player_repo(self, *args):
-        return PlayerRepo(*args)
+        return PlayerRepo(*args, indexed=self._indexed)
 
     def make_video_repo(self, *args):
-        return VideoRepo(*args)
+        return VideoRepo(*args, indexed=self._indexed)
 
     def make_playlist_repo(self, *args):
-        return PlaylistRepo(*args)
+        return PlaylistRepo(*args, indexed=self._indexed)
 
     def make_album_repo(self, *args):
-        return AlbumRepo(*args)
+        return AlbumRepo(*args, indexed=self._indexed)
 
     def make_artist_repo(self, *args):
-        return ArtistRepo(*args)
+        return ArtistRepo(*args, indexed=self._indexed)
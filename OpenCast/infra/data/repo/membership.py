@@ -0,0 +1,31 @@
+""" Reverse index from elements to the containers grouping them """
+
+from typing import Iterable, List
+
+
+class MembershipIndex:
+    def __init__(self):
+        self._elements = {}  # container id -> element ids
+        self._containers = {}  # element id -> container ids, in insertion order
+
+    def update(self, container_id: str, element_ids: Iterable[str]):
+        old = self._elements.get(container_id, set())
+        new = set(element_ids)
+        for element_id in old - new:
+            self._unlink(element_id, container_id)
+        for element_id in new - old:
+            self._containers.setdefault(element_id, {})[container_id] = None
+        self._elements[container_id] = new
+
+    def remove(self, container_id: str):
+        for element_id in self._elements.pop(container_id, set()):
+            self._unlink(element_id, container_id)
+
+    def containers(self, element_id: str) -> List[str]:
+        return list(self._containers.get(element_id, {}))
+
+    def _unlink(self, element_id: str, container_id: str):
+        containers = self._containers[element_id]
+        del containers[container_id]
+        if not containers:
+            del self._containers[element_id]
@@ -6,9 +6,16 @@ from .repository import Repository
 
 
 class PlayerRepo(Repository):
-    def __init__(self, database, db_lock):
-        super().__init__(database, db_lock, Player)
+    def __init__(self, database, db_lock, indexed=False):
+        super().__init__(database, db_lock, Player, indexed)
 
     def get_player(self):
         collection = self.list()
         return collection[0] if collection else None
+
+    def get_queue(self):
+        with self._lock:
+            documents = self._collection.all()
+        if not documents:
+            return None
+        return self._entity.fields_from_dict(documents[0], ["queue"])["queue"]
@@ -1,18 +1,10 @@
 """ Playlist repository """
 
 from OpenCast.domain.model.playlist import Playlist
-from OpenCast.infra import Id
 
-from .repository import Repository
+from .container import ContainerRepo
 
 
-class PlaylistRepo(Repository):
-    def __init__(self, database, db_lock):
-        super().__init__(database, db_lock, Playlist)
-
-    def list_containing(self, video_id: Id):
-        with self._lock:
-            results = self._collection.search(
-                lambda entity: str(video_id) in entity["ids"]
-            )
-        return [self._entity.from_dict(result) for result in results]
+class PlaylistRepo(ContainerRepo):
+    def __init__(self, database, db_lock, indexed=False):
+        super().__init__(database, db_lock, Playlist, indexed)
@@ -1,61 +1,175 @@
 """ Abstraction of a repository """
 
-from typing import List
+from typing import Any, Iterator, List, Optional, Tuple
 
-from tinydb import where
+import structlog
 
 from OpenCast.infra import Id
 
-from .context import Context
+from .collection import make_collection
+from .context import Context, Operation
 from .error import RepoError
+from .snapshot import Snapshot
+
+
+class CommitStats:
+    """Count the entities written by repository commits"""
+
+    def __init__(self):
+        self.commits = 0
+        self.entities = 0
+        self.max_entities = 0
+
+    def record(self, count: int):
+        self.commits += 1
+        self.entities += count
+        self.max_entities = max(self.max_entities, count)
+
+    def mean(self):
+        return self.entities / self.commits if self.commits else 0
 
 
 class Repository:
-    def __init__(self, database, db_lock, entity):
+    def __init__(self, database, db_lock, entity, indexed=False):
         self._db = database
         self._lock = db_lock
         self._entity = entity
-        self._collection = database.table(entity.__name__)
+        self._collection = make_collection(database.table(entity.__name__), indexed)
+        self._logger = structlog.get_logger(__name__)
+        self.commit_stats = CommitStats()
+        self._snapshot = None
 
     def create(self, entity):
-        with self._lock:
-            if self.exists(entity.id):
-                raise RepoError(f"cannot create: '{entity}' already exists")
-
-            self._collection.insert(entity.to_dict())
+        self.commit([(entity, Operation.CREATE)])
 
     def update(self, entity):
-        with self._lock:
-            e = self.get(entity.id)
-            if e is None:
-                raise RepoError(f"cannot update: '{entity}' doesn't exist")
-
-            self._collection.update(entity.to_dict(), where("id") == str(entity.id))
+        self.commit([(entity, Operation.UPDATE)])
 
     def delete(self, entity):
+        self.commit([(entity, Operation.DELETE)])
+
+    def commit(self, transactions: List[Tuple[Any, Operation]]):
+        """Apply the transactions as a single unit of work
+
+        All the transactions are validated and serialized before writing anything,
+        then written within one storage transaction. Either all of them are applied
+        or none is.
+        """
+        if not transactions:
+            return
+
         with self._lock:
-            self._collection.remove(where("id") == str(entity.id))
+            changes = self._prepare(transactions)
+            try:
+                with self._collection.transaction():
+                    for operation, document in changes:
+                        self._apply(operation, document)
+            except Exception:
+                self._reload()
+                raise
+
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.publish(
+                    (operation is Operation.DELETE, document)
+                    for operation, document in changes
+                )
+            self.commit_stats.record(len(changes))
+        self._logger.debug("Commit", entity=self._entity.__name__, count=len(changes))
 
-    def list(self, ids: List[Id] = None):
+    def list(self, ids: List[Id] = None, keep_missing: bool = False):
+        """List the entities, or the ones matching the ids in the same order
+
+        Unknown ids are skipped, unless keep_missing is set in which case None is
+        returned in their place.
+        """
         with self._lock:
             if ids is None:
                 results = self._collection.all()
             else:
-                results = self._collection.search(
-                    lambda entity: Id(entity["id"]) in ids
-                )
-                results.sort(key=lambda entity: ids.index(Id(entity["id"])))
+                results = self._collection.get_many([str(id_) for id_ in ids])
 
-        return [self._entity.from_dict(result) for result in results]
+        return [
+            None if result is None else self._load(result)
+            for result in results
+            if keep_missing or result is not None
+        ]
+
+    def iterate(
+        self, ids: List[Id], keep_missing: bool = False, chunk_size: int = 50
+    ) -> Iterator:
+        """Lazily yield the entities matching the ids, fetching them by chunk"""
+        for start in range(0, len(ids), chunk_size):
+            yield from self.list(ids[start : start + chunk_size], keep_missing)
 
     def get(self, id_: Id):
         with self._lock:
-            results = self._collection.search(where("id") == str(id_))
-        return None if not results else self._entity.from_dict(results[0])
+            result = self._collection.get(str(id_))
+        return None if result is None else self._load(result)
 
     def exists(self, id_: Id):
         with self._lock:
-            return self.get(id_) is not None
+            return self._collection.contains(str(id_))
+
+    def get_fields(self, id_: Id, *names: str) -> Optional[dict]:
+        """Read some fields of the entity without loading it entirely"""
+        with self._lock:
+            document = self._collection.get(str(id_))
+        return (
+            None if document is None else self._entity.fields_from_dict(document, names)
+        )
+
+    def snapshot(self) -> Snapshot:
+        """Return an immutable view of the entities at the last commit
+
+        The first call builds the view, then each commit publishes a new version of
+        it. Reading a snapshot never takes the repository lock, so that readers are
+        not blocked by long writes.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    documents = {doc["id"]: doc for doc in self._collection.all()}
+                    self._snapshot = Snapshot(0, documents, self._load)
+                snapshot = self._snapshot
+        return snapshot
 
     def make_context(self):
         return Context(self)
+
+    def _load(self, document: dict):
+        return self._entity.from_dict(document, trusted=True)
+
+    def _prepare(self, transactions):
+        exists = {}
+        changes = []
+        for entity, operation in transactions:
+            id_ = str(entity.id)
+            if id_ not in exists:
+                exists[id_] = self._collection.contains(id_)
+
+            if operation is Operation.CREATE:
+                if exists[id_]:
+                    raise RepoError(f"cannot create: '{entity}' already exists")
+                exists[id_] = True
+                changes.append((operation, entity.to_dict()))
+            elif operation is Operation.UPDATE:
+                if not exists[id_]:
+                    raise RepoError(f"cannot update: '{entity}' doesn't exist")
+                changes.append((operation, entity.to_dict()))
+            else:
+                exists[id_] = False
+                changes.append((operation, {"id": id_}))
+        return changes
+
+    def _apply(self, operation, document: dict):
+        if operation is Operation.CREATE:
+            self._collection.insert(document)
+        elif operation is Operation.UPDATE:
+            self._collection.update(document)
+        else:
+            self._collection.remove(document["id"])
+
+    def _reload(self):
+        self._collection.reload()
+        self._snapshot = None
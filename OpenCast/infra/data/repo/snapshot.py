@@ -0,0 +1,100 @@
+""" Immutable versioned view of the entities of a repository """
+
+from math import isqrt
+from typing import Callable, Iterator, List, Mapping
+
+from OpenCast.infra import Id
+
+
+class Snapshot:
+    """Read the entities as they were at a given version
+
+    The documents are never modified once the snapshot is published, reads are
+    therefore consistent and don't need the repository lock.
+
+    A version is made of the documents of a base version and of the documents
+    changed since, a deleted document being changed to None. Publishing a version
+    copies the changes only, which are merged into a new base once they outnumber
+    the square root of the base size, keeping the copies small on large tables.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        documents: Mapping[str, dict],
+        load: Callable,
+        changes: Mapping[str, dict] = None,
+        size: int = None,
+    ):
+        self._version = version
+        self._documents = documents
+        self._changes = changes or {}
+        self._size = len(documents) if size is None else size
+        self._load = load
+
+    @property
+    def version(self):
+        return self._version
+
+    def get(self, id_: Id):
+        document = self._document(str(id_))
+        return None if document is None else self._load(document)
+
+    def exists(self, id_: Id):
+        return self._document(str(id_)) is not None
+
+    def list(self, ids: List[Id] = None, keep_missing: bool = False):
+        if ids is None:
+            return [self._load(document) for document in self._iter_documents()]
+
+        documents = (self._document(str(id_)) for id_ in ids)
+        return [
+            None if document is None else self._load(document)
+            for document in documents
+            if keep_missing or document is not None
+        ]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.list())
+
+    def __len__(self):
+        return self._size
+
+    def publish(self, changes) -> "Snapshot":
+        """Make the next version of the snapshot from the committed changes
+
+        The documents are copied on write, readers of this version are unaffected.
+        """
+        overlay = dict(self._changes)
+        size = self._size
+        for delete, document in changes:
+            id_ = document["id"]
+            existed = (
+                overlay[id_] is not None if id_ in overlay else id_ in self._documents
+            )
+            overlay[id_] = None if delete else document
+            size += int(not delete) - int(existed)
+
+        if len(overlay) <= isqrt(len(self._documents)):
+            return Snapshot(
+                self._version + 1, self._documents, self._load, overlay, size
+            )
+
+        # Merge the changes into a new base
+        current = Snapshot(self._version, self._documents, self._load, overlay, size)
+        documents = {document["id"]: document for document in current._iter_documents()}
+        return Snapshot(self._version + 1, documents, self._load)
+
+    def _document(self, id_: str):
+        if id_ in self._changes:
+            return self._changes[id_]
+        return self._documents.get(id_)
+
+    def _iter_documents(self):
+        for id_, document in self._documents.items():
+            document = self._changes.get(id_, document)
+            if document is not None:
+                yield document
+        for id_, document in self._changes.items():
+            if document is not None and id_ not in self._documents:
+                yield document
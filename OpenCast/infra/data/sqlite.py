@@ -0,0 +1,128 @@
+""" SQLite database storing one JSON document per entity """
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from functools import partial
+from typing import List
+
+
+class SQLiteTable:
+    """Expose the documents of an entity table keyed by their id"""
+
+    # Stay below SQLITE_MAX_VARIABLE_NUMBER on older SQLite versions
+    MAX_PARAMETERS = 500
+
+    def __init__(self, database, name: str):
+        self._db = database
+        self._name = name
+        self._db.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" '
+            "(id TEXT PRIMARY KEY, document TEXT NOT NULL)"
+        )
+
+    def insert(self, document: dict):
+        with self._db.transaction():
+            self._db.execute(
+                f'INSERT INTO "{self._name}" (id, document) VALUES (?, ?)',
+                (document["id"], self._db.dumps(document)),
+            )
+
+    def update(self, document: dict):
+        with self._db.transaction():
+            self._db.execute(
+                f'UPDATE "{self._name}" SET document = ? WHERE id = ?',
+                (self._db.dumps(document), document["id"]),
+            )
+
+    def remove(self, id_: str):
+        with self._db.transaction():
+            self._db.execute(f'DELETE FROM "{self._name}" WHERE id = ?', (id_,))
+
+    def get(self, id_: str):
+        rows = self._db.execute(
+            f'SELECT document FROM "{self._name}" WHERE id = ?', (id_,)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def contains(self, id_: str):
+        rows = self._db.execute(f'SELECT 1 FROM "{self._name}" WHERE id = ?', (id_,))
+        return len(rows) > 0
+
+    def get_many(self, ids: List[str]):
+        documents = {}
+        for start in range(0, len(ids), self.MAX_PARAMETERS):
+            chunk = ids[start : start + self.MAX_PARAMETERS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._db.execute(
+                f'SELECT id, document FROM "{self._name}" WHERE id IN ({placeholders})',
+                chunk,
+            )
+            documents.update(rows)
+        return [json.loads(documents[id_]) if id_ in documents else None for id_ in ids]
+
+    def all(self):
+        rows = self._db.execute(f'SELECT document FROM "{self._name}" ORDER BY rowid')
+        return [json.loads(row[0]) for row in rows]
+
+    def search(self, cond):
+        return [document for document in self.all() if cond(document)]
+
+    def transaction(self):
+        return self._db.transaction()
+
+    def reload(self):
+        pass
+
+
+class SQLiteDatabase:
+    """Persist entities in SQLite, one table per entity type
+
+    Writes are grouped into a single SQL transaction when issued from within
+    transaction(), so that committing several entities costs a single sync.
+    """
+
+    def __init__(self, path: str, lock, **kwargs):
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._lock = lock
+        self._depth = 0
+        self._tables = {}
+        self.dumps = partial(json.dumps, **kwargs)
+
+    def table(self, name: str):
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = SQLiteTable(self, name)
+            return self._tables[name]
+
+    def tables(self):
+        rows = self.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return {row[0] for row in rows}
+
+    def execute(self, sql: str, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._connection.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
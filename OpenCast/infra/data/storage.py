@@ -0,0 +1,165 @@
+""" Custom TinyDB storages """
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Event, Lock, RLock, Thread
+
+import structlog
+from tinydb.middlewares import Middleware
+from tinydb.storages import Storage, touch
+
+
+class TransactionMiddleware(Middleware):
+    """Group the writes issued within a transaction into a single storage write
+
+    Within a transaction the data is read once from the storage, the following
+    reads and writes operate on a copy of it. It is written back when the outermost
+    transaction exits, or dropped if it exits with an exception. As the memory and
+    buffered storages hand out their live data, which TinyDB updates in place, the
+    documents are copied so that a failed transaction leaves them untouched.
+    """
+
+    def __init__(self, storage_cls):
+        super().__init__(storage_cls)
+        self._lock = RLock()
+        self._depth = 0
+        self._data = None
+        self._dirty = False
+
+    def read(self):
+        with self._lock:
+            if self._depth == 0:
+                return self.storage.read()
+            if self._data is None:
+                self._data = self._copy(self.storage.read())
+            return self._data
+
+    def write(self, data):
+        with self._lock:
+            if self._depth == 0:
+                self.storage.write(data)
+                return
+            self._data = data
+            self._dirty = True
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+                if self._depth == 1 and self._dirty:
+                    self.storage.write(self._data)
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._data = None
+                    self._dirty = False
+
+    def _copy(self, data):
+        # TinyDB rebuilds the tables it writes, but updates the documents in place
+        if data is None:
+            return None
+        return {
+            name: {doc_id: dict(document) for doc_id, document in table.items()}
+            for name, table in data.items()
+        }
+
+
+class BufferedJSONStorage(Storage):
+    """Keep the database in memory and persist it to a JSON file in the background
+
+    Writes are coalesced and flushed once every flush_interval seconds, or as soon
+    as flush_changes writes are pending. The file is replaced atomically so that
+    an interrupted flush never leaves a truncated database behind.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lock,
+        flush_interval: float,
+        flush_changes: int,
+        create_dirs=False,
+        encoding=None,
+        **kwargs,
+    ):
+        super().__init__()
+        self._logger = structlog.get_logger(__name__)
+        self._path = Path(path)
+        self._tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+        self._lock = lock
+        self._flush_lock = Lock()
+        self._flush_interval = flush_interval
+        self._flush_changes = flush_changes
+        self._encoding = encoding
+        self._kwargs = kwargs
+
+        touch(path, create_dirs=create_dirs)
+        self._data = self._load()
+        self._changes = 0
+
+        self._wakeup = Event()
+        self._closed = Event()
+        self._flusher = Thread(target=self._run, name="db-flusher", daemon=True)
+        self._flusher.start()
+
+    def read(self):
+        with self._lock:
+            return self._data
+
+    def write(self, data):
+        with self._lock:
+            self._data = data
+            self._changes += 1
+            if self._changes >= self._flush_changes:
+                self._wakeup.set()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if self._changes == 0:
+                    return
+                serialized = json.dumps(self._data, **self._kwargs)
+                changes = self._changes
+                self._changes = 0
+
+            try:
+                self._write_file(serialized)
+            except OSError as e:
+                self._logger.error("Database flush error", path=self._path, error=e)
+                with self._lock:
+                    self._changes += changes
+
+    def close(self):
+        self._closed.set()
+        self._wakeup.set()
+        self._flusher.join()
+        self.flush()
+
+    def _load(self):
+        with open(self._path, encoding=self._encoding) as file:
+            content = file.read()
+        return json.loads(content) if content else None
+
+    def _write_file(self, serialized: str):
+        with open(self._tmp_path, "w", encoding=self._encoding) as file:
+            file.write(serialized)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self._tmp_path, self._path)
+
+        # Persist the rename itself
+        dir_fd = os.open(self._path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
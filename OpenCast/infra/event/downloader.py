@@ -1,6 +1,7 @@
 """ Events emitted by the media downloader """
 
 from dataclasses import dataclass
+from typing import Optional
 
 from OpenCast.infra import Id
 from OpenCast.infra.event.event import Event
@@ -8,7 +9,8 @@ from OpenCast.infra.event.event import Event
 
 @dataclass
 class DownloadSuccess(Event):
-    pass
+    # The format selector the video was downloaded with
+    format: Optional[str] = None
 
 
 @dataclass
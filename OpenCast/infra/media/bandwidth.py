@@ -0,0 +1,101 @@
+""" Bandwidth limit shared by the downloads """
+
+from threading import Lock
+from time import monotonic, sleep
+from typing import Optional
+
+import structlog
+
+
+class BandwidthGovernor:
+    """Share a bandwidth budget between the downloads
+
+    The budget is a token bucket refilled at rate bytes per second, holding up to
+    one second of transfer. Downloads consume tokens for the bytes received and
+    wait when the bucket is in debt, so that the concurrent downloads share the
+    rate. While a stream is playing, stream_reserve bytes per second are left out
+    of the budget, but never more than nine tenths of it. A rate of 0 disables the
+    bandwidth limit.
+    """
+
+    class Meter:
+        """Turn the cumulated bytes reported by a download into consumed tokens"""
+
+        def __init__(self, governor):
+            self._governor = governor
+            self._last = None
+
+        def __call__(self, downloaded: Optional[int]):
+            if downloaded is None:
+                return
+            # Start counting from the first report, or the next file of a download
+            if self._last is None or downloaded < self._last:
+                self._last = downloaded
+                return
+            size, self._last = downloaded - self._last, downloaded
+            self._governor.consume(size)
+
+    def __init__(self, rate: int, stream_reserve: int):
+        self._logger = structlog.get_logger(__name__)
+        self._lock = Lock()
+        self._rate = rate
+        self._stream_reserve = stream_reserve
+        self._streaming = False
+        self._tokens = 0.0
+        self._refilled = monotonic()
+        self._check_reserve()
+
+    def meter(self):
+        return self.Meter(self)
+
+    def configure(self, rate: Optional[int] = None, stream_reserve=None):
+        with self._lock:
+            self._refill()
+            if rate is not None:
+                self._rate = rate
+            if stream_reserve is not None:
+                self._stream_reserve = stream_reserve
+            self._tokens = min(self._tokens, self._available_rate())
+        self._check_reserve()
+
+    def set_streaming(self, streaming: bool):
+        with self._lock:
+            self._refill()
+            self._streaming = streaming
+
+    def consume(self, size: int):
+        with self._lock:
+            if self._rate == 0:
+                return
+            self._refill()
+            self._tokens -= size
+            delay = -self._tokens / self._available_rate()
+        if delay > 0:
+            sleep(delay)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self._rate,
+                "stream_reserve": self._stream_reserve,
+                "streaming": self._streaming,
+                "available_rate": self._available_rate() if self._rate else 0,
+            }
+
+    def _check_reserve(self):
+        if self._stream_reserve and not self._rate:
+            self._logger.warning(
+                "Stream reserve ignored without bandwidth limit",
+                stream_reserve=self._stream_reserve,
+            )
+
+    def _available_rate(self):
+        reserve = self._stream_reserve if self._streaming else 0
+        return max(self._rate - reserve, self._rate / 10)
+
+    def _refill(self):
+        now = monotonic()
+        if self._rate:
+            rate = self._available_rate()
+            self._tokens = min(self._tokens + (now - self._refilled) * rate, rate)
+        self._refilled = now
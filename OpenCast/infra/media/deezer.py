@@ -1,16 +1,63 @@
+""" Client of the Deezer API used to enrich the media metadata """
+
 import asyncio
+import json
+from threading import Thread
 from typing import Optional
 
 import aiohttp
+import structlog
+
+from OpenCast.infra.data.cache import SingleFlight
 
 
 class Deezer:
+    """Search the Deezer catalog
+
+    The client runs its own event loop in a dedicated thread, where a single HTTP
+    session pools the connections across searches. Searches can be issued from
+    any thread, concurrent searches for the same terms share one request and the
+    results are kept in the optional cache.
+    """
+
     ROOT_URL = "https://api.deezer.com"
 
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self, cache=None, root_url=ROOT_URL, max_connections=4, timeout=10
+    ) -> None:
+        self._logger = structlog.get_logger(__name__)
+        self._cache = cache
+        self._root_url = root_url
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._flight = SingleFlight()
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = Thread(target=self._loop.run_forever, name="deezer")
+        self._thread.daemon = True
+        self._thread.start()
 
     def search(self, artist: Optional[str], album: Optional[str]) -> list:
+        key = json.dumps([artist, album])
+        if self._cache is not None:
+            data = self._cache.get(key)
+            if data is not None:
+                return data
+
+        data, _ = self._flight.do(key, lambda: self._search(key, artist, album))
+        return data
+
+    def close(self):
+        async def close_session():
+            if self._session is not None:
+                await self._session.close()
+
+        asyncio.run_coroutine_threadsafe(close_session(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _search(self, key: str, artist: Optional[str], album: Optional[str]):
         params = {"q": [], "index": 0, "limit": 1}
         if artist:
             params["q"].append(f'artist:"{artist}"')
@@ -18,12 +65,18 @@ class Deezer:
             params["q"].append(f'album:"{album}"')
         params["q"] = " ".join(params["q"])
 
-        async def impl():
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.ROOT_URL}/search", params=params
-                ) as response:
-                    json = await response.json()
-                    return json["data"]
+        future = asyncio.run_coroutine_threadsafe(self._request(params), self._loop)
+        data = future.result()
+        if self._cache is not None:
+            self._cache.register(key, data)
+        return data
 
-        return asyncio.run(impl())
+    async def _request(self, params: dict):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_connections),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+        async with self._session.get(f"{self._root_url}/search", params=params) as res:
+            body = await res.json()
+            return body["data"]
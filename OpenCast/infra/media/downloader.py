@@ -1,16 +1,48 @@
 """ Parse, download and extract a media with its metadata """
 
 from pathlib import Path
-from typing import Callable, List, Optional
+from threading import Lock
+from typing import Callable, Iterator, List, Optional
+from urllib.parse import urlparse
 
 import structlog
 from hurry.filesize import alternative, size
-from yt_dlp import YoutubeDL
 from yt_dlp.utils import ISO639Utils
 
 from OpenCast.infra import Id
+from OpenCast.infra.data.cache import SingleFlight
 from OpenCast.infra.event.downloader import DownloadError, DownloadInfo, DownloadSuccess
 
+from .bandwidth import BandwidthGovernor
+from .format import FormatPolicy
+from .progress import ProgressThrottle
+from .scheduler import Priority
+from .ydl_pool import YoutubeDLPool
+
+VIDEO_OPTIONS = {
+    "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best",
+    "noplaylist": True,
+    "merge_output_format": "mp4",
+    # Resume the partial files left by an interrupted download
+    "continuedl": True,
+    "quiet": True,
+}
+
+SUBTITLE_OPTIONS = {
+    "skip_download": True,
+    "writeautomaticsub": False,
+    "quiet": True,
+}
+
+METADATA_OPTIONS = {
+    # Allow getting the _type value set to URL when passing a playlist entry
+    "noplaylist": True,
+    "extract_flat": False,
+    # Causes ydl to return None on error
+    "ignoreerrors": True,
+    "quiet": True,
+}
+
 
 class Logger:
     def __init__(self, logger):
@@ -60,10 +92,82 @@ class Logger:
         return "{}/s".format(size(speed, system=alternative))
 
 
+class InflightDownloads:
+    """Track the downloads in progress by video and destination
+
+    Requesting a video already being downloaded, or a download to the same
+    destination, attaches the operation to the existing download instead of
+    starting a new one.
+    """
+
+    class Job:
+        def __init__(self, video_id: Id, dest: str, priority: Priority):
+            self.video_id = video_id
+            self.dest = dest
+            self.priority = priority
+            self.format = None
+            self.op_ids = []
+
+    def __init__(self):
+        self._lock = Lock()
+        self._jobs = {}
+
+    def __len__(self):
+        with self._lock:
+            return len({id(job) for job in self._jobs.values()})
+
+    def attach(self, op_id: Id, video_id: Id, dest: str, priority: Priority):
+        """Return the download of the video, and whether it was just created"""
+        with self._lock:
+            job = self._jobs.get(video_id) or self._jobs.get(dest)
+            created = job is None
+            if created:
+                job = self._jobs[video_id] = self._jobs[dest] = self.Job(
+                    video_id, dest, priority
+                )
+            job.op_ids.append(op_id)
+            return job, created
+
+    def operations(self, job) -> List[Id]:
+        with self._lock:
+            return list(job.op_ids)
+
+    def detach(self, job) -> List[Id]:
+        """Forget the download and return its attached operations"""
+        with self._lock:
+            for key in (job.video_id, job.dest):
+                if self._jobs.get(key) is job:
+                    del self._jobs[key]
+            return list(job.op_ids)
+
+
 class Downloader:
-    def __init__(self, executor, cache, evt_dispatcher):
+    def __init__(
+        self,
+        executor,
+        cache,
+        evt_dispatcher,
+        metadata_store=None,
+        metadata_flight=None,
+        ydl_pool=None,
+        inflight=None,
+        progress_throttle=None,
+        governor=None,
+        extractor=None,
+        format_policy: Optional[FormatPolicy] = None,
+    ):
         self._executor = executor
         self._cache = cache
+        self._metadata_store = metadata_store
+        self._metadata_flight = metadata_flight or SingleFlight()
+        self._ydl_pool = ydl_pool or YoutubeDLPool()
+        self._inflight = inflight or InflightDownloads()
+        self._progress = progress_throttle or ProgressThrottle(rate=4)
+        self._governor = governor or BandwidthGovernor(rate=0, stream_reserve=0)
+        # Extract the metadata in worker processes, or in the calling thread
+        self._extractor = extractor
+        # Select the format of each download, or use the default selector
+        self._format_policy = format_policy
         self._evt_dispatcher = evt_dispatcher
         self._logger = structlog.get_logger(__name__)
         self._dl_logger = Logger(self._logger)
@@ -75,41 +179,72 @@ class Downloader:
         source: str,
         dest: str,
         on_dl_starting: Optional[Callable[[Logger], None]] = None,
+        priority: Priority = Priority.BACKGROUND,
     ):
+        job, created = self._inflight.attach(op_id, video_id, dest, priority)
+        if not created:
+            self._logger.debug("Attaching to download", video=dest, op_id=op_id)
+            if priority < job.priority:
+                job.priority = priority
+                self.reprioritize_video(job.video_id, priority)
+            return
+
         def dispatch_dl_events(data):
-            status = data.get("status")
+            self._dl_logger.log_download_progress(data)
             total = data.get("total_bytes")
             downloaded = data.get("downloaded_bytes")
-            if status == "downloading" and downloaded is not None and total is not None:
+            if downloaded is not None and total is not None:
+                for job_op_id in self._inflight.operations(job):
+                    self._evt_dispatcher.dispatch(
+                        DownloadInfo(job_op_id, video_id, total, downloaded)
+                    )
+
+        meter = self._governor.meter()
+
+        def progress_hook(data):
+            # Called many times per second, only keep the latest progress
+            self._progress.report(job, dispatch_dl_events, data)
+            status = data.get("status")
+            if status == "finished" and self._format_policy is not None:
+                self._format_policy.record(
+                    data.get("downloaded_bytes") or data.get("total_bytes"),
+                    data.get("elapsed"),
+                )
+            if status != "downloading":
+                self._progress.flush(job)
+                return
+            # Hold the download while it exceeds its share of the bandwidth
+            meter(data.get("downloaded_bytes"))
+
+        def complete(error: Optional[str] = None):
+            self._progress.flush(job)
+            for job_op_id in self._inflight.detach(job):
                 self._evt_dispatcher.dispatch(
-                    DownloadInfo(op_id, video_id, total, downloaded)
+                    DownloadSuccess(job_op_id, job.format)
+                    if error is None
+                    else DownloadError(job_op_id, error)
                 )
 
         def impl():
+            try:
+                error = download()
+            except Exception as e:
+                self._logger.error("Download error", video=dest, source=source, error=e)
+                error = str(e)
+            complete(error)
+
+        def download():
             if on_dl_starting:
                 on_dl_starting(self._logger)
-            options = {
-                "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/"
-                "bestvideo+bestaudio/best",
-                "noplaylist": True,
-                "merge_output_format": "mp4",
-                "outtmpl": dest,
-                "quiet": True,
-                "progress_hooks": [
-                    self._dl_logger.log_download_progress,
-                    dispatch_dl_events,
-                ],
-            }
-            ydl = YoutubeDL(options)
-            with ydl:  # Download the video
-                try:
-                    ydl.download([source])
-                except Exception as e:
-                    self._logger.error(
-                        "Download error", video=dest, source=source, error=e
-                    )
-                    self._evt_dispatcher.dispatch(DownloadError(op_id, str(e)))
-                    return
+            options = {"outtmpl": dest}
+            if self._format_policy is not None:
+                # Selected when started to use the throughput of the latest downloads
+                job.format = options["format"] = self._format_policy.select()
+                self._logger.debug("Selected format", video=dest, format=job.format)
+            with self._ydl_pool.acquire(
+                "video", VIDEO_OPTIONS, [progress_hook], **options
+            ) as ydl:
+                ydl.download([source])
 
             if not Path(dest).exists():
                 error = "video path points to non existent file"
@@ -119,30 +254,49 @@ class Downloader:
                     source=source,
                     error=error,
                 )
-                self._evt_dispatcher.dispatch(DownloadError(op_id, error))
-                return
+                return error
+            return None
 
-            self._evt_dispatcher.dispatch(DownloadSuccess(op_id))
+        self._logger.debug("Queuing", video=dest, priority=priority.name)
+        # The connections per host are limited by the scheduler
+        host = urlparse(source).hostname or ""
+        self._executor.submit(impl, priority=priority, key=video_id, host=host)
 
-        self._logger.debug("Queuing", video=dest)
-        self._executor.submit(impl)
+    def expected_size(self, metadata: dict) -> int:
+        """Return the size in bytes of the formats a download would select
+
+        The formats are selected as the next download would when the metadata lists
+        them, otherwise the size of the default formats is returned, 0 if unknown.
+        """
+        formats = metadata.get("formats")
+        if self._format_policy is not None and formats:
+            selected = []
+            with self._ydl_pool.acquire("video", VIDEO_OPTIONS) as ydl:
+                try:
+                    selector = ydl.build_format_selector(self._format_policy.select())
+                    selected = ydl._select_formats(formats, selector)
+                except Exception as e:
+                    self._logger.error("Format selection error", error=e)
+            if selected:
+                metadata = selected[0]
+        return metadata.get("filesize") or metadata.get("filesize_approx") or 0
+
+    def reprioritize_video(self, video_id: Id, priority: Priority):
+        return self._executor.reprioritize(video_id, priority)
 
     def download_subtitle(self, url: str, dest: str, lang: str, exts: List[str]):
         self._logger.info("Downloading subtitle", subtitle=dest, lang=lang)
 
         lang = ISO639Utils.long2short(lang)
         for ext in exts:
-            options = {
-                "skip_download": True,
-                "subtitleslangs": [lang],
-                "subtitlesformat": ext,
-                "writeautomaticsub": False,
-                "outtmpl": dest,
-                "progress_hooks": [self._dl_logger.log_download_progress],
-                "quiet": True,
-            }
-            ydl = YoutubeDL(options)
-            with ydl:
+            with self._ydl_pool.acquire(
+                "subtitle",
+                SUBTITLE_OPTIONS,
+                [self._dl_logger.log_download_progress],
+                outtmpl=dest,
+                subtitleslangs=[lang],
+                subtitlesformat=ext,
+            ) as ydl:
                 try:
                     ydl.download([url])
                     return f"{dest}.{lang}.{ext}"
@@ -152,10 +306,19 @@ class Downloader:
                     )
         return None
 
-    def download_metadata(self, url: str, process_ie_data: bool):
-        self._cache.clean()
+    def download_metadata(
+        self,
+        url: str,
+        process_ie_data: bool,
+        stable_only: bool = False,
+        fresh: bool = False,
+    ):
+        # Stable only metadata lack the volatile fields, e.g. stream URLs
+        # Fresh metadata are extracted again, e.g. when the cached ones are stale
         cache_key = f"{url}{process_ie_data}"
-        cached_data = self._cache.get(cache_key)
+        cached_data = None if fresh else self._cache.get(cache_key)
+        if cached_data is None and self._metadata_store is not None and not fresh:
+            cached_data = self._metadata_store.get(cache_key, stable_only)
 
         self._logger.debug(
             "Downloading metadata", url=url, cached=cached_data is not None
@@ -163,23 +326,57 @@ class Downloader:
         if cached_data:
             return cached_data
 
-        options = {
-            # Allow getting the _type value set to URL when passing a playlist entry
-            "noplaylist": True,
-            "extract_flat": False,
-            # Causes ydl to return None on error
-            "ignoreerrors": True,
-            "quiet": True,
-            "progress_hooks": [],
-        }
-        ydl = YoutubeDL(options)
-        with ydl:
+        metadata, shared = self._metadata_flight.do(
+            cache_key,
+            lambda: self._extract_metadata(url, process_ie_data, cache_key, fresh),
+        )
+        if shared:
+            stats = self._metadata_flight.stats
+            self._logger.debug(
+                "Metadata shared", url=url, shared=stats.shared, calls=stats.calls
+            )
+        return metadata
+
+    def iterate_playlist(self, url: str) -> Iterator[dict]:
+        """Yield the entries of a playlist as they are listed, unresolved
+
+        The playlist pages are fetched while the entries are consumed, the
+        generator must be consumed by a single thread.
+        """
+        self._logger.debug("Iterating playlist", url=url)
+        with self._ydl_pool.acquire("metadata", METADATA_OPTIONS) as ydl:
             try:
-                metadata = ydl.extract_info(
-                    url, download=False, process=process_ie_data
-                )
-                self._cache.register(cache_key, metadata)
-                return metadata
+                data = ydl.extract_info(url, download=False, process=False)
+                if data is None:
+                    return
+                for entry in data.get("entries") or []:
+                    if entry:
+                        yield entry
             except Exception as e:
-                self._logger.error("Downloading metadata error", url=url, error=e)
+                self._logger.error("Iterating playlist error", url=url, error=e)
+
+    def _extract_metadata(
+        self, url: str, process_ie_data: bool, cache_key: str, fresh: bool
+    ):
+        # Registered by an extraction completed since the lookup
+        cached_data = None if fresh else self._cache.get(cache_key)
+        if cached_data:
+            return cached_data
+
+        try:
+            metadata = self._run_extraction(url, process_ie_data)
+            if metadata is not None:
+                self._cache.register(cache_key, metadata)
+                if self._metadata_store is not None:
+                    self._metadata_store.register(cache_key, metadata)
+            return metadata
+        except Exception as e:
+            self._logger.error("Downloading metadata error", url=url, error=e)
         return None
+
+    def _run_extraction(self, url: str, process_ie_data: bool):
+        if self._extractor is not None:
+            return self._extractor.extract(url, process_ie_data)
+
+        with self._ydl_pool.acquire("metadata", METADATA_OPTIONS) as ydl:
+            return ydl.extract_info(url, download=False, process=process_ie_data)
@@ -0,0 +1,122 @@
+""" Metadata extraction in worker processes """
+
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from threading import Lock
+from typing import Optional
+
+import structlog
+from yt_dlp import YoutubeDL
+
+# The fields read from the metadata by the application
+METADATA_FIELDS = (
+    "_type",
+    "id",
+    "webpage_url",
+    "url",
+    "protocol",
+    "title",
+    "artist",
+    "album",
+    "duration",
+    "thumbnail",
+    "filesize",
+    "filesize_approx",
+    "extractor_key",  # Select the TTL of the persisted metadata
+    "ie_key",
+)
+
+# The fields read from the entries of a playlist
+ENTRY_FIELDS = ("_type", "id", "webpage_url", "url", "title", "ie_key")
+
+
+def compact_metadata(metadata: dict, fields=METADATA_FIELDS) -> dict:
+    """Keep the fields used by the application, playlist entries included"""
+    compact = {key: metadata[key] for key in fields if key in metadata}
+    entries = metadata.get("entries")
+    # Unprocessed playlists have lazy entries, fetched page by page when iterated
+    if isinstance(entries, (list, tuple)):
+        compact["entries"] = [
+            compact_metadata(entry, ENTRY_FIELDS) if entry else None
+            for entry in entries
+        ]
+    return compact
+
+
+# The YoutubeDL instance of a worker process
+_ydl = None
+
+
+def _init_worker(options: dict):
+    global _ydl
+    _ydl = YoutubeDL(options)
+
+
+def _extract(url: str, process_ie_data: bool) -> Optional[dict]:
+    metadata = _ydl.extract_info(url, download=False, process=process_ie_data)
+    return None if metadata is None else compact_metadata(metadata)
+
+
+class MetadataExtractor:
+    """Run the metadata extractions in a pool of processes
+
+    The extractors parse JSON, decrypt signatures and run many regexes, which
+    holds the GIL away from the server and player threads. The extractions run in
+    separate processes instead, each with its own YoutubeDL instance, and only the
+    fields read by the application are sent back to keep the results small.
+    """
+
+    def __init__(self, max_workers: int, options: dict, mp_context=None):
+        self._logger = structlog.get_logger(__name__)
+        self._max_workers = max_workers
+        self._options = options
+        # The workers are not forked from the threads of the application
+        self._mp_context = mp_context or get_context("forkserver")
+        self._lock = Lock()
+        self._executor = self._make_executor()
+        # Cancelled when closing, as shutdown only cancels them since Python 3.9
+        self._pending = set()
+
+    def extract(self, url: str, process_ie_data: bool) -> Optional[dict]:
+        with self._lock:
+            executor = self._executor
+        try:
+            with self._lock:
+                future = executor.submit(_extract, url, process_ie_data)
+                self._pending.add(future)
+            future.add_done_callback(self._done)
+            return future.result()
+        except CancelledError:
+            return None
+        except BrokenProcessPool as e:
+            self._logger.error("Extraction process died", url=url, error=e)
+            self._restart(executor)
+            return None
+
+    def close(self):
+        with self._lock:
+            pending = list(self._pending)
+        # Cancelling runs the done callbacks, which take the lock
+        for future in pending:
+            future.cancel()
+        with self._lock:
+            self._executor.shutdown(wait=False)
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _make_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(self._options,),
+        )
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False)
+                self._executor = self._make_executor()
@@ -1,25 +1,85 @@
 """ Factory for creating media processing objects """
 
+from OpenCast.infra.data.cache import SingleFlight
+
+from .bandwidth import BandwidthGovernor
 from .deezer import Deezer
-from .downloader import Downloader
+from .downloader import Downloader, InflightDownloads
+from .format import FormatPolicy
 from .parser import VideoParser
 from .player_wrapper import PlayerWrapper
+from .progress import ProgressThrottle
+from .ydl_pool import YoutubeDLPool
 
 
 class MediaFactory:
-    def __init__(self, vlc_instance, downloader_executor, cache):
-        self._downloader_executor = downloader_executor
+    def __init__(
+        self,
+        vlc_instance,
+        download_scheduler,
+        cache,
+        metadata_store=None,
+        deezer_cache=None,
+        progress_rate=4,
+        bandwidth_governor=None,
+        metadata_extractor=None,
+        format_policy=None,
+    ):
+        self.download_scheduler = download_scheduler
         self._cache = cache
+        self._metadata_store = metadata_store
+        self._deezer_cache = deezer_cache
+        self._deezer = None
+        # Shared by the downloaders to coalesce the metadata extractions
+        self.metadata_flight = SingleFlight()
+        # Shared by the downloaders to reuse the initialized YoutubeDL instances
+        self.ydl_pool = YoutubeDLPool()
+        # Shared by the downloaders so that a video is downloaded once at a time
+        self.inflight_downloads = InflightDownloads()
+        self.progress_throttle = ProgressThrottle(progress_rate)
+        # Shared by the downloaders and adjusted by the player and the API
+        self.bandwidth_governor = bandwidth_governor or BandwidthGovernor(
+            rate=0, stream_reserve=0
+        )
+        # Runs the metadata extractions out of the process when configured
+        self.metadata_extractor = metadata_extractor
+        # Shared by the downloaders to measure the throughput of all the downloads
+        self.format_policy = format_policy or FormatPolicy(
+            max_height=1080, max_fps=60, codecs=["avc1"]
+        )
         self._vlc = vlc_instance
 
     def make_player(self, *args):
         return PlayerWrapper(self._vlc, *args)
 
     def make_downloader(self, *args):
-        return Downloader(self._downloader_executor, self._cache, *args)
+        return Downloader(
+            self.download_scheduler,
+            self._cache,
+            *args,
+            metadata_store=self._metadata_store,
+            metadata_flight=self.metadata_flight,
+            ydl_pool=self.ydl_pool,
+            inflight=self.inflight_downloads,
+            progress_throttle=self.progress_throttle,
+            governor=self.bandwidth_governor,
+            extractor=self.metadata_extractor,
+            format_policy=self.format_policy,
+        )
 
     def make_video_parser(self, *args):
         return VideoParser(self._vlc, *args)
 
-    def make_deezer_service(self, *args):
-        return Deezer(*args)
+    def make_deezer_service(self):
+        # A single client shares its connections between the services
+        if self._deezer is None:
+            self._deezer = Deezer(self._deezer_cache)
+        return self._deezer
+
+    def close(self):
+        self.ydl_pool.close()
+        self.progress_throttle.close()
+        if self.metadata_extractor is not None:
+            self.metadata_extractor.close()
+        if self._deezer is not None:
+            self._deezer.close()
@@ -0,0 +1,79 @@
+""" Selection of the downloaded media formats """
+
+from collections import deque
+from threading import Lock
+from typing import List, Optional
+
+
+class FormatPolicy:
+    """Select the format of the downloads from the device and the network
+
+    The video formats are limited to the resolution, frame rate and codecs the
+    device decodes, and the resolution is lowered while the throughput measured on
+    the last downloads can't fetch the media headroom times faster than it plays.
+    Without measurement, the best format the device decodes is selected.
+    """
+
+    # Typical bitrates of the video resolutions in bytes per second
+    BITRATES = {
+        2160: 2_000_000,
+        1440: 1_125_000,
+        1080: 560_000,
+        720: 310_000,
+        480: 150_000,
+        360: 90_000,
+        240: 50_000,
+    }
+
+    def __init__(
+        self,
+        max_height: int,
+        max_fps: int,
+        codecs: List[str],
+        window: int = 5,
+        headroom: float = 2.0,
+    ):
+        self._lock = Lock()
+        self._max_height = max_height
+        self._max_fps = max_fps
+        self._codecs = list(codecs)
+        self._headroom = headroom
+        # The sizes and durations of the last downloaded files
+        self._samples = deque(maxlen=window)
+
+    def record(self, size: Optional[int], duration: Optional[float]):
+        if not size or not duration or duration <= 0:
+            return
+        with self._lock:
+            self._samples.append((size, duration))
+
+    def throughput(self) -> Optional[float]:
+        """Return the bytes per second received by the last downloads"""
+        with self._lock:
+            if not self._samples:
+                return None
+            size = sum(sample[0] for sample in self._samples)
+            duration = sum(sample[1] for sample in self._samples)
+        return size / duration
+
+    def max_height(self) -> int:
+        throughput = self.throughput()
+        heights = [height for height in self.BITRATES if height <= self._max_height]
+        if throughput is None or not heights:
+            return self._max_height
+
+        for height in sorted(heights, reverse=True):
+            if self.BITRATES[height] * self._headroom <= throughput:
+                return height
+        return min(heights)
+
+    def select(self) -> str:
+        """Return the yt-dlp format selector of the next download"""
+        # Accept the formats of unknown resolution or frame rate
+        filters = f"[height<=?{self.max_height()}][fps<=?{self._max_fps}]"
+        videos = [f"bestvideo{filters}[vcodec^={codec}]" for codec in self._codecs]
+        selectors = []
+        for video in videos or [f"bestvideo{filters}"]:
+            selectors += [f"{video}+bestaudio[ext=m4a]", f"{video}+bestaudio"]
+        selectors += [f"best{filters}", "best"]
+        return "/".join(selectors)
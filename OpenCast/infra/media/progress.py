@@ -0,0 +1,52 @@
+""" Throttling of the download progress reports """
+
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Hashable
+
+import structlog
+
+
+class ProgressThrottle:
+    """Deliver the progress reports of each download at most rate times per second
+
+    Reporting only replaces the pending report of the download, so that the hooks
+    called by the downloads stay cheap, and a single thread delivers the pending
+    reports at the configured rate. Intermediate reports are dropped but the
+    latest one is always delivered, immediately when the download is flushed.
+    """
+
+    def __init__(self, rate: float):
+        self._logger = structlog.get_logger(__name__)
+        self._interval = 1 / rate
+        self._pending = {}
+        self._lock = Lock()  # Keep the deliveries of a download in order
+        self._closed = Event()
+        self._thread = Thread(target=self._run, name="progress-throttle", daemon=True)
+        self._thread.start()
+
+    def report(self, key: Hashable, deliver: Callable[[Any], None], report):
+        self._pending[key] = (deliver, report)
+
+    def flush(self, key: Hashable):
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                self._deliver(key, *pending)
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._closed.wait(self._interval):
+            with self._lock:
+                for key in list(self._pending):
+                    pending = self._pending.pop(key, None)
+                    if pending is not None:
+                        self._deliver(key, *pending)
+
+    def _deliver(self, key: Hashable, deliver: Callable[[Any], None], report):
+        try:
+            deliver(report)
+        except Exception as e:
+            self._logger.error("Progress delivery error", key=key, error=e)
@@ -0,0 +1,205 @@
+""" Priority scheduling of the downloads """
+
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from enum import IntEnum
+from itertools import count
+from threading import Condition, Thread
+from time import monotonic
+
+import structlog
+
+
+class Priority(IntEnum):
+    """Download classes, the lowest value is served first"""
+
+    INTERACTIVE = 0  # Requested to be played now
+    NEXT = 1  # Queued to be played next
+    BACKGROUND = 2  # Queued along with a playlist or an album
+
+
+class DownloadScheduler:
+    """Run the downloads by priority class on a fixed number of workers
+
+    Jobs of a class are served in submission order, before the jobs of the lower
+    classes. A pending job is promoted one class for every aging_interval seconds
+    spent waiting so that background downloads are never starved, up to the next
+    class only, so that the videos requested to be played now always come first. As
+    the oldest job of a class is also the most promoted one, picking the next job
+    only compares the heads of the classes.
+
+    At most max_host_jobs jobs run against the same host, 0 meaning unlimited. The
+    jobs of a saturated host are left pending, and the next jobs of their class are
+    served instead, so that the workers are never held waiting for a host.
+    """
+
+    class Job:
+        def __init__(self, seq, key, host, priority, func, args):
+            self.seq = seq
+            self.key = key
+            self.host = host
+            self.priority = priority
+            self.func = func
+            self.args = args
+            self.submitted = monotonic()
+            self.future = Future()
+
+    def __init__(self, max_workers: int, aging_interval: float, max_host_jobs=0):
+        self._logger = structlog.get_logger(__name__)
+        self._aging_interval = aging_interval
+        self._max_host_jobs = max_host_jobs
+        self._hosts = defaultdict(int)
+        self._condition = Condition()
+        self._queues = {priority: deque() for priority in Priority}
+        self._keys = {}
+        self._seq = count()
+        self._running = 0
+        self._shutdown = False
+        self._workers = [
+            Thread(target=self._work, name=f"downloader-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self, func, *args, priority=Priority.BACKGROUND, key=None, host=None
+    ) -> Future:
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new downloads after shutdown")
+
+            job = self.Job(next(self._seq), key, host, priority, func, args)
+            self._queues[priority].append(job)
+            if key is not None:
+                self._keys[key] = job
+            self._condition.notify()
+            return job.future
+
+    def reprioritize(self, key, priority: Priority) -> bool:
+        """Promote a pending job to a higher class, return whether it was pending"""
+        with self._condition:
+            job = self._keys.get(key)
+            if job is None:
+                return False
+            if priority < job.priority:
+                self._queues[job.priority].remove(job)
+                self._insert(self._queues[priority], job)
+                self._logger.debug(
+                    "Download reprioritized", key=key, old=job.priority, new=priority
+                )
+                job.priority = priority
+            return True
+
+    def depth(self) -> dict:
+        """Return the number of pending jobs per class and of running jobs"""
+        with self._condition:
+            depth = {
+                priority.name.lower(): len(queue)
+                for priority, queue in self._queues.items()
+            }
+            depth["running"] = self._running
+            return depth
+
+    def idle_workers(self) -> int:
+        """Return the number of workers left free by the running and pending jobs"""
+        with self._condition:
+            pending = sum(len(queue) for queue in self._queues.values())
+            return max(len(self._workers) - self._running - pending, 0)
+
+    def hosts(self) -> dict:
+        """Return the number of running jobs per host"""
+        with self._condition:
+            return dict(self._hosts)
+
+    def shutdown(self, wait=True):
+        with self._condition:
+            self._shutdown = True
+            for queue in self._queues.values():
+                for job in queue:
+                    job.future.cancel()
+                queue.clear()
+            self._keys.clear()
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _insert(self, queue: deque, job):
+        # Keep the submission order within the class
+        index = len(queue)
+        while index > 0 and queue[index - 1].seq > job.seq:
+            index -= 1
+        queue.insert(index, job)
+
+    def _next_job(self):
+        now = monotonic()
+        best = None
+        for priority, queue in self._queues.items():
+            index = self._runnable(queue)
+            if index is None:
+                continue
+            head = queue[index]
+            promotion = int((now - head.submitted) / self._aging_interval)
+            rank = (max(priority - promotion, min(priority, Priority.NEXT)), head.seq)
+            if best is None or rank < best[0]:
+                best = (rank, queue, index)
+        if best is None:
+            return None
+
+        _, queue, index = best
+        job = queue[index]
+        del queue[index]
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key]
+        if job.host is not None:
+            self._hosts[job.host] += 1
+        return job
+
+    def _runnable(self, queue: deque):
+        """Return the index of the oldest job of the queue whose host is free"""
+        for index, job in enumerate(queue):
+            if job.host is None or not self._saturated(job.host):
+                return index
+        return None
+
+    def _saturated(self, host) -> bool:
+        return 0 < self._max_host_jobs <= self._hosts.get(host, 0)
+
+    def _release(self, job):
+        if job.host is None:
+            return
+        self._hosts[job.host] -= 1
+        if self._hosts[job.host] == 0:
+            del self._hosts[job.host]
+        # The pending jobs of the host can be served
+        self._condition.notify_all()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None and not self._shutdown:
+                    self._condition.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+                self._running += 1
+
+            result, error = None, None
+            running = job.future.set_running_or_notify_cancel()
+            if running:
+                try:
+                    result = job.func(*job.args)
+                except BaseException as e:
+                    self._logger.error("Download job error", key=job.key, error=e)
+                    error = e
+
+            # Count the job as done before its waiters are woken up
+            with self._condition:
+                self._running -= 1
+                self._release(job)
+            if running and error is not None:
+                job.future.set_exception(error)
+            elif running:
+                job.future.set_result(result)
@@ -0,0 +1,105 @@
+""" Pool of reusable YoutubeDL instances """
+
+from contextlib import contextmanager
+from copy import deepcopy
+from threading import Lock, local
+
+from yt_dlp import YoutubeDL
+
+_MISSING = object()
+
+
+class PoolStats:
+    """Count the YoutubeDL instances created and the reuses of existing ones"""
+
+    def __init__(self):
+        self.created = 0
+        self.reused = 0
+
+
+class YoutubeDLPool:
+    """Keep one initialized YoutubeDL per thread and per option profile
+
+    Creating a YoutubeDL loads the extractors, the cookies and the HTTP opener.
+    Instances are instead created once per profile in each thread, so that they are
+    never shared between concurrent calls, and reused for the following calls. The
+    options specific to a call and the progress hooks are set for the duration of
+    the call only.
+    """
+
+    def __init__(self):
+        self._local = local()
+        self._lock = Lock()
+        self._instances = []
+        self.stats = PoolStats()
+
+    @contextmanager
+    def acquire(self, profile: str, options: dict, progress_hooks=(), **overrides):
+        instances = self._thread_instances()
+        ydl = instances.pop(profile, None)
+        if ydl is None:
+            # YoutubeDL keeps the options as its params, which the calls override
+            ydl = YoutubeDL(deepcopy(options))
+            with self._lock:
+                self._instances.append(ydl)
+                self.stats.created += 1
+        else:
+            with self._lock:
+                self.stats.reused += 1
+
+        saved = {key: ydl.params.get(key, _MISSING) for key in overrides}
+        saved_outtmpl = getattr(ydl, "outtmpl_dict", _MISSING)
+        saved_selector = getattr(ydl, "format_selector", _MISSING)
+        saved_hooks = ydl._progress_hooks
+        try:
+            for key, value in overrides.items():
+                if key == "outtmpl":
+                    self._set_outtmpl(ydl, value)
+                elif key == "format":
+                    self._set_format(ydl, value)
+                else:
+                    ydl.params[key] = value
+            ydl._progress_hooks = list(progress_hooks)
+            yield ydl
+        finally:
+            for key, value in saved.items():
+                if value is _MISSING:
+                    ydl.params.pop(key, None)
+                else:
+                    ydl.params[key] = value
+            if saved_outtmpl is not _MISSING:
+                ydl.outtmpl_dict = saved_outtmpl
+            if saved_selector is not _MISSING:
+                ydl.format_selector = saved_selector
+            ydl._progress_hooks = saved_hooks
+            # Not available to nested calls of the same thread until released
+            instances[profile] = ydl
+
+    def close(self):
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for ydl in instances:
+            ydl.close()
+
+    def _thread_instances(self) -> dict:
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+        return instances
+
+    def _set_outtmpl(self, ydl, outtmpl: str):
+        # The template is parsed when creating the instance, in params or apart
+        # depending on the yt-dlp version
+        current = ydl.params.get("outtmpl")
+        if isinstance(current, dict):
+            ydl.params["outtmpl"] = {**current, "default": outtmpl}
+        else:
+            ydl.params["outtmpl"] = outtmpl
+        if hasattr(ydl, "outtmpl_dict"):
+            ydl.outtmpl_dict = {**ydl.outtmpl_dict, "default": outtmpl}
+
+    def _set_format(self, ydl, format_spec: str):
+        # The selector is built from the format when creating the instance
+        ydl.params["format"] = format_spec
+        if hasattr(ydl, "format_selector"):
+            ydl.format_selector = ydl.build_format_selector(format_spec)
@@ -0,0 +1,73 @@
+""" Compare the schema and the codec entity (de)serialization """
+
+from datetime import datetime, timedelta
+from test.benchmark.util import measure, report
+
+from OpenCast.domain.model.album import Album
+from OpenCast.domain.model.artist import Artist
+from OpenCast.domain.model.playlist import Playlist
+from OpenCast.domain.model.video import State, Stream, Video
+from OpenCast.domain.service.identity import IdentityService
+
+REPEAT = 5_000
+
+
+def make_entities():
+    ids = [IdentityService.random() for _ in range(50)]
+    video = Video(
+        IdentityService.random(),
+        "source",
+        collection_id=IdentityService.random(),
+        artist_id=IdentityService.random(),
+        album_id=IdentityService.random(),
+        title="title",
+        duration=timedelta(seconds=300),
+        last_play=datetime.now(),
+        location="/tmp/video.mp4",
+        streams=[Stream(i, "subtitle", "eng") for i in range(4)],
+        state=State.READY,
+    )
+    return [
+        video,
+        Playlist(IdentityService.random(), "name", ids),
+        Album(IdentityService.random(), "name", ids, "thumbnail"),
+        Artist(IdentityService.random(), "name", ids, "thumbnail"),
+    ]
+
+
+def run(entity):
+    cls = type(entity)
+    schema = cls.Schema()
+    document = entity.to_dict()
+
+    def schema_load():
+        data = schema.load(document)
+        cls(cls.Data(**data))
+
+    return [
+        measure(schema.dump, entity._data, repeat=REPEAT),
+        measure(entity.to_dict, repeat=REPEAT),
+        measure(schema_load, repeat=REPEAT),
+        measure(cls.from_dict, document, repeat=REPEAT),
+        measure(lambda: cls.from_dict(document, trusted=True), repeat=REPEAT),
+    ]
+
+
+def main():
+    rows = [[type(entity).__name__, *run(entity)] for entity in make_entities()]
+    report(
+        "Entity (de)serialization cost (per entity)",
+        [
+            "entity",
+            "schema dump",
+            "codec dump",
+            "schema load",
+            "checked load",
+            "trusted load",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+""" Measure the journal startup time on large libraries with long journals """
+
+import random
+import tempfile
+from pathlib import Path
+from test.benchmark.util import measure, report
+from threading import RLock
+
+from tinydb import TinyDB
+from tinydb.storages import JSONStorage
+
+from OpenCast.domain.model.video import Video
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.data.journal import JournalDatabase
+
+SIZES = [10_000, 100_000]
+JOURNAL_LENGTHS = [0, 1_000, 10_000]
+UPDATES = 100
+
+
+def make_documents(size):
+    template = Video(IdentityService.random(), "source", title="title").to_dict()
+    return [
+        {**template, "id": str(IdentityService.random()), "source": f"source{i}"}
+        for i in range(size)
+    ]
+
+
+def make_json(path, documents):
+    database = TinyDB(str(path), storage=JSONStorage, indent=4, separators=(",", ": "))
+    database.table(Video.__name__).insert_multiple(documents)
+    database.close()
+
+
+def open_journal(path):
+    # Do not close the database, closing compacts the journal into the snapshot
+    database = JournalDatabase(str(path), RLock(), snapshot_changes=1_000_000)
+    database._log.close()
+
+
+def make_journal(path, documents, length):
+    database = JournalDatabase(str(path), RLock(), snapshot_changes=1_000_000)
+    table = database.table(Video.__name__)
+    with database.transaction():
+        for document in documents:
+            table.insert(document)
+    database.snapshot()
+    for document in random.choices(documents, k=length):
+        table.update({**document, "title": "updated"})
+    return database
+
+
+def run(tmp_dir, size, length):
+    documents = make_documents(size)
+    json_path = Path(tmp_dir) / f"{size}-{length}.db"
+    journal_path = Path(tmp_dir) / f"{size}-{length}.journal"
+    make_json(json_path, documents)
+    database = make_journal(journal_path, documents, length)
+    table = database.table(Video.__name__)
+    json_table = TinyDB(str(json_path), storage=JSONStorage).table(Video.__name__)
+    sample = random.sample(documents, UPDATES)
+
+    def journal_update():
+        for document in sample:
+            table.update(document)
+
+    def json_update():
+        for document in sample[:10]:
+            json_table.update(document, doc_ids=[1])
+
+    results = [
+        measure(lambda: TinyDB(str(json_path), storage=JSONStorage).tables()),
+        measure(open_journal, journal_path),
+        measure(json_update) / 10,
+        measure(journal_update) / UPDATES,
+    ]
+    database._log.close()
+    return results
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            for length in JOURNAL_LENGTHS:
+                rows.append([size, length, *run(tmp_dir, size, length)])
+
+    report(
+        "Startup and commit cost, JSON database vs journal",
+        ["entities", "journal", "json open", "journal open", "json commit", "commit"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
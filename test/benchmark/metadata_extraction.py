@@ -0,0 +1,153 @@
+""" Measure the HTTP latency while a large playlist is unfolded
+
+The extractions run a synthetic CPU-bound extractor, parsing JSON and matching
+regexes like the site extractors, in the threads of the application or in worker
+processes. The workers are forked to inherit the synthetic extractor.
+"""
+
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from test.benchmark.util import report
+from time import perf_counter
+
+from aiohttp import ClientSession, web
+from yt_dlp import YoutubeDL
+
+from OpenCast.infra.data.cache import LRUCache
+from OpenCast.infra.media import extraction, ydl_pool
+from OpenCast.infra.media.downloader import METADATA_OPTIONS, Downloader
+from OpenCast.infra.media.extraction import MetadataExtractor
+
+ENTRIES = 400
+FORMATS = 60
+APP_THREADS = 3
+REQUEST_INTERVAL = 0.01
+
+SIGNATURE = re.compile(r'"signature":\s*"([a-z0-9]+)"')
+STREAM = re.compile(r'"url":\s*"(https://[^"]+/(\d+)/[^"]*)"')
+
+
+def make_page(seed: int) -> str:
+    formats = [
+        {
+            "format_id": str(i),
+            "url": f"https://cdn.example.com/{seed}/{i}/video.mp4?sig=" + "x" * 200,
+            "signature": f"{seed:x}{i:x}" * 8,
+            "width": 1920,
+            "height": 1080,
+            "tbr": 1000.0 + i,
+        }
+        for i in range(FORMATS)
+    ]
+    return json.dumps({"id": str(seed), "title": f"video {seed}", "formats": formats})
+
+
+def extract_entry(url: str) -> dict:
+    seed = int(url.rsplit("/", 1)[-1])
+    page = make_page(seed)
+    data = json.loads(page)
+    signatures = SIGNATURE.findall(page)
+    streams = STREAM.findall(page)
+    return {
+        "id": data["id"],
+        "title": data["title"],
+        "webpage_url": url,
+        "duration": len(signatures),
+        "protocol": "https",
+        "formats": data["formats"],
+        "url": streams[-1][0],
+    }
+
+
+class SyntheticYoutubeDL(YoutubeDL):
+    def extract_info(self, url, download=True, process=True, **_):
+        if url.startswith("playlist"):
+            entries = [extract_entry(f"video/{i}") for i in range(ENTRIES)]
+            return {"_type": "playlist", "entries": entries}
+        return extract_entry(url)
+
+
+def make_downloader(extractor):
+    cache = LRUCache(max_entries=1000, max_size=1024**3, ttl=3600)
+    return Downloader(None, cache, None, extractor=extractor), cache
+
+
+def unfold(downloader):
+    # The playlist is unfolded, then its videos are created by the app threads
+    playlist = downloader.download_metadata("playlist", process_ie_data=True)
+    urls = [f"{entry['webpage_url']}0" for entry in playlist["entries"]]
+    with ThreadPoolExecutor(APP_THREADS) as pool:
+        list(pool.map(lambda url: downloader.download_metadata(url, True), urls))
+
+
+async def measure_latency(url, work):
+    loop = asyncio.get_running_loop()
+    latencies = []
+    async with ClientSession() as session:
+        task = loop.run_in_executor(None, work) if work else asyncio.sleep(2)
+        task = asyncio.ensure_future(task)
+        start = perf_counter()
+        while not task.done():
+            sent = perf_counter()
+            async with session.get(url) as resp:
+                await resp.read()
+            latencies.append(perf_counter() - sent)
+            await asyncio.sleep(REQUEST_INTERVAL)
+        await task
+    duration = perf_counter() - start
+    latencies.sort()
+    return (
+        duration,
+        len(latencies),
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99)],
+        latencies[-1],
+    )
+
+
+async def run(mode, work):
+    async def handler(_):
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        return (mode,) + await measure_latency(f"http://{host}:{port}/", work)
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    ydl_pool.YoutubeDL = SyntheticYoutubeDL
+    extraction.YoutubeDL = SyntheticYoutubeDL
+
+    rows = [asyncio.run(run("idle", None))]
+
+    downloader, cache = make_downloader(None)
+    rows.append(asyncio.run(run("threads", lambda: unfold(downloader))))
+    cache.close()
+
+    extractor = MetadataExtractor(APP_THREADS, METADATA_OPTIONS, get_context("fork"))
+    extractor.extract("video/0", True)  # Start the workers
+    downloader, cache = make_downloader(extractor)
+    rows.append(asyncio.run(run("processes", lambda: unfold(downloader))))
+    cache.close()
+    extractor.close()
+
+    report(
+        f"HTTP latency while unfolding {ENTRIES} entries",
+        ["mode", "duration", "requests", "p50", "p99", "max"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+""" Compare the scanning and the indexed repository modes """
+
+import random
+from test.benchmark.util import measure, report
+from threading import RLock
+
+from tinydb import TinyDB
+from tinydb.storages import MemoryStorage
+
+from OpenCast.domain.model import Id
+from OpenCast.domain.model.video import Video
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.data.repo.video import VideoRepo
+
+SIZES = [1_000, 10_000, 100_000]
+SAMPLES = 20
+PLAYLIST_SIZE = 200
+
+
+def make_database(size):
+    template = Video(IdentityService.random(), "source", title="title").to_dict()
+    documents = [
+        {**template, "id": str(IdentityService.random()), "source": f"source{i}"}
+        for i in range(size)
+    ]
+    database = TinyDB(storage=MemoryStorage)
+    database.table(Video.__name__).insert_multiple(documents)
+    videos = [Video.from_dict(doc) for doc in random.sample(documents, SAMPLES)]
+    playlist = [Id(doc["id"]) for doc in random.sample(documents, PLAYLIST_SIZE)]
+    return database, videos, playlist
+
+
+def run(repo, videos, playlist):
+    def get():
+        for video in videos:
+            repo.get(video.id)
+
+    def exists():
+        for video in videos:
+            repo.exists(video.id)
+
+    def update():
+        for video in videos:
+            repo.update(video)
+
+    def delete():
+        for video in videos:
+            repo.delete(video)
+
+    return [
+        *[measure(op) / SAMPLES for op in (get, exists)],
+        measure(repo.list, playlist),
+        *[measure(op) / SAMPLES for op in (update, delete)],
+    ]
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        for indexed in (False, True):
+            database, videos, playlist = make_database(size)
+            repo = VideoRepo(database, RLock(), indexed=indexed)
+            mode = "indexed" if indexed else "scan"
+            rows.append([size, mode, *run(repo, videos, playlist)])
+
+    report(
+        "Repository operation cost (per call)",
+        [
+            "entities",
+            "mode",
+            "get",
+            "exists",
+            f"list({PLAYLIST_SIZE})",
+            "update",
+            "delete",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+""" Compare the JSON and the SQLite storages on large libraries """
+
+import random
+import tempfile
+from pathlib import Path
+from test.benchmark.util import measure, report
+
+from OpenCast.app.tool.json_encoder import ModelEncoder
+from OpenCast.domain.model import Id
+from OpenCast.domain.model.video import Video
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.data.manager import DataManager, StorageType
+from OpenCast.infra.data.repo.factory import RepoFactory
+
+SIZES = [10_000, 100_000]
+SAMPLES = 10
+PLAYLIST_SIZE = 200
+
+
+def connect(storage, path):
+    options = {"cls": ModelEncoder}
+    if storage is StorageType.JSON:
+        options.update(indent=4, separators=(",", ": "))
+    return DataManager(RepoFactory(indexed=True)).connect(
+        storage, path=str(path), **options
+    )
+
+
+def populate(storage, path, size):
+    data_facade = connect(storage, path)
+    template = Video(IdentityService.random(), "source", title="title").to_dict()
+    documents = [
+        {**template, "id": str(IdentityService.random()), "source": f"source{i}"}
+        for i in range(size)
+    ]
+    table = data_facade.video_repo._db.table(Video.__name__)
+    if storage is StorageType.SQLITE:
+        with table.transaction():
+            for document in documents:
+                table.insert(document)
+    else:
+        table.insert_multiple(documents)
+    data_facade.close()
+    return [Id(doc["id"]) for doc in documents]
+
+
+def run(storage, size, tmp_dir):
+    path = Path(tmp_dir) / f"{storage.name}-{size}.db"
+    ids = populate(storage, path, size)
+
+    load = measure(lambda: connect(storage, path).close())
+    data_facade = connect(storage, path)
+    repo = data_facade.video_repo
+    sample = random.sample(ids, SAMPLES)
+    playlist = random.sample(ids, PLAYLIST_SIZE)
+    videos = [repo.get(id_) for id_ in sample]
+
+    def get():
+        for id_ in sample:
+            repo.get(id_)
+
+    def update():
+        for video in videos:
+            context = repo.make_context()
+            context.update(video)
+            context.commit()
+
+    results = [
+        load,
+        measure(get) / SAMPLES,
+        measure(repo.list, playlist),
+        measure(update) / SAMPLES,
+    ]
+    data_facade.close()
+    return results
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            for storage in (StorageType.JSON, StorageType.SQLITE):
+                rows.append([size, storage.name.lower(), *run(storage, size, tmp_dir)])
+
+    report(
+        "Storage operation cost",
+        ["entities", "storage", "open", "get", f"list({PLAYLIST_SIZE})", "update"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
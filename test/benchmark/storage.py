@@ -0,0 +1,76 @@
+""" Compare the commit throughput of the JSON storages """
+
+import tempfile
+from pathlib import Path
+from test.benchmark.util import measure, report
+
+from OpenCast.app.tool.json_encoder import ModelEncoder
+from OpenCast.domain.model.video import Video
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.data.manager import DataManager, StorageType
+from OpenCast.infra.data.repo.factory import RepoFactory
+
+SIZES = [100, 1_000, 5_000]
+COMMITS = 200
+
+
+def connect(storage, path):
+    options = {}
+    if storage is StorageType.BUFFERED_JSON:
+        options = {"flush_interval": 5, "flush_changes": 1_000}
+    return DataManager(RepoFactory(indexed=True)).connect(
+        storage,
+        path=str(path),
+        indent=4,
+        separators=(",", ": "),
+        cls=ModelEncoder,
+        **options,
+    )
+
+
+def run(storage, size, tmp_dir):
+    path = Path(tmp_dir) / f"{storage.name}-{size}.db"
+    data_facade = connect(storage, path)
+    repo = data_facade.video_repo
+    template = Video(IdentityService.random(), "source", title="title").to_dict()
+    table = repo._db.table(Video.__name__)
+    table.insert_multiple(
+        {**template, "id": str(IdentityService.random()), "source": f"source{i}"}
+        for i in range(size)
+    )
+    data_facade.close()
+
+    data_facade = connect(storage, path)
+    repo = data_facade.video_repo
+    videos = [
+        Video(IdentityService.random(), f"new{i}", title="title")
+        for i in range(COMMITS)
+    ]
+
+    def commit():
+        for video in videos:
+            context = repo.make_context()
+            context.add(video)
+            context.commit()
+
+    elapsed = measure(commit)
+    close = measure(data_facade.close)
+    return [COMMITS / elapsed, elapsed / COMMITS, close]
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            for storage in (StorageType.JSON, StorageType.BUFFERED_JSON):
+                rows.append([size, storage.name.lower(), *run(storage, size, tmp_dir)])
+
+    report(
+        "Commit throughput",
+        ["entities", "storage", "commits/s", "per commit", "close"],
+        [[size, name, f"{rate:.0f}", *rest] for size, name, rate, *rest in rows],
+    )
+
+
+if __name__ == "__main__":
+    main()
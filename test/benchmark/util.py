@@ -0,0 +1,32 @@
+""" Helpers shared by the benchmarks
+
+Benchmarks are not part of the test suite, run them as modules:
+    python -m test.benchmark.<name>
+"""
+
+from time import perf_counter
+
+
+def measure(func, *args, repeat=1):
+    start = perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (perf_counter() - start) / repeat
+
+
+def report(title, columns, rows):
+    print(f"\n{title}")
+    widths = [max(len(str(c)), 12) for c in columns]
+    print("  ".join(str(c).rjust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(_format(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def _format(value):
+    if isinstance(value, float):
+        if value < 1e-3:
+            return f"{value * 1e6:.1f}us"
+        if value < 1:
+            return f"{value * 1e3:.2f}ms"
+        return f"{value:.2f}s"
+    return str(value)
@@ -0,0 +1,43 @@
+""" Measure the per-call saving of the pooled YoutubeDL instances """
+
+from test.benchmark.util import measure, report
+
+from yt_dlp import YoutubeDL
+
+from OpenCast.infra.media.downloader import METADATA_OPTIONS, VIDEO_OPTIONS
+from OpenCast.infra.media.ydl_pool import YoutubeDLPool
+
+CALLS = 200
+INFO = {"id": "id", "title": "title", "ext": "mp4"}
+
+
+def fresh(options, outtmpl):
+    # The instance lifecycle used before pooling
+    with YoutubeDL({**options, "outtmpl": outtmpl, "progress_hooks": []}) as ydl:
+        ydl.prepare_filename(INFO)
+
+
+def pooled(pool, profile, options, outtmpl):
+    with pool.acquire(profile, options, [], outtmpl=outtmpl) as ydl:
+        ydl.prepare_filename(INFO)
+
+
+def main():
+    pool = YoutubeDLPool()
+    rows = []
+    for profile, options in (("metadata", METADATA_OPTIONS), ("video", VIDEO_OPTIONS)):
+        outtmpl = "/tmp/%(title)s.%(ext)s"
+        fresh_time = measure(fresh, options, outtmpl, repeat=CALLS)
+        pooled_time = measure(pooled, pool, profile, options, outtmpl, repeat=CALLS)
+        rows.append((profile, fresh_time, pooled_time, fresh_time - pooled_time))
+    pool.close()
+
+    report(
+        f"YoutubeDL setup per call ({CALLS} calls)",
+        ["profile", "fresh", "pooled", "saving"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from aiohttp.test_utils import unittest_run_loop
 from OpenCast.app.command import make_cmd
 from OpenCast.app.command import player as PlayerCmd
 from OpenCast.app.workflow.player import (
+    PlaylistWorkflow,
     QueuePlaylistWorkflow,
     QueueVideoWorkflow,
     StreamPlaylistWorkflow,
@@ -58,9 +59,10 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
 
     @unittest_run_loop
     async def test_stream_playlist(self):
-        url = "http://video-provider/watch&video=id"
+        url = "http://video-provider/playlist&list=id"
+        sources = [f"http://video-provider/watch&video={i}" for i in range(3)]
         self.source_service.is_playlist.return_value = True
-        self.source_service.unfold.return_value = [url]
+        self.source_service.unfold_stream.return_value = iter(sources)
         workflow = None
 
         def make_workflow(*args, **kwargs):
@@ -68,7 +70,14 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
             workflow = StreamPlaylistWorkflow(*args, **kwargs)
             return workflow
 
-        self.app_facade.workflow_factory.make_stream_playlist_workflow.side_effect = (
+        # Observe the unfolded videos as the started workflow would
+        def start_workflow(workflow):
+            PlaylistWorkflow.start(workflow)
+            return True
+
+        self.app_facade.workflow_manager.start.side_effect = start_workflow
+
+        self.app_facade.workflow_factory.make_stream_playlist_workflow.side_effect = (  # noqa: E501
             make_workflow
         )
 
@@ -76,11 +85,15 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
         self.assertEqual(204, resp.status)
         self.app_facade.workflow_manager.start.assert_called_with(workflow)
 
+        # The next videos are fed to the started workflow
+        await self.wait_for(lambda: len(workflow.videos) == len(sources))
+        self.assertEqual(sources, [video.source for video in workflow.videos[::-1]])
+
     @unittest_run_loop
     async def test_stream_playlist_non_unfoldable(self):
         url = "http://video-provider/watch&video=id"
         self.source_service.is_playlist.return_value = True
-        self.source_service.unfold.return_value = []
+        self.source_service.unfold_stream.return_value = iter([])
 
         resp = await self.client.post("/api/player/stream", params={"url": url})
         body = await resp.json()
@@ -115,9 +128,10 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
 
     @unittest_run_loop
     async def test_queue_playlist(self):
-        url = "http://video-provider/watch&video=id"
+        url = "http://video-provider/playlist&list=id"
+        sources = [f"http://video-provider/watch&video={i}" for i in range(3)]
         self.source_service.is_playlist.return_value = True
-        self.source_service.unfold.return_value = [url]
+        self.source_service.unfold_stream.return_value = iter(sources)
         workflow = None
 
         def make_workflow(*args, **kwargs):
@@ -125,7 +139,14 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
             workflow = QueuePlaylistWorkflow(*args, **kwargs)
             return workflow
 
-        self.app_facade.workflow_factory.make_queue_playlist_workflow.side_effect = (
+        # Observe the unfolded videos as the started workflow would
+        def start_workflow(workflow):
+            PlaylistWorkflow.start(workflow)
+            return True
+
+        self.app_facade.workflow_manager.start.side_effect = start_workflow
+
+        self.app_facade.workflow_factory.make_queue_playlist_workflow.side_effect = (  # noqa: E501
             make_workflow
         )
 
@@ -133,11 +154,15 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
         self.assertEqual(204, resp.status)
         self.app_facade.workflow_manager.start.assert_called_with(workflow)
 
+        # The next videos are fed to the started workflow
+        await self.wait_for(lambda: len(workflow.videos) == len(sources))
+        self.assertEqual(sources, [video.source for video in workflow.videos[::-1]])
+
     @unittest_run_loop
     async def test_queue_playlist_non_unfoldable(self):
         url = "http://video-provider/watch&video=id"
         self.source_service.is_playlist.return_value = True
-        self.source_service.unfold.return_value = []
+        self.source_service.unfold_stream.return_value = iter([])
 
         resp = await self.client.post("/api/player/queue", params={"url": url})
         body = await resp.json()
@@ -194,6 +219,33 @@ class PlayerMonitorControllerTest(MonitorControllerTestCase):
         self.assertEqual(200, resp.status)
         self.assertEqual(player.to_dict(), body)
 
+    @unittest_run_loop
+    async def test_play_evicted(self):
+        video_id = IdentityService.id_video("source")
+        self.data_producer.select(Player, IdentityService.id_player()).video(
+            "source", state=VideoState.EVICTED
+        ).populate(self.data_facade)
+
+        workflow = None
+
+        def make_workflow(*args, **kwargs):
+            nonlocal workflow
+            workflow = StreamVideoWorkflow(*args, **kwargs)
+            return workflow
+
+        self.app_facade.workflow_factory.make_stream_video_workflow.side_effect = (
+            make_workflow
+        )
+
+        resp = await self.client.post(
+            "/api/player/play",
+            params={"id": str(video_id)},
+        )
+        self.assertEqual(204, resp.status)
+        self.app_facade.workflow_manager.start.assert_called_with(workflow)
+        self.assertEqual(video_id, workflow.video.id)
+        self.app_facade.cmd_dispatcher.dispatch.assert_not_called()
+
     @unittest_run_loop
     async def test_play_video_not_found(self):
         video_id = IdentityService.id_video("source")
@@ -45,3 +45,109 @@ class RootMonitorControllerTest(MonitorControllerTestCase):
             await self.expect_ws_events(
                 ws, [WSResponse(None, "play_time", {"play_time": 1000})]
             )
+
+    @unittest_run_loop
+    async def test_download_queue(self):
+        depth = {"interactive": 1, "next": 0, "background": 12, "running": 3}
+        scheduler = self.infra_facade.media_factory.download_scheduler
+        scheduler.depth.return_value = depth
+        resp = await self.client.get("/api/downloads")
+        body = await resp.json()
+        self.assertEqual(200, resp.status)
+        self.assertEqual(depth, body)
+
+    @unittest_run_loop
+    async def test_bandwidth(self):
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        governor.status.return_value = {
+            "rate": 2048,
+            "stream_reserve": 1024,
+            "streaming": True,
+            "available_rate": 1024,
+        }
+        scheduler = self.infra_facade.media_factory.download_scheduler
+        scheduler.hosts.return_value = {"host": 1}
+        resp = await self.client.get("/api/downloads/bandwidth")
+        body = await resp.json()
+        self.assertEqual(200, resp.status)
+        self.assertEqual(
+            {
+                "rate": 2,
+                "stream_reserve": 1,
+                "streaming": True,
+                "available_rate": 1,
+                "connections": {"host": 1},
+            },
+            body,
+        )
+
+    @unittest_run_loop
+    async def test_update_bandwidth(self):
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        governor.status.return_value = {
+            "rate": 0,
+            "stream_reserve": 0,
+            "streaming": False,
+            "available_rate": 0,
+        }
+        scheduler = self.infra_facade.media_factory.download_scheduler
+        scheduler.hosts.return_value = {}
+        resp = await self.client.post(
+            "/api/downloads/bandwidth", params={"rate": 512, "stream_reserve": 128}
+        )
+        self.assertEqual(200, resp.status)
+        governor.configure.assert_called_once_with(
+            rate=512 * 1024, stream_reserve=128 * 1024
+        )
+
+    @unittest_run_loop
+    async def test_update_bandwidth_invalid(self):
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        resp = await self.client.post("/api/downloads/bandwidth", params={"rate": "-1"})
+        self.assertEqual(400, resp.status)
+        governor.configure.assert_not_called()
+
+    @unittest_run_loop
+    async def test_update_bandwidth_reserve_unlimited(self):
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        governor.status.return_value = {
+            "rate": 0,
+            "stream_reserve": 0,
+            "streaming": False,
+            "available_rate": 0,
+        }
+        resp = await self.client.post(
+            "/api/downloads/bandwidth", params={"stream_reserve": 128}
+        )
+        body = await resp.json()
+        self.assertEqual(400, resp.status)
+        self.assertEqual(
+            {
+                "message": "Stream reserve without bandwidth limit",
+                "details": {"stream_reserve": "128"},
+            },
+            body,
+        )
+
+        resp = await self.client.post(
+            "/api/downloads/bandwidth", params={"rate": 0, "stream_reserve": 128}
+        )
+        self.assertEqual(400, resp.status)
+        governor.configure.assert_not_called()
+
+    @unittest_run_loop
+    async def test_update_bandwidth_reserve_limited(self):
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        governor.status.return_value = {
+            "rate": 512 * 1024,
+            "stream_reserve": 0,
+            "streaming": False,
+            "available_rate": 512 * 1024,
+        }
+        scheduler = self.infra_facade.media_factory.download_scheduler
+        scheduler.hosts.return_value = {}
+        resp = await self.client.post(
+            "/api/downloads/bandwidth", params={"stream_reserve": 128}
+        )
+        self.assertEqual(200, resp.status)
+        governor.configure.assert_called_once_with(stream_reserve=128 * 1024)
@@ -40,6 +40,7 @@ class MonitorControllerTestCase(AioHTTPTestCase):
         self.queueing_service = Mock()
         self.service_factory.make_source_service.return_value = self.source_service
         self.service_factory.make_queueing_service.return_value = self.queueing_service
+        self.queueing_service.upcoming_videos.return_value = []
 
         self.downloader = Mock()
         self.video_parser = Mock()
@@ -128,5 +129,12 @@ class MonitorControllerTestCase(AioHTTPTestCase):
                 msg.data,
             )
 
+    async def wait_for(self, predicate, timeout=1.0):
+        async def poll():
+            while not predicate():
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(poll(), timeout)
+
     async def get_application(self) -> Application:
         return self.infra_facade.server.app
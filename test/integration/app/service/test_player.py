@@ -60,6 +60,38 @@ class PlayerServiceTest(ServiceTestCase):
             Cmd.PlayVideo, self.player_id, video_id
         )
 
+    def test_play_stream(self):
+        self.data_producer.player().video(
+            "http://url", source_protocol="m3u8", state=VideoState.READY
+        ).populate(self.data_facade)
+        self.downloader.download_metadata.return_value = {
+            "url": "http://stream-url.m3u8"
+        }
+
+        video_id = IdentityService.id_video("http://url")
+        self.evt_expecter.expect(
+            Evt.PlayerStateUpdated,
+            self.player_id,
+            PlayerState.STOPPED,
+            PlayerState.PLAYING,
+        ).from_(Cmd.PlayVideo, self.player_id, video_id)
+        self.media_player.play.assert_called_once_with("http://stream-url.m3u8", True)
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        governor.set_streaming.assert_called_once_with(True)
+
+    def test_play_stream_unavailable(self):
+        title = "title"
+        self.data_producer.player().video(
+            "http://url", title=title, source_protocol="m3u8", state=VideoState.READY
+        ).populate(self.data_facade)
+        self.downloader.download_metadata.return_value = {}
+
+        video_id = IdentityService.id_video("http://url")
+        self.evt_expecter.expect(
+            OperationError, "Unavailable stream URL", {"title": title}
+        ).from_(Cmd.PlayVideo, self.player_id, video_id)
+        self.media_player.play.assert_not_called()
+
     @patch("OpenCast.domain.model.video.datetime")
     def test_stop_player(self, datetime_mock):
         now = datetime.now()
@@ -85,6 +117,8 @@ class PlayerServiceTest(ServiceTestCase):
         ).from_(
             Cmd.StopPlayer, self.player_id
         )
+        governor = self.infra_facade.media_factory.bandwidth_governor
+        governor.set_streaming.assert_called_once_with(False)
 
     @patch("OpenCast.domain.model.video.datetime")
     def test_toggle_player_state(self, datetime_mock):
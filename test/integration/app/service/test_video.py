@@ -1,8 +1,10 @@
 from copy import deepcopy
-from datetime import timedelta
+from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
 
+from OpenCast.app.command import make_cmd
 from OpenCast.app.command import video as Cmd
 from OpenCast.app.service.error import OperationError
 from OpenCast.config import settings
@@ -13,7 +15,9 @@ from OpenCast.domain.model.player import State as PlayerState
 from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.model.video import Stream
 from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.data.repo.error import RepoError
 from OpenCast.infra.event.downloader import DownloadError, DownloadSuccess
+from OpenCast.infra.media.scheduler import Priority
 
 from .util import ServiceTestCase
 
@@ -123,6 +127,27 @@ class VideoServiceTest(ServiceTestCase):
             [self.video_repo.get(other_video_id)], self.video_repo.list()
         )
 
+    def test_evict_video(self):
+        with TemporaryDirectory() as output_dir:
+            location = Path(output_dir) / "video.mp4"
+            location.write_bytes(b"0")
+            self.data_producer.video(
+                "source", location=str(location), state=VideoState.COLLECTING
+            ).populate(self.data_facade)
+
+            video_id = IdentityService.id_video("source")
+            self.evt_expecter.expect(
+                VideoEvt.VideoStateUpdated,
+                video_id,
+                VideoState.COLLECTING,
+                VideoState.EVICTED,
+                timedelta(),
+                None,
+            ).from_(Cmd.EvictVideo, video_id, output_dir)
+
+            self.assertEqual(None, self.video_repo.get(video_id).location)
+            self.assertFalse(location.exists())
+
     @patch("OpenCast.domain.model.video.Path")
     def test_retrieve_video_from_disk_success(self, path_cls_mock):
         video_id = IdentityService.id_video("/tmp/video.mp4")
@@ -140,30 +165,11 @@ class VideoServiceTest(ServiceTestCase):
             self.data_facade
         )
 
-        metadata = {
-            "url": "http://stream-url.m3u8",
-        }
-        self.downloader.download_metadata.return_value = metadata
-
         output_dir = settings["downloader.output_directory"]
-        self.evt_expecter.expect(
-            VideoEvt.VideoRetrieved, video_id, metadata["url"]
-        ).from_(Cmd.RetrieveVideo, video_id, output_dir)
-
-    def test_retrieve_video_from_stream_error(self):
-        video_id = IdentityService.id_video("http://url")
-        title = "title"
-        self.data_producer.video(
-            "http://url", title=title, source_protocol="m3u8"
-        ).populate(self.data_facade)
-
-        metadata = {}
-        self.downloader.download_metadata.return_value = metadata
-
-        output_dir = settings["downloader.output_directory"]
-        self.evt_expecter.expect(
-            OperationError, "Unavailable stream URL", {"title": title}
-        ).from_(Cmd.RetrieveVideo, video_id, output_dir)
+        self.evt_expecter.expect(VideoEvt.VideoRetrieved, video_id, "http://url").from_(
+            Cmd.RetrieveVideo, video_id, output_dir
+        )
+        self.downloader.download_metadata.assert_not_called()
 
     def test_retrieve_video_download_success(self):
         video_id = IdentityService.id_video("source")
@@ -171,7 +177,7 @@ class VideoServiceTest(ServiceTestCase):
         self.data_producer.video("source", title=video_title).populate(self.data_facade)
 
         def dispatch_downloaded(op_id, *args):
-            self.app_facade.evt_dispatcher.dispatch(DownloadSuccess(op_id))
+            self.app_facade.evt_dispatcher.dispatch(DownloadSuccess(op_id, "best"))
 
         self.downloader.download_video.side_effect = dispatch_downloaded
         output_dir = settings["downloader.output_directory"]
@@ -179,6 +185,36 @@ class VideoServiceTest(ServiceTestCase):
         self.evt_expecter.expect(VideoEvt.VideoRetrieved, video_id, location).from_(
             Cmd.RetrieveVideo, video_id, output_dir
         )
+        video = self.data_facade.video_repo.get(video_id)
+        self.assertEqual("best", video.download_format)
+
+    def test_retrieve_video_download_priority(self):
+        video_id = IdentityService.id_video("source")
+        self.data_producer.video("source", title="video_title").populate(
+            self.data_facade
+        )
+
+        def dispatch_downloaded(op_id, *args):
+            self.app_facade.evt_dispatcher.dispatch(DownloadSuccess(op_id))
+
+        self.downloader.download_video.side_effect = dispatch_downloaded
+        output_dir = settings["downloader.output_directory"]
+        location = str(Path(output_dir) / "video_title.mp4")
+        self.evt_expecter.expect(VideoEvt.VideoRetrieved, video_id, location).from_(
+            Cmd.RetrieveVideo, video_id, output_dir, Priority.INTERACTIVE
+        )
+        self.assertEqual(
+            Priority.INTERACTIVE, self.downloader.download_video.call_args.args[-1]
+        )
+
+    def test_prioritize_video(self):
+        video_id = IdentityService.id_video("source")
+        self.app_facade.cmd_dispatcher.dispatch(
+            make_cmd(Cmd.PrioritizeVideo, video_id, Priority.INTERACTIVE)
+        )
+        self.downloader.reprioritize_video.assert_called_once_with(
+            video_id, Priority.INTERACTIVE
+        )
 
     def test_retrieve_video_download_error(self):
         video_id = IdentityService.id_video("source")
@@ -244,3 +280,122 @@ class VideoServiceTest(ServiceTestCase):
             timedelta(),
             None,
         ).from_(Cmd.SetVideoReady, video_id)
+
+
+class VideoServiceQuotaTest(ServiceTestCase):
+    def setUp(self):
+        settings["downloader.quota"] = 1
+        super(VideoServiceQuotaTest, self).setUp()
+
+        self.data_producer.player().populate(self.data_facade)
+        self.video_repo = self.data_facade.video_repo
+        self.output_dir = TemporaryDirectory()
+        self.downloader.expected_size.side_effect = lambda data: data["filesize"]
+
+    def tearDown(self):
+        settings["downloader.quota"] = 0
+        self.output_dir.cleanup()
+
+    def test_retrieve_video_evict_played(self):
+        location = Path(self.output_dir.name) / "played.mp4"
+        location.write_bytes(b"0" * 1024)
+        self.data_producer.video(
+            "played",
+            location=str(location),
+            state=VideoState.READY,
+            last_play=datetime.now(),
+        ).video("source", title="video_title").populate(self.data_facade)
+
+        def dispatch_downloaded(op_id, *args):
+            self.app_facade.evt_dispatcher.dispatch(DownloadSuccess(op_id))
+
+        self.downloader.download_metadata.return_value = {"filesize": 1024 * 1024}
+        self.downloader.download_video.side_effect = dispatch_downloaded
+
+        video_id = IdentityService.id_video("source")
+        dest = str(Path(self.output_dir.name) / "video_title.mp4")
+        self.evt_expecter.expect(VideoEvt.VideoRetrieved, video_id, dest).from_(
+            Cmd.RetrieveVideo, video_id, self.output_dir.name
+        )
+
+        evicted = self.video_repo.get(IdentityService.id_video("played"))
+        self.assertEqual(VideoState.EVICTED, evicted.state)
+        self.assertEqual(None, evicted.location)
+        self.assertFalse(location.exists())
+
+    def test_retrieve_video_evict_commit_failure(self):
+        location = Path(self.output_dir.name) / "played.mp4"
+        location.write_bytes(b"0" * 1024)
+        self.data_producer.video(
+            "played",
+            location=str(location),
+            state=VideoState.READY,
+            last_play=datetime.now(),
+        ).video("source", title="video_title").populate(self.data_facade)
+        self.downloader.download_metadata.return_value = {"filesize": 1024 * 1024}
+
+        make_context = self.video_repo.make_context
+
+        def failing_context():
+            context = make_context()
+            context.commit = Mock(side_effect=RepoError("commit failed"))
+            return context
+
+        video_id = IdentityService.id_video("source")
+        with patch.object(self.video_repo, "make_context", failing_context):
+            self.app_facade.cmd_dispatcher.dispatch(
+                make_cmd(Cmd.RetrieveVideo, video_id, self.output_dir.name)
+            )
+
+        # The video still ready to be played keeps its media
+        played = self.video_repo.get(IdentityService.id_video("played"))
+        self.assertEqual(VideoState.READY, played.state)
+        self.assertTrue(location.exists())
+
+    def test_retrieve_video_under_quota(self):
+        location = Path(self.output_dir.name) / "played.mp4"
+        location.write_bytes(b"0" * 1024)
+        self.data_producer.video(
+            "played",
+            location=str(location),
+            state=VideoState.READY,
+            last_play=datetime.now(),
+        ).video("source", title="video_title").populate(self.data_facade)
+
+        self.downloader.download_metadata.return_value = {"filesize": 1024}
+
+        video_id = IdentityService.id_video("source")
+        self.app_facade.cmd_dispatcher.dispatch(
+            make_cmd(Cmd.RetrieveVideo, video_id, self.output_dir.name)
+        )
+
+        played = self.video_repo.get(IdentityService.id_video("played"))
+        self.assertEqual(VideoState.READY, played.state)
+        self.assertTrue(location.exists())
+
+    def test_retrieve_video_reserves_inflight_downloads(self):
+        location = Path(self.output_dir.name) / "played.mp4"
+        location.write_bytes(b"0" * 1024)
+        self.data_producer.video(
+            "played",
+            location=str(location),
+            state=VideoState.READY,
+            last_play=datetime.now(),
+        ).video("source1", title="title1").video("source2", title="title2").populate(
+            self.data_facade
+        )
+        self.downloader.download_metadata.return_value = {"filesize": 600 * 1024}
+
+        for source in ("source1", "source2"):
+            self.app_facade.cmd_dispatcher.dispatch(
+                make_cmd(
+                    Cmd.RetrieveVideo,
+                    IdentityService.id_video(source),
+                    self.output_dir.name,
+                )
+            )
+
+        # Neither download completed, both are counted against the quota
+        played = self.video_repo.get(IdentityService.id_video("played"))
+        self.assertEqual(VideoState.EVICTED, played.state)
+        self.assertFalse(location.exists())
@@ -8,4 +8,5 @@ class InfraFacadeMock(Mock):
         self.server = Mock()
         self.player = Mock()
         self.media_factory = Mock()
+        self.media_factory.download_scheduler.idle_workers.return_value = 0
         self.service_factory = Mock()
@@ -2,6 +2,8 @@ from unittest.mock import Mock
 
 from OpenCast.app.command import player as Cmd
 from OpenCast.app.controller.player import PlayerController
+from OpenCast.app.workflow.player import StreamVideoWorkflow, Video
+from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.service.identity import IdentityService
 from OpenCast.infra.event import player as Evt
 
@@ -45,3 +47,21 @@ class PlayerControllerTest(ControllerTestCase):
                 },
             ]
         ),
+
+    def test_media_end_reached_with_evicted_video(self):
+        self.data_producer.video("source", state=VideoState.EVICTED).populate(
+            self.data_facade
+        )
+        next_video_id = IdentityService.id_video("source")
+        self.queueing_service.next_video.return_value = next_video_id
+        self.raise_event(self.controller, Evt.MediaEndReached, None)
+
+        self.expect_dispatch(Cmd.StopPlayer, IdentityService.id_player())
+        self.app_facade.workflow_factory.make_stream_video_workflow.assert_called_once_with(  # noqa: E501
+            IdentityService.id_workflow(StreamVideoWorkflow, next_video_id),
+            self.app_facade,
+            self.data_facade,
+            Video(next_video_id, "source", None),
+            self.player.queue,
+        )
+        self.app_facade.workflow_manager.start.assert_called_once()
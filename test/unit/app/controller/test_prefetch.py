@@ -0,0 +1,120 @@
+from test.shared.infra.facade_mock import InfraFacadeMock
+from unittest.mock import Mock
+
+from OpenCast.app.command import player as PlayerCmd
+from OpenCast.app.command import video as VideoCmd
+from OpenCast.app.controller.prefetch import PrefetchController
+from OpenCast.app.workflow.video import Video, VideoWorkflow
+from OpenCast.domain.event import player as PlayerEvt
+from OpenCast.domain.event import playlist as PlaylistEvt
+from OpenCast.domain.model.video import State as VideoState
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.media.scheduler import Priority
+
+from .util import ControllerTestCase
+
+
+class PrefetchControllerTest(ControllerTestCase):
+    def setUp(self):
+        super(PrefetchControllerTest, self).setUp()
+
+        self.data_producer.player().populate(self.data_facade)
+        self.player = self.data_facade.player_repo.get_player()
+        self.infra_facade = InfraFacadeMock()
+        self.scheduler = self.infra_facade.media_factory.download_scheduler
+        self.scheduler.idle_workers.return_value = 1
+        self.service_factory = Mock()
+        self.queueing_service = Mock()
+        self.service_factory.make_queueing_service.return_value = self.queueing_service
+        self.app_facade.workflow_manager.is_running.return_value = False
+        self.controller = PrefetchController(
+            self.app_facade, self.infra_facade, self.data_facade, self.service_factory
+        )
+
+    def make_videos(self, *states, **attrs):
+        for i, state in enumerate(states):
+            self.data_producer.video(f"source{i}", state=state, **attrs)
+        self.data_producer.populate(self.data_facade)
+        videos = self.data_facade.video_repo.list()
+        self.queueing_service.upcoming_videos.return_value = videos
+        return videos
+
+    def test_retrieve_evicted(self):
+        videos = self.make_videos(VideoState.EVICTED, VideoState.EVICTED)
+        self.raise_event(
+            self.controller,
+            PlayerEvt.PlayerVideoUpdated,
+            None,
+            self.player.id,
+            None,
+            None,
+        )
+
+        self.queueing_service.upcoming_videos.assert_called_once_with(
+            self.player.queue, None, 2
+        )
+        # Only the idle capacity of the scheduler is used
+        video = videos[0]
+        self.app_facade.workflow_factory.make_video_workflow.assert_called_once_with(
+            IdentityService.id_workflow(VideoWorkflow, video.id),
+            self.app_facade,
+            self.data_facade,
+            Video(video.id, video.source, None),
+            priority=Priority.NEXT,
+        )
+        self.app_facade.workflow_manager.start.assert_called_once()
+
+    def test_retrieve_without_idle_worker(self):
+        self.scheduler.idle_workers.return_value = 0
+        self.make_videos(VideoState.EVICTED)
+        self.raise_event(
+            self.controller,
+            PlayerEvt.PlayerVideoUpdated,
+            None,
+            self.player.id,
+            None,
+            None,
+        )
+        self.app_facade.workflow_manager.start.assert_not_called()
+
+    def test_prioritize_collecting(self):
+        self.app_facade.workflow_manager.is_running.return_value = True
+        videos = self.make_videos(VideoState.COLLECTING)
+        self.raise_event(
+            self.controller,
+            PlaylistEvt.PlaylistContentUpdated,
+            None,
+            self.player.queue,
+            [video.id for video in videos],
+        )
+        self.expect_dispatch(VideoCmd.PrioritizeVideo, videos[0].id, Priority.NEXT)
+        self.app_facade.workflow_manager.start.assert_not_called()
+
+    def test_prefetch_stream_links(self):
+        videos = self.make_videos(
+            VideoState.READY, VideoState.READY, source_protocol="m3u8"
+        )
+        self.raise_event(
+            self.controller,
+            PlayerEvt.PlayerVideoUpdated,
+            None,
+            self.player.id,
+            None,
+            None,
+        )
+        self.expect_dispatch(
+            PlayerCmd.PrefetchStreamLinks,
+            IdentityService.id_player(),
+            [video.id for video in videos],
+        )
+
+    def test_ignore_other_playlists(self):
+        self.make_videos(VideoState.EVICTED)
+        self.raise_event(
+            self.controller,
+            PlaylistEvt.PlaylistContentUpdated,
+            None,
+            IdentityService.id_playlist(),
+            [],
+        )
+        self.queueing_service.upcoming_videos.assert_not_called()
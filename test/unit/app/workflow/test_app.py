@@ -4,10 +4,13 @@ from OpenCast.app.command import player as PlayerCmd
 from OpenCast.app.command import playlist as PlaylistCmd
 from OpenCast.app.command import video as VideoCmd
 from OpenCast.app.workflow.app import InitWorkflow
+from OpenCast.app.workflow.video import Video as VideoWorkflowVideo
+from OpenCast.app.workflow.video import VideoWorkflow
 from OpenCast.domain.constant import HOME_PLAYLIST
 from OpenCast.domain.event import player as PlayerEvt
 from OpenCast.domain.event import video as VideoEvt
 from OpenCast.domain.model.player import State as PlayerState
+from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.model.video import Video
 from OpenCast.domain.service.identity import IdentityService
 
@@ -123,6 +126,15 @@ class InitWorkflowTest(WorkflowTestCase):
         self.workflow.to_PURGING_VIDEOS()
         self.assertTrue(self.workflow.is_COMPLETED())
 
+    def test_purging_videos_to_completed_no_deletion_because_evicted(self):
+        video = Video(IdentityService.id_video("source"), "source")
+        video.state = VideoState.EVICTED
+
+        self.video_repo.list.return_value = [video]
+        self.workflow.to_PURGING_VIDEOS()
+        self.app_facade.cmd_dispatcher.dispatch.assert_not_called()
+        self.assertTrue(self.workflow.is_COMPLETED())
+
     @patch("OpenCast.app.workflow.app.Path")
     def test_purging_videos_to_completed_with_deletion(self, path_cls_mock):
         path_inst = path_cls_mock.return_value
@@ -154,3 +166,26 @@ class InitWorkflowTest(WorkflowTestCase):
             video1.id,
         )
         self.assertTrue(self.workflow.is_COMPLETED())
+
+    @patch("OpenCast.app.workflow.app.Path")
+    def test_purging_videos_to_completed_resuming_download(self, path_cls_mock):
+        path_cls_mock.return_value.exists.return_value = False
+        self.app_facade.workflow_manager.start.side_effect = None
+
+        video = Video(IdentityService.id_video("source"), "source")
+        video.state = VideoState.COLLECTING
+        self.video_repo.list.return_value = [video]
+        (video_workflow,) = self.expect_workflow_creation(VideoWorkflow)
+        self.workflow.to_PURGING_VIDEOS()
+
+        self.app_facade.cmd_dispatcher.dispatch.assert_not_called()
+        self.assertTrue(self.workflow.is_COMPLETED())
+        self.app_facade.workflow_factory.make_video_workflow.assert_called_once_with(
+            IdentityService.id_workflow(VideoWorkflow, video.id),
+            self.app_facade,
+            self.data_facade,
+            VideoWorkflowVideo(video.id, "source", None),
+        )
+        self.app_facade.workflow_manager.start.assert_called_once_with(
+            video_workflow, resume=True
+        )
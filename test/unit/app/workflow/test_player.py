@@ -7,6 +7,7 @@ import OpenCast.domain.event.player as PlayerEvt
 import OpenCast.domain.event.playlist as PlaylistEvt
 import OpenCast.domain.event.video as VideoEvt
 from OpenCast.app.workflow.player import (
+    PlaylistWorkflow,
     QueuePlaylistWorkflow,
     QueueVideoWorkflow,
     StreamPlaylistWorkflow,
@@ -17,6 +18,7 @@ from OpenCast.app.workflow.player import (
 from OpenCast.domain.model.player import State as PlayerState
 from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.media.scheduler import Priority
 
 from .util import WorkflowTestCase
 
@@ -60,6 +62,26 @@ class QueueVideoWorkflowTest(WorkflowTestCase):
         self.workflow.start()
         self.assertTrue(self.workflow.is_COLLECTING())
 
+    def test_collecting_priority(self):
+        self.expect_workflow_creation(VideoWorkflow)
+        self.workflow.to_COLLECTING()
+        factory = self.app_facade.workflow_factory
+        self.assertEqual(
+            Priority.BACKGROUND,
+            factory.make_video_workflow.call_args.kwargs["priority"],
+        )
+
+    def test_collecting_priority_queue_front(self):
+        workflow = self.make_workflow(
+            QueueVideoWorkflow, self.video, self.player_playlist_id, queue_front=True
+        )
+        self.expect_workflow_creation(VideoWorkflow)
+        workflow.to_COLLECTING()
+        factory = self.app_facade.workflow_factory
+        self.assertEqual(
+            Priority.NEXT, factory.make_video_workflow.call_args.kwargs["priority"]
+        )
+
     def test_collecting_to_aborted(self):
         (video_workflow,) = self.expect_workflow_creation(VideoWorkflow)
         self.workflow.to_COLLECTING()
@@ -165,16 +187,20 @@ class QueuePlaylistWorkflowTest(WorkflowTestCase):
         self.video_repo.exists.return_value = True
         self.player_playlist_id = IdentityService.id_playlist()
 
-    def make_test_workflow(self, video_count=2):
+    def make_test_workflow(self, video_count=2, **kwargs):
         collection_id = IdentityService.random()
         sources = [f"src{i}" for i in range(video_count)]
         videos = [
             Video(IdentityService.id_video(source), source, collection_id)
             for source in sources
         ]
-        return self.make_workflow(
-            QueuePlaylistWorkflow, videos, self.player_playlist_id
+        workflow = self.make_workflow(
+            QueuePlaylistWorkflow, videos, self.player_playlist_id, **kwargs
         )
+        if kwargs.get("unfolding"):
+            # Observe the unfolded videos without running the workflow
+            PlaylistWorkflow.start(workflow)
+        return workflow
 
     def test_initial(self):
         workflow = self.make_test_workflow()
@@ -218,6 +244,52 @@ class QueuePlaylistWorkflowTest(WorkflowTestCase):
         self.raise_event(queue_workflow.Aborted, queue_workflow.id, video_id)
         self.assertTrue(workflow.is_COMPLETED())
 
+    def test_queueing_to_waiting(self):
+        workflow = self.make_test_workflow(video_count=1, unfolding=True)
+        video_id = workflow.videos[0].id
+        (queue_workflow,) = self.expect_workflow_creation(QueueVideoWorkflow)
+        workflow.to_QUEUEING(None)
+        self.raise_event(queue_workflow.Completed, queue_workflow.id, video_id)
+        self.assertTrue(workflow.is_WAITING())
+
+    def test_waiting_to_queueing(self):
+        workflow = self.make_test_workflow(video_count=0, unfolding=True)
+        workflow.to_WAITING(None)
+
+        video = Video(IdentityService.id_video("src"), "src", None)
+        self.expect_workflow_creation(QueueVideoWorkflow)
+        self.raise_event(workflow.VideosUnfolded, workflow.id, [video], False)
+        self.assertTrue(workflow.is_QUEUEING())
+        self.app_facade.workflow_factory.make_queue_video_workflow.assert_called_once()
+
+    def test_waiting_to_completed(self):
+        workflow = self.make_test_workflow(video_count=0, unfolding=True)
+        workflow.to_WAITING(None)
+        self.raise_event(workflow.VideosUnfolded, workflow.id, [], True)
+        self.assertTrue(workflow.is_COMPLETED())
+
+    def test_unfolded_observed_once_started(self):
+        workflow = self.make_workflow(
+            QueuePlaylistWorkflow, [], self.player_playlist_id, unfolding=True
+        )
+        workflow.to_WAITING(None)
+        self.raise_event(workflow.VideosUnfolded, workflow.id, [], True)
+        self.assertTrue(workflow.is_WAITING())
+
+    def test_feed_while_queueing(self):
+        workflow = self.make_test_workflow(video_count=1, unfolding=True)
+        video_id = workflow.videos[0].id
+        queue_workflows = self.expect_workflow_creation(QueueVideoWorkflow, 2)
+        workflow.to_QUEUEING(None)
+
+        video = Video(IdentityService.id_video("src"), "src", None)
+        self.raise_event(workflow.VideosUnfolded, workflow.id, [video], True)
+        self.assertTrue(workflow.is_QUEUEING())
+        self.raise_event(queue_workflows[0].Completed, queue_workflows[0].id, video_id)
+        self.assertTrue(workflow.is_QUEUEING())
+        self.raise_event(queue_workflows[1].Completed, queue_workflows[1].id, video.id)
+        self.assertTrue(workflow.is_COMPLETED())
+
 
 class StreamVideoWorkflowTest(WorkflowTestCase):
     def setUp(self):
@@ -237,6 +309,7 @@ class StreamVideoWorkflowTest(WorkflowTestCase):
             self.video,
             self.player_playlist_id,
         )
+        self.app_facade.workflow_manager.is_running.return_value = False
 
     def test_initial(self):
         self.assertTrue(self.workflow.is_INITIAL())
@@ -245,6 +318,20 @@ class StreamVideoWorkflowTest(WorkflowTestCase):
         self.expect_workflow_creation(QueueVideoWorkflow)
         self.workflow.start()
         self.assertTrue(self.workflow.is_QUEUEING())
+        factory = self.app_facade.workflow_factory
+        self.assertEqual(
+            Priority.INTERACTIVE,
+            factory.make_queue_video_workflow.call_args.kwargs["priority"],
+        )
+        self.app_facade.cmd_dispatcher.dispatch.assert_not_called()
+
+    def test_queueing_prioritizes_collected_video(self):
+        self.app_facade.workflow_manager.is_running.return_value = True
+        self.expect_workflow_creation(QueueVideoWorkflow)
+        self.workflow.to_QUEUEING()
+        self.expect_dispatch(
+            VideoCmd.PrioritizeVideo, self.video.id, Priority.INTERACTIVE
+        )
 
     def test_queueing_to_aborted(self):
         (queue_workflow,) = self.expect_workflow_creation(QueueVideoWorkflow)
@@ -300,16 +387,20 @@ class StreamPlaylistWorkflowTest(WorkflowTestCase):
         self.video_repo.exists.return_value = True
         self.player_playlist_id = IdentityService.id_playlist()
 
-    def make_test_workflow(self, video_count=2):
+    def make_test_workflow(self, video_count=2, **kwargs):
         collection_id = IdentityService.random()
         sources = [f"src{i}" for i in range(video_count)]
         videos = [
             Video(IdentityService.id_video(source), source, collection_id)
             for source in sources
         ]
-        return self.make_workflow(
-            StreamPlaylistWorkflow, videos, self.player_playlist_id
+        workflow = self.make_workflow(
+            StreamPlaylistWorkflow, videos, self.player_playlist_id, **kwargs
         )
+        if kwargs.get("unfolding"):
+            # Observe the unfolded videos without running the workflow
+            PlaylistWorkflow.start(workflow)
+        return workflow
 
     def test_initial(self):
         workflow = self.make_test_workflow()
@@ -402,3 +493,26 @@ class StreamPlaylistWorkflowTest(WorkflowTestCase):
         )
         self.raise_event(queue_workflow.Aborted, queue_workflow.id, queueing_video.id)
         self.assertTrue(workflow.is_COMPLETED())
+
+    def test_starting_to_waiting(self):
+        workflow = self.make_test_workflow(video_count=1, unfolding=True)
+        video_id = workflow.videos[0].id
+        (play_workflow,) = self.expect_workflow_creation(StreamVideoWorkflow)
+        workflow.to_STARTING(None)
+        self.raise_event(play_workflow.Completed, play_workflow.id, video_id)
+        self.assertTrue(workflow.is_WAITING())
+
+    def test_waiting_to_queueing(self):
+        workflow = self.make_test_workflow(video_count=0, unfolding=True)
+        workflow.to_WAITING(None)
+
+        video = Video(IdentityService.id_video("src"), "src", None)
+        self.expect_workflow_creation(QueueVideoWorkflow)
+        self.raise_event(workflow.VideosUnfolded, workflow.id, [video], False)
+        self.assertTrue(workflow.is_QUEUEING())
+
+    def test_waiting_to_completed(self):
+        workflow = self.make_test_workflow(video_count=0, unfolding=True)
+        workflow.to_WAITING(None)
+        self.raise_event(workflow.VideosUnfolded, workflow.id, [], True)
+        self.assertTrue(workflow.is_COMPLETED())
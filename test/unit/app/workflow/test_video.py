@@ -9,6 +9,7 @@ from OpenCast.config import settings
 from OpenCast.domain.model.video import State as VideoState
 from OpenCast.domain.model.video import Video as VideoModel
 from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.media.scheduler import Priority
 
 from .util import WorkflowTestCase
 
@@ -33,6 +34,23 @@ class VideoWorkflowTest(WorkflowTestCase):
         self.video_repo.exists.assert_called_once_with(self.video.id)
         self.assertTrue(self.workflow.is_COMPLETED())
 
+    def test_init_to_retrieving_on_resume(self):
+        self.workflow.start(resume=True)
+        self.assertTrue(self.workflow.is_RETRIEVING())
+        self.expect_dispatch(
+            Cmd.RetrieveVideo, self.video.id, settings["downloader.output_directory"]
+        )
+
+    def test_init_to_retrieving_when_evicted(self):
+        self.video_repo.get.return_value = VideoModel(
+            self.video.id, "source", state=VideoState.EVICTED
+        )
+        self.workflow.start()
+        self.assertTrue(self.workflow.is_RETRIEVING())
+        self.expect_dispatch(
+            Cmd.RetrieveVideo, self.video.id, settings["downloader.output_directory"]
+        )
+
     def test_init_to_creating(self):
         self.video_repo.exists.return_value = False
         self.workflow.start()
@@ -81,6 +99,54 @@ class VideoWorkflowTest(WorkflowTestCase):
         self.raise_error(cmd)
         self.assertTrue(self.workflow.is_DELETING())
 
+    def test_resumed_retrieving_to_evicting(self):
+        self.video_repo.get.return_value = VideoModel(
+            self.video.id, "source", state=VideoState.EVICTED
+        )
+        self.workflow.start()
+        cmd = self.expect_dispatch(
+            Cmd.RetrieveVideo, self.video.id, settings["downloader.output_directory"]
+        )
+
+        # The evicted video is kept in the library when its retrieval fails
+        self.video_repo.get.return_value = VideoModel(
+            self.video.id, "source", state=VideoState.COLLECTING
+        )
+        self.raise_error(cmd)
+        self.assertTrue(self.workflow.is_EVICTING())
+        self.expect_dispatch(
+            Cmd.EvictVideo, self.video.id, settings["downloader.output_directory"]
+        )
+
+    def test_resumed_retrieving_to_aborted(self):
+        self.video_repo.get.return_value = VideoModel(
+            self.video.id, "source", state=VideoState.EVICTED
+        )
+        self.workflow.start()
+        cmd = self.expect_dispatch(
+            Cmd.RetrieveVideo, self.video.id, settings["downloader.output_directory"]
+        )
+        self.raise_error(cmd)
+        self.assertTrue(self.workflow.is_ABORTED())
+        self.app_facade.cmd_dispatcher.dispatch.assert_not_called()
+
+    def test_evicting_to_aborted(self):
+        error = OperationError(IdentityService.random(), "")
+        self.workflow.to_EVICTING(error)
+        cmd = self.expect_dispatch(
+            Cmd.EvictVideo, self.video.id, settings["downloader.output_directory"]
+        )
+        self.raise_event(
+            Evt.VideoStateUpdated,
+            cmd.id,
+            self.video.id,
+            VideoState.COLLECTING,
+            VideoState.EVICTED,
+            timedelta(),
+            None,
+        )
+        self.assertTrue(self.workflow.is_ABORTED())
+
     def test_retrieving_to_finalizing(self):
         event = Evt.VideoCreated(
             IdentityService.random(),
@@ -137,6 +203,18 @@ class VideoWorkflowTest(WorkflowTestCase):
         )
         self.assertTrue(self.workflow.is_PARSING())
 
+    def test_retrieving_with_priority(self):
+        workflow = self.make_workflow(
+            VideoWorkflow, self.video, priority=Priority.INTERACTIVE
+        )
+        workflow.to_RETRIEVING(None)
+        self.expect_dispatch(
+            Cmd.RetrieveVideo,
+            self.video.id,
+            settings["downloader.output_directory"],
+            Priority.INTERACTIVE,
+        )
+
     def test_parsing_to_deleting(self):
         event = Evt.VideoRetrieved(
             IdentityService.random(),
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from test.util import TestCase
+
+from OpenCast.domain.model.album import Album
+from OpenCast.domain.model.artist import Artist
+from OpenCast.domain.model.codec import Codec
+from OpenCast.domain.model.player import Player
+from OpenCast.domain.model.player import State as PlayerState
+from OpenCast.domain.model.playlist import Playlist
+from OpenCast.domain.model.video import State as VideoState
+from OpenCast.domain.model.video import Stream, Video
+from OpenCast.domain.service.identity import IdentityService
+
+
+class CodecTest(TestCase):
+    def make_entities(self):
+        ids = [IdentityService.random() for _ in range(3)]
+        video = Video(
+            IdentityService.random(),
+            "source",
+            collection_id=IdentityService.random(),
+            title="title",
+            duration=timedelta(seconds=300),
+            total_playing_duration=timedelta(seconds=42),
+            last_play=datetime(2021, 3, 14, 15, 9, 26),
+            location="/tmp/video.mp4",
+            streams=[Stream(0, "audio", "eng"), Stream(1, "subtitle", None)],
+            state=VideoState.READY,
+        )
+        return [
+            Video(IdentityService.random(), "source"),
+            video,
+            Playlist(IdentityService.random(), "name", ids, generated=True),
+            Album(IdentityService.random(), "name", ids, "thumbnail"),
+            Artist(IdentityService.random(), "name", ids, None),
+            Player(IdentityService.random(), ids[0], state=PlayerState.PLAYING),
+        ]
+
+    def test_dump_matches_schema(self):
+        for entity in self.make_entities():
+            codec = Codec(entity.Schema())
+            self.assertEqual(
+                entity.Schema().dump(entity._data), codec.dump(entity._data)
+            )
+
+    def test_trusted_load_matches_schema(self):
+        for entity in self.make_entities():
+            codec = Codec(entity.Schema())
+            document = entity.Schema().dump(entity._data)
+            self.assertEqual(
+                entity.Schema().load(document), codec.load(document, trusted=True)
+            )
+
+    def test_untrusted_load_validates(self):
+        codec = Codec(Video.Schema())
+        with self.assertRaises(Exception):
+            codec.load({"id": "not an id", "source": "source"})
+
+    def test_load_fields(self):
+        video = self.make_entities()[1]
+        self.assertEqual(
+            {"duration": video._data.duration, "state": video.state},
+            Video.fields_from_dict(video.to_dict(), ["duration", "state"]),
+        )
+
+    def test_from_dict_round_trip(self):
+        for entity in self.make_entities():
+            for trusted in (False, True):
+                copy = type(entity).from_dict(entity.to_dict(), trusted=trusted)
+                self.assertEqual(entity._data, copy._data)
+                self.assertEmpty(copy.release_events())
+
+    def test_codec_cached_per_class(self):
+        self.assertIs(Video._codec(), Video._codec())
+        self.assertIsNot(Video._codec(), Playlist._codec())
@@ -133,6 +133,34 @@ class VideoTest(ModelTestCase):
             self.video.stop()
         self.assertEqual("the video is not started", str(ctx.exception))
 
+    def test_evict(self):
+        self.video.state = VideoState.READY
+        self.video.location = "/tmp/video.mp4"
+        self.video.download_format = "best"
+        self.video.release_events()
+
+        self.video.evict()
+        self.expect_events(self.video, Evt.VideoStateUpdated)
+        self.assertEqual(None, self.video.location)
+        self.assertEqual(None, self.video.download_format)
+        self.assertEqual(VideoState.EVICTED, self.video.state)
+
+    def test_evict_collecting(self):
+        self.video.state = VideoState.COLLECTING
+        self.video.release_events()
+
+        self.video.evict()
+        self.expect_events(self.video, Evt.VideoStateUpdated)
+        self.assertEqual(VideoState.EVICTED, self.video.state)
+
+    def test_evict_playing(self):
+        self.video.state = VideoState.PLAYING
+        self.video.release_events()
+
+        with self.assertRaises(DomainError) as ctx:
+            self.video.evict()
+        self.assertEqual("the video cannot be evicted", str(ctx.exception))
+
     def test_delete(self):
         self.video.delete()
         self.expect_events(self.video, Evt.VideoDeleted)
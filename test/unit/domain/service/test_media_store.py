@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from test.util import TestCase
+
+from OpenCast.domain.model.video import State as VideoState
+from OpenCast.domain.model.video import Video
+from OpenCast.domain.service.identity import IdentityService
+from OpenCast.domain.service.media_store import MediaStoreService
+
+
+class MediaStoreServiceTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.directory = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def evictions(self, service, videos, incoming):
+        service.load(videos, self.directory)
+        return service.evictions(videos, incoming)
+
+    def make_video(self, name, size, last_play=None, played=0, **attrs):
+        location = self.directory / f"{name}.mp4"
+        location.write_bytes(b"0" * size)
+        attrs.setdefault("state", VideoState.READY)
+        return Video(
+            IdentityService.id_video(name),
+            name,
+            title=name,
+            location=str(location),
+            last_play=last_play,
+            total_playing_duration=timedelta(seconds=played),
+            **attrs,
+        )
+
+    def test_under_quota(self):
+        service = MediaStoreService(100, 50)
+        videos = [self.make_video("a", 40), self.make_video("b", 40)]
+        self.assertEqual([], self.evictions(service, videos, 20))
+
+    def test_unlimited(self):
+        service = MediaStoreService(0, 0)
+        self.assertFalse(service.limited())
+        videos = [self.make_video("a", 40)]
+        self.assertEqual([], self.evictions(service, videos, 1000))
+
+    def test_evict_least_recently_played(self):
+        now = datetime.now()
+        service = MediaStoreService(100, 50)
+        old = self.make_video("old", 30, now - timedelta(days=2))
+        recent = self.make_video("recent", 30, now)
+        older = self.make_video("older", 30, now - timedelta(days=3))
+        evictions = self.evictions(service, [old, recent, older], 20)
+        self.assertEqual([older, old], evictions)
+
+    def test_evict_least_played_first(self):
+        last_play = datetime.now()
+        service = MediaStoreService(100, 0)
+        long_played = self.make_video("long", 50, last_play, played=300)
+        short_played = self.make_video("short", 50, last_play, played=10)
+        evictions = self.evictions(service, [long_played, short_played], 10)
+        self.assertEqual([short_played], evictions)
+
+    def test_evict_never_played_last(self):
+        service = MediaStoreService(100, 40)
+        never_played = self.make_video("never", 40)
+        played = self.make_video("played", 40, datetime.now())
+        self.assertEqual([played], self.evictions(service, [never_played, played], 30))
+
+    def test_keep_videos_in_use(self):
+        service = MediaStoreService(100, 0)
+        playing = self.make_video("playing", 80, state=VideoState.PLAYING)
+        ready = self.make_video("ready", 10, datetime.now())
+        self.assertEqual([ready], self.evictions(service, [playing, ready], 30))
+
+    def test_ignore_files_outside_directory(self):
+        service = MediaStoreService(100, 0)
+        with TemporaryDirectory() as other_dir:
+            location = Path(other_dir) / "video.mp4"
+            location.write_bytes(b"0" * 200)
+            video = Video(
+                IdentityService.id_video("other"),
+                "other",
+                location=str(location),
+                state=VideoState.READY,
+            )
+            self.assertEqual([], self.evictions(service, [video], 10))
+
+    def test_remove(self):
+        service = MediaStoreService(100, 0)
+        video = self.make_video("video", 10)
+        service.load([video], self.directory)
+        files = service.stored_files(video, self.directory)
+        self.assertEqual([Path(video.location)], files)
+        service.remove(video.id, files)
+        self.assertFalse(Path(video.location).exists())
+        self.assertEqual(0, service.usage())
+
+    def test_reserve(self):
+        service = MediaStoreService(100, 0)
+        video = self.make_video("video", 60, datetime.now())
+        service.load([video], self.directory)
+        service.reserve("incoming", 30)
+        self.assertEqual(90, service.usage())
+
+        # Concurrent downloads don't overrun the quota together
+        self.assertEqual([video], service.evictions([video], 20))
+        service.release("incoming")
+        self.assertEqual([], service.evictions([video], 20))
+
+    def test_stored(self):
+        service = MediaStoreService(100, 0)
+        service.load([], self.directory)
+        video = self.make_video("video", 10)
+        service.reserve(video.id, 30)
+        service.stored(video.id, Path(video.location))
+        self.assertEqual([video.id], service.stored_ids())
+        self.assertEqual(10, service.usage())
+
+    def test_forget(self):
+        service = MediaStoreService(100, 0)
+        video = self.make_video("video", 10)
+        service.load([video], self.directory)
+        service.forget([video.id])
+        self.assertEqual([], service.stored_ids())
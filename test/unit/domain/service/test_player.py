@@ -119,6 +119,30 @@ class QueueingServiceTest(TestCase):
         expected = [videos[0].id, videos[1].id, videos[2].id]
         self.assertListEqual(expected, queue.ids)
 
+    def test_upcoming_videos(self):
+        self.data_producer.player().video("source1").video("source2").video(
+            "source3"
+        ).video("source4").populate(self.data_facade)
+
+        videos = self.video_repo.list()
+        self.assertListEqual(
+            videos[1:3],
+            self.service.upcoming_videos(self.queue_id, videos[0].id, 2),
+        )
+        self.assertListEqual(
+            videos[3:], self.service.upcoming_videos(self.queue_id, videos[2].id, 2)
+        )
+
+    def test_upcoming_videos_without_current_video(self):
+        self.data_producer.player().video("source1").video("source2").populate(
+            self.data_facade
+        )
+
+        videos = self.video_repo.list()
+        self.assertListEqual(
+            videos[:1], self.service.upcoming_videos(self.queue_id, None, 1)
+        )
+
     def test_next(self):
         self.data_producer.player().video("source1", state=VideoState.READY).video(
             "source2", state=VideoState.READY
@@ -144,6 +168,29 @@ class QueueingServiceTest(TestCase):
             self.service.next_video(self.queue_id, videos[0].id, loop_last=False),
         )
 
+    def test_next_evicted(self):
+        self.data_producer.player().video("source1", state=VideoState.READY).video(
+            "source2", state=VideoState.EVICTED
+        ).populate(self.data_facade)
+
+        videos = self.video_repo.list()
+        self.assertEqual(
+            videos[1].id,
+            self.service.next_video(self.queue_id, videos[0].id, loop_last=False),
+        )
+
+    def test_next_skip_missing(self):
+        self.data_producer.player().video("source1", state=VideoState.READY).video(
+            "source2", state=VideoState.READY
+        ).video("source3", state=VideoState.READY).populate(self.data_facade)
+
+        videos = self.video_repo.list()
+        self.video_repo.delete(videos[1])
+        self.assertEqual(
+            videos[2].id,
+            self.service.next_video(self.queue_id, videos[0].id, loop_last=False),
+        )
+
     def test_next_no_loop(self):
         self.data_producer.player().video("source1", state=VideoState.READY).populate(
             self.data_facade
@@ -41,36 +41,31 @@ class SourceServiceTest(TestCase):
             )
         )
 
-    def test_unfold(self):
-        self.downloader.download_metadata.return_value = {
-            "entries": [
-                {"webpage_url": "url1"},
-                {"webpage_url": "url2"},
-            ],
-        }
-
+    def test_unfold_stream(self):
+        self.downloader.iterate_playlist.return_value = iter(
+            [
+                {"_type": "url", "url": "url1"},
+                {"_type": "video", "webpage_url": "url2", "url": "stream_url"},
+                {"_type": "url"},
+            ]
+        )
         self.assertEqual(
             ["url1", "url2"],
-            self.service.unfold("https://www.youtube.com/playlist?list=id"),
+            list(
+                self.service.unfold_stream("https://www.youtube.com/playlist?list=id")
+            ),
         )
 
-    def test_unfold_partial_metadata(self):
-        self.downloader.download_metadata.return_value = {
-            "entries": [],
-        }
+    def test_estimate_size(self):
+        metadata = {"filesize_approx": 1024}
+        self.downloader.download_metadata.return_value = metadata
+        self.downloader.expected_size.return_value = 512
+        self.assertEqual(512, self.service.estimate_size("url"))
+        self.downloader.expected_size.assert_called_once_with(metadata)
 
-        self.assertEqual(
-            [],
-            self.service.unfold("https://www.youtube.com/playlist?list=id"),
-        )
-
-    def test_unfold_no_metadata(self):
+    def test_estimate_size_unknown(self):
         self.downloader.download_metadata.return_value = None
-
-        self.assertEqual(
-            [],
-            self.service.unfold("https://www.youtube.com/playlist?list=id"),
-        )
+        self.assertEqual(0, self.service.estimate_size("url"))
 
     def test_pick_stream_metadata(self):
         self.downloader.download_metadata.return_value = {
@@ -165,6 +160,16 @@ class SourceServiceTest(TestCase):
         }
         url = self.service.fetch_stream_link("source")
         self.assertEqual("test_url", url)
+        self.downloader.download_metadata.assert_called_once_with(
+            "source", process_ie_data=True, fresh=False
+        )
+
+    def test_fetch_stream_link_fresh(self):
+        self.downloader.download_metadata.return_value = {"url": "test_url"}
+        self.service.fetch_stream_link("source", fresh=True)
+        self.downloader.download_metadata.assert_called_once_with(
+            "source", process_ie_data=True, fresh=True
+        )
 
     def test_fetch_stream_link_missing(self):
         self.downloader.download_metadata.return_value = {}
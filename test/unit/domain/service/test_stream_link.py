@@ -0,0 +1,99 @@
+from test.util import TestCase
+from unittest.mock import Mock, call, patch
+
+from OpenCast.domain.service.stream_link import StreamLinkService, link_expiry
+
+
+class LinkExpiryTest(TestCase):
+    def test_query(self):
+        link = "https://host/videoplayback?expire=1700000000&sig=abc"
+        self.assertEqual(1700000000, link_expiry(link))
+
+    def test_query_capitalized(self):
+        self.assertEqual(
+            1700000000, link_expiry("https://host/a.m3u8?Expires=1700000000")
+        )
+
+    def test_path(self):
+        link = "https://host/api/manifest/hls_playlist/expire/1700000000/id/x/file.m3u8"
+        self.assertEqual(1700000000, link_expiry(link))
+
+    def test_unknown(self):
+        self.assertIsNone(link_expiry("https://host/live.m3u8"))
+
+
+class StreamLinkServiceTest(TestCase):
+    def setUp(self):
+        self.now = 1_000_000
+        patcher = patch(
+            "OpenCast.domain.service.stream_link.time", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.source_service = Mock()
+        self.executor = Mock()
+        self.executor.submit.side_effect = lambda func, *args: func(*args)
+        self.service = StreamLinkService(self.source_service, 3600, self.executor)
+
+    def test_resolve(self):
+        self.source_service.fetch_stream_link.return_value = "link"
+        self.assertEqual("link", self.service.resolve("source"))
+        self.assertEqual("link", self.service.resolve("source"))
+        self.source_service.fetch_stream_link.assert_called_once_with("source")
+
+    def test_resolve_unavailable(self):
+        self.source_service.fetch_stream_link.return_value = None
+        self.assertIsNone(self.service.resolve("source"))
+
+    def test_resolve_expired(self):
+        links = [f"https://host/video?expire={self.now + ttl}" for ttl in (600, 1200)]
+        self.source_service.fetch_stream_link.side_effect = links
+        self.service.resolve("source")
+        self.now += 600 - StreamLinkService.EXPIRY_MARGIN
+        self.assertEqual(links[1], self.service.resolve("source"))
+        self.assertEqual(2, self.source_service.fetch_stream_link.call_count)
+
+    def test_resolve_stale(self):
+        stale = f"https://host/video?expire={self.now - 10}"
+        fresh = f"https://host/video?expire={self.now + 600}"
+        self.source_service.fetch_stream_link.side_effect = [stale, fresh]
+        self.assertEqual(fresh, self.service.resolve("source"))
+        self.assertEqual(fresh, self.service.resolve("source"))
+        self.source_service.fetch_stream_link.assert_has_calls(
+            [call("source"), call("source", fresh=True)]
+        )
+        self.assertEqual(2, self.source_service.fetch_stream_link.call_count)
+
+    def test_resolve_fresh_expired(self):
+        stale = f"https://host/video?expire={self.now}"
+        self.source_service.fetch_stream_link.return_value = stale
+        self.assertEqual(stale, self.service.resolve("source"))
+        # Not kept as it can't be played
+        self.service.resolve("source")
+        self.assertEqual(4, self.source_service.fetch_stream_link.call_count)
+
+    def test_resolve_default_ttl(self):
+        self.source_service.fetch_stream_link.return_value = "link"
+        self.service.resolve("source")
+        self.now += 3000
+        self.service.resolve("source")
+        self.assertEqual(1, self.source_service.fetch_stream_link.call_count)
+        self.now += 600
+        self.service.resolve("source")
+        self.assertEqual(2, self.source_service.fetch_stream_link.call_count)
+
+    def test_prefetch(self):
+        self.source_service.fetch_stream_link.return_value = "link"
+        self.service.resolve("source1")
+        self.service.prefetch(["source1", "source2"])
+        self.assertEqual(1, self.executor.submit.call_count)
+        self.assertEqual("link", self.service.resolve("source2"))
+        self.assertEqual(2, self.source_service.fetch_stream_link.call_count)
+
+    def test_prefetch_error(self):
+        self.source_service.fetch_stream_link.side_effect = RuntimeError()
+        self.service.prefetch(["source"])
+        self.source_service.fetch_stream_link.side_effect = None
+        self.source_service.fetch_stream_link.return_value = "link"
+        self.assertEqual("link", self.service.resolve("source"))
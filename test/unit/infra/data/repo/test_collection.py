@@ -0,0 +1,70 @@
+from test.util import TestCase
+
+from tinydb import TinyDB
+from tinydb.storages import MemoryStorage
+
+from OpenCast.infra.data.repo.collection import Collection, IndexedCollection
+
+
+class CollectionTest(TestCase):
+    def setUp(self):
+        self.table = TinyDB(storage=MemoryStorage).table("test")
+        self.collection = Collection(self.table)
+
+    def test_insert(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.assertTrue(self.collection.contains("1"))
+        self.assertEqual({"id": "1", "name": "first"}, self.collection.get("1"))
+
+    def test_update(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.collection.update({"id": "1", "name": "updated"})
+        self.assertEqual({"id": "1", "name": "updated"}, self.collection.get("1"))
+
+    def test_remove(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.collection.remove("1")
+        self.assertFalse(self.collection.contains("1"))
+        self.assertIsNone(self.collection.get("1"))
+
+    def test_remove_nonexistent(self):
+        self.collection.remove("1")
+        self.assertEmpty(self.collection.all())
+
+    def test_get_many(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.collection.insert({"id": "2", "name": "second"})
+        self.assertEqual(
+            [{"id": "2", "name": "second"}, None, {"id": "1", "name": "first"}],
+            self.collection.get_many(["2", "3", "1"]),
+        )
+
+    def test_all(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.collection.insert({"id": "2", "name": "second"})
+        self.assertEqual(["1", "2"], [doc["id"] for doc in self.collection.all()])
+
+    def test_search(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.collection.insert({"id": "2", "name": "second"})
+        results = self.collection.search(lambda doc: doc["name"] == "second")
+        self.assertEqual([{"id": "2", "name": "second"}], results)
+
+
+class IndexedCollectionTest(CollectionTest):
+    def setUp(self):
+        self.table = TinyDB(storage=MemoryStorage).table("test")
+        self.collection = IndexedCollection(self.table)
+
+    def test_index_existing_documents(self):
+        self.table.insert({"id": "1", "name": "first"})
+        collection = IndexedCollection(self.table)
+        self.assertTrue(collection.contains("1"))
+        self.assertEqual({"id": "1", "name": "first"}, collection.get("1"))
+
+    def test_table_in_sync(self):
+        self.collection.insert({"id": "1", "name": "first"})
+        self.collection.insert({"id": "2", "name": "second"})
+        self.collection.update({"id": "1", "name": "updated"})
+        self.collection.remove("2")
+        self.assertEqual([{"id": "1", "name": "updated"}], self.table.all())
@@ -1,7 +1,7 @@
 from test.util import TestCase
 from unittest.mock import Mock
 
-from OpenCast.infra.data.repo.context import Context
+from OpenCast.infra.data.repo.context import Context, Operation
 
 
 class ContextTest(TestCase):
@@ -14,16 +14,24 @@ class ContextTest(TestCase):
         self.context.add(self.entity)
         self.assertListEqual([self.entity], self.context.entities())
         self.context.commit()
-        self.repo.create.assert_called_once_with(self.entity)
+        self.repo.commit.assert_called_once_with([(self.entity, Operation.CREATE)])
 
     def test_update(self):
         self.context.update(self.entity)
         self.assertListEqual([self.entity], self.context.entities())
         self.context.commit()
-        self.repo.update.assert_called_once_with(self.entity)
+        self.repo.commit.assert_called_once_with([(self.entity, Operation.UPDATE)])
 
     def test_delete(self):
         self.context.delete(self.entity)
         self.assertListEqual([self.entity], self.context.entities())
         self.context.commit()
-        self.repo.delete.assert_called_once_with(self.entity)
+        self.repo.commit.assert_called_once_with([(self.entity, Operation.DELETE)])
+
+    def test_commit_batch(self):
+        self.context.add(self.entity)
+        self.context.update(self.entity)
+        self.context.commit()
+        self.repo.commit.assert_called_once_with(
+            [(self.entity, Operation.CREATE), (self.entity, Operation.UPDATE)]
+        )
@@ -0,0 +1,34 @@
+from test.util import TestCase
+
+from OpenCast.infra.data.repo.membership import MembershipIndex
+
+
+class MembershipIndexTest(TestCase):
+    def setUp(self):
+        self.index = MembershipIndex()
+
+    def test_update(self):
+        self.index.update("a", ["1", "2"])
+        self.index.update("b", ["2"])
+        self.assertEqual(["a"], self.index.containers("1"))
+        self.assertEqual(["a", "b"], self.index.containers("2"))
+
+    def test_update_existing(self):
+        self.index.update("a", ["1", "2"])
+        self.index.update("a", ["2", "3"])
+        self.assertEqual([], self.index.containers("1"))
+        self.assertEqual(["a"], self.index.containers("2"))
+        self.assertEqual(["a"], self.index.containers("3"))
+
+    def test_remove(self):
+        self.index.update("a", ["1"])
+        self.index.update("b", ["1"])
+        self.index.remove("a")
+        self.assertEqual(["b"], self.index.containers("1"))
+
+    def test_remove_nonexistent(self):
+        self.index.remove("a")
+        self.assertEqual([], self.index.containers("1"))
+
+    def test_containers_unknown(self):
+        self.assertEqual([], self.index.containers("1"))
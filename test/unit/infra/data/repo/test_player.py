@@ -21,3 +21,8 @@ class PlayerRepositoryTest(TestCase):
         self.assertEqual(None, self.repo.get_player())
         self.repo.create(self.player)
         self.assertEqual(self.player, self.repo.get_player())
+
+    def test_get_queue(self):
+        self.assertEqual(None, self.repo.get_queue())
+        self.repo.create(self.player)
+        self.assertEqual(self.queue_id, self.repo.get_queue())
@@ -11,8 +11,8 @@ from OpenCast.infra.data.repo.playlist import PlaylistRepo
 
 class PlaylistRepositoryTest(TestCase):
     def setUp(self):
-        database = TinyDB(storage=MemoryStorage)
-        self.repo = PlaylistRepo(database, RLock())
+        self.database = TinyDB(storage=MemoryStorage)
+        self.repo = PlaylistRepo(self.database, RLock())
         self.playlist_id = IdentityService.id_playlist()
         self.playlist = Playlist(self.playlist_id, "name")
 
@@ -54,3 +54,29 @@ class PlaylistRepositoryTest(TestCase):
 
         result = self.repo.list_containing(IdentityService.id_video("source5"))
         self.assertEqual([], result)
+
+    def test_list_containing_updated(self):
+        video_ids = [IdentityService.id_video(f"source{i}") for i in range(2)]
+        self.playlist.ids = [video_ids[0]]
+        self.repo.create(self.playlist)
+
+        self.playlist.ids = [video_ids[1]]
+        self.repo.update(self.playlist)
+        self.assertEqual([], self.repo.list_containing(video_ids[0]))
+        self.assertEqual([self.playlist], self.repo.list_containing(video_ids[1]))
+
+    def test_list_containing_deleted(self):
+        video_id = IdentityService.id_video("source")
+        self.playlist.ids = [video_id]
+        self.repo.create(self.playlist)
+
+        self.repo.delete(self.playlist)
+        self.assertEqual([], self.repo.list_containing(video_id))
+
+    def test_list_containing_existing(self):
+        video_id = IdentityService.id_video("source")
+        self.playlist.ids = [video_id]
+        self.repo.create(self.playlist)
+
+        repo = PlaylistRepo(self.database, RLock())
+        self.assertEqual([self.playlist], repo.list_containing(video_id))
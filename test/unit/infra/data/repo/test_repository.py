@@ -1,16 +1,23 @@
+import tempfile
 from dataclasses import dataclass
+from pathlib import Path
 from test.util import TestCase
-from threading import RLock
+from threading import Event, RLock, Thread
+from unittest.mock import patch
 
 from marshmallow import Schema, fields
 from tinydb import TinyDB
-from tinydb.storages import MemoryStorage
+from tinydb.storages import JSONStorage, MemoryStorage
 
 from OpenCast.domain.model import Id
 from OpenCast.domain.model.entity import Entity
 from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.data.journal import JournalDatabase
+from OpenCast.infra.data.repo.context import Operation
 from OpenCast.infra.data.repo.error import RepoError
 from OpenCast.infra.data.repo.repository import Repository
+from OpenCast.infra.data.sqlite import SQLiteDatabase
+from OpenCast.infra.data.storage import BufferedJSONStorage, TransactionMiddleware
 
 
 class TestEntitySchema(Schema):
@@ -95,6 +102,64 @@ class RepositoryTest(TestCase):
         entity_list = self.repo.list([entities[2].id, entities[0].id])
         self.assertEqual([entities[2], entities[0]], entity_list)
 
+    def test_list_filtered_missing(self):
+        entities = [TestEntity(IdentityService.random(), f"{i}") for i in range(3)]
+        for entity in entities[:2]:
+            self.repo.create(entity)
+        ids = [entities[2].id, entities[1].id, entities[0].id]
+        self.assertEqual([entities[1], entities[0]], self.repo.list(ids))
+        self.assertEqual(
+            [None, entities[1], entities[0]], self.repo.list(ids, keep_missing=True)
+        )
+
+    def test_iterate(self):
+        entities = [TestEntity(IdentityService.random(), f"{i}") for i in range(5)]
+        for entity in entities:
+            self.repo.create(entity)
+        ids = [entity.id for entity in reversed(entities)]
+        iterator = self.repo.iterate(ids, chunk_size=2)
+        self.assertEqual(entities[4], next(iterator))
+        self.assertEqual(entities[3::-1], list(iterator))
+
+    def test_iterate_missing(self):
+        self.repo.create(self.entity)
+        ids = [IdentityService.random(), self.entity.id]
+        self.assertEqual([self.entity], list(self.repo.iterate(ids)))
+        self.assertEqual(
+            [None, self.entity], list(self.repo.iterate(ids, keep_missing=True))
+        )
+
+    def test_commit(self):
+        other = TestEntity(IdentityService.random(), "other")
+        self.repo.create(other)
+        other.name = "UPDATED"
+        self.repo.commit(
+            [
+                (self.entity, Operation.CREATE),
+                (other, Operation.UPDATE),
+                (self.entity, Operation.DELETE),
+            ]
+        )
+        self.assertEqual([other], self.repo.list())
+        self.assertEqual("UPDATED", self.repo.get(other.id).name)
+
+    def test_commit_validation(self):
+        other = TestEntity(IdentityService.random(), "other")
+        with self.assertRaises(RepoError):
+            self.repo.commit(
+                [(self.entity, Operation.CREATE), (other, Operation.UPDATE)]
+            )
+        self.assertFalse(self.repo.exists(self.entity.id))
+
+    def test_commit_stats(self):
+        other = TestEntity(IdentityService.random(), "other")
+        self.repo.commit([(self.entity, Operation.CREATE)])
+        self.repo.commit([(self.entity, Operation.UPDATE), (other, Operation.CREATE)])
+        self.assertEqual(2, self.repo.commit_stats.commits)
+        self.assertEqual(3, self.repo.commit_stats.entities)
+        self.assertEqual(2, self.repo.commit_stats.max_entities)
+        self.assertEqual(1.5, self.repo.commit_stats.mean())
+
     def test_get(self):
         self.repo.create(self.entity)
         repo_entity = self.repo.get(self.entity.id)
@@ -108,3 +173,168 @@ class RepositoryTest(TestCase):
         self.assertFalse(self.repo.exists(self.entity.id))
         self.repo.create(self.entity)
         self.assertTrue(self.repo.exists(self.entity.id))
+
+    def test_snapshot(self):
+        self.repo.create(self.entity)
+        snapshot = self.repo.snapshot()
+        self.assertEqual([self.entity], snapshot.list())
+        self.assertEqual("test", snapshot.get(self.entity.id).name)
+
+        other = TestEntity(IdentityService.random(), "other")
+        self.entity.name = "UPDATED"
+        self.repo.commit([(self.entity, Operation.UPDATE), (other, Operation.CREATE)])
+        self.assertEqual("test", snapshot.get(self.entity.id).name)
+        self.assertFalse(snapshot.exists(other.id))
+
+        latest = self.repo.snapshot()
+        self.assertEqual(snapshot.version + 1, latest.version)
+        self.assertEqual("UPDATED", latest.get(self.entity.id).name)
+        self.assertEqual([other, self.entity], latest.list([other.id, self.entity.id]))
+
+        self.repo.delete(self.entity)
+        self.assertEqual([other], self.repo.snapshot().list())
+
+    def test_snapshot_failed_commit(self):
+        snapshot = self.repo.snapshot()
+        with self.assertRaises(RepoError):
+            self.repo.update(self.entity)
+        self.assertIs(snapshot, self.repo.snapshot())
+
+    def test_snapshot_without_lock(self):
+        self.repo.create(self.entity)
+        self.repo.snapshot()
+        locked = Event()
+        release = Event()
+
+        def hold_lock():
+            with self.repo._lock:
+                locked.set()
+                release.wait()
+
+        thread = Thread(target=hold_lock)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        locked.wait()
+        self.assertEqual(self.entity, self.repo.snapshot().get(self.entity.id))
+
+    def test_get_fields(self):
+        self.assertIsNone(self.repo.get_fields(self.entity.id, "name"))
+        self.repo.create(self.entity)
+        self.assertEqual(
+            {"id": self.entity.id, "name": "test"},
+            self.repo.get_fields(self.entity.id, "id", "name"),
+        )
+
+
+class IndexedRepositoryTest(RepositoryTest):
+    def setUp(self):
+        self.database = TinyDB(storage=MemoryStorage)
+        self.repo = Repository(self.database, RLock(), TestEntity, indexed=True)
+        self.entity = TestEntity(IdentityService.random(), "test")
+
+    def test_load_existing(self):
+        self.repo.create(self.entity)
+        repo = Repository(self.database, RLock(), TestEntity, indexed=True)
+        self.assertEqual(self.entity, repo.get(self.entity.id))
+
+    def test_commit_rollback(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        database = TinyDB(
+            str(Path(tmp_dir.name) / "test.db"),
+            storage=TransactionMiddleware(JSONStorage),
+        )
+        self.addCleanup(database.close)
+        repo = Repository(database, RLock(), TestEntity, indexed=True)
+        other = TestEntity(IdentityService.random(), "other")
+        repo.create(other)
+
+        with patch.object(
+            database.storage.storage, "write", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                repo.commit(
+                    [(self.entity, Operation.CREATE), (other, Operation.UPDATE)]
+                )
+        self.assertFalse(repo.exists(self.entity.id))
+        self.assertEqual([other], repo.list())
+
+    def test_write_through(self):
+        self.repo.create(self.entity)
+        self.entity.name = "UPDATED"
+        self.repo.update(self.entity)
+        repo = Repository(self.database, RLock(), TestEntity)
+        self.assertEqual("UPDATED", repo.get(self.entity.id).name)
+
+        self.repo.delete(self.entity)
+        self.assertListEqual([], repo.list())
+
+
+class BufferedRepositoryTest(RepositoryTest):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        lock = RLock()
+        self.database = TinyDB(
+            str(Path(tmp_dir.name) / "test.db"),
+            lock,
+            flush_interval=60,
+            flush_changes=100,
+            storage=TransactionMiddleware(BufferedJSONStorage),
+        )
+        self.addCleanup(self.database.close)
+        self.repo = Repository(self.database, lock, TestEntity, indexed=True)
+        self.entity = TestEntity(IdentityService.random(), "test")
+
+    def test_commit_rollback(self):
+        other = TestEntity(IdentityService.random(), "other")
+        self.repo.create(other)
+        other.name = "updated"
+
+        # The update is applied before the failing insert
+        with patch.object(
+            self.database.table("TestEntity"),
+            "insert",
+            side_effect=OSError("disk full"),
+        ):
+            with self.assertRaises(OSError):
+                self.repo.commit(
+                    [(other, Operation.UPDATE), (self.entity, Operation.CREATE)]
+                )
+        self.assertFalse(self.repo.exists(self.entity.id))
+        self.assertEqual("other", self.repo.get(other.id).name)
+        repo = Repository(self.database, RLock(), TestEntity, indexed=True)
+        self.assertEqual("other", repo.get(other.id).name)
+
+
+class SQLiteRepositoryTest(RepositoryTest):
+    def setUp(self):
+        lock = RLock()
+        self.database = SQLiteDatabase(":memory:", lock)
+        self.addCleanup(self.database.close)
+        self.repo = Repository(self.database, lock, TestEntity)
+        self.entity = TestEntity(IdentityService.random(), "test")
+
+    def test_commit_rollback(self):
+        other = TestEntity(IdentityService.random(), "other")
+        self.repo.create(other)
+        with patch.object(
+            self.repo._collection, "update", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                self.repo.commit(
+                    [(self.entity, Operation.CREATE), (other, Operation.UPDATE)]
+                )
+        self.assertFalse(self.repo.exists(self.entity.id))
+
+
+class JournalRepositoryTest(SQLiteRepositoryTest):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        lock = RLock()
+        self.database = JournalDatabase(str(Path(tmp_dir.name) / "test.journal"), lock)
+        self.addCleanup(self.database.close)
+        self.repo = Repository(self.database, lock, TestEntity)
+        self.entity = TestEntity(IdentityService.random(), "test")
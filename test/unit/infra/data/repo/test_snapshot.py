@@ -0,0 +1,49 @@
+from test.util import TestCase
+
+from OpenCast.infra.data.repo.snapshot import Snapshot
+
+
+class SnapshotTest(TestCase):
+    def setUp(self):
+        documents = {str(i): {"id": str(i), "name": f"name{i}"} for i in range(100)}
+        self.snapshot = Snapshot(0, documents, lambda document: document["name"])
+
+    def test_publish(self):
+        latest = self.snapshot.publish(
+            [
+                (False, {"id": "1", "name": "updated"}),
+                (True, {"id": "2"}),
+                (False, {"id": "new", "name": "new"}),
+            ]
+        )
+        self.assertEqual(1, latest.version)
+        self.assertEqual("updated", latest.get("1"))
+        self.assertFalse(latest.exists("2"))
+        self.assertEqual("new", latest.get("new"))
+        self.assertEqual(100, len(latest))
+        self.assertEqual(["name0", "updated", "name3"], latest.list()[:3])
+        self.assertEqual("new", latest.list()[-1])
+
+        self.assertEqual("name1", self.snapshot.get("1"))
+        self.assertTrue(self.snapshot.exists("2"))
+        self.assertFalse(self.snapshot.exists("new"))
+
+    def test_publish_copies_changes_only(self):
+        latest = self.snapshot.publish([(False, {"id": "1", "name": "updated"})])
+        self.assertIs(self.snapshot._documents, latest._documents)
+
+    def test_publish_merges_changes(self):
+        snapshot = self.snapshot
+        for i in range(11):
+            snapshot = snapshot.publish([(True, {"id": str(i)})])
+        self.assertIsNot(self.snapshot._documents, snapshot._documents)
+        self.assertEqual({}, snapshot._changes)
+        self.assertEqual(89, len(snapshot))
+        self.assertEqual([f"name{i}" for i in range(11, 100)], snapshot.list())
+
+    def test_recreate(self):
+        latest = self.snapshot.publish(
+            [(True, {"id": "1"}), (False, {"id": "1", "name": "recreated"})]
+        )
+        self.assertEqual("recreated", latest.get("1"))
+        self.assertEqual(100, len(latest))
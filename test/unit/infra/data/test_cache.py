@@ -0,0 +1,229 @@
+import tempfile
+from pathlib import Path
+from test.util import TestCase
+from threading import Event, Thread
+from unittest.mock import patch
+
+from OpenCast.infra.data.cache import (
+    LRUCache,
+    PersistentCache,
+    SingleFlight,
+    deep_sizeof,
+)
+
+
+class LRUCacheTest(TestCase):
+    def setUp(self):
+        self.now = 0
+        patcher = patch(
+            "OpenCast.infra.data.cache.monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = self.make_cache()
+
+    def make_cache(self, max_entries=3, max_size=100, ttl=10):
+        cache = LRUCache(max_entries, max_size, ttl, sizeof=lambda data: data["size"])
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_register(self):
+        data = {"size": 10}
+        self.cache.register("key", data)
+        self.assertIs(data, self.cache.get("key"))
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(10, self.cache.size)
+
+    def test_get_unknown(self):
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_register_replace(self):
+        self.cache.register("key", {"size": 10})
+        self.cache.register("key", {"size": 20})
+        self.assertEqual({"size": 20}, self.cache.get("key"))
+        self.assertEqual(20, self.cache.size)
+
+    def test_evict_least_recently_used(self):
+        for key in ["a", "b", "c"]:
+            self.cache.register(key, {"size": 1})
+        self.cache.get("a")
+        self.cache.register("d", {"size": 1})
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(1, self.cache.stats.evictions)
+
+    def test_evict_by_size(self):
+        self.cache.register("a", {"size": 40})
+        self.cache.register("b", {"size": 40})
+        self.cache.register("c", {"size": 40})
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(80, self.cache.size)
+
+    def test_register_too_large(self):
+        self.cache.register("a", {"size": 101})
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(0, self.cache.size)
+
+    def test_expiry(self):
+        self.cache.register("a", {"size": 1})
+        self.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(1, self.cache.stats.expirations)
+
+    def test_clean(self):
+        self.cache.register("a", {"size": 1})
+        self.now = 5
+        self.cache.register("b", {"size": 1})
+        self.now = 10
+        self.cache.clean()
+        self.assertEqual(1, len(self.cache))
+        self.assertIsNotNone(self.cache.get("b"))
+
+    def test_clean_refreshed(self):
+        self.cache.register("a", {"size": 1})
+        self.now = 5
+        self.cache.register("b", {"size": 1})
+        self.now = 6
+        self.cache.register("a", {"size": 1})
+        self.now = 15
+        self.cache.clean()
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def test_stats(self):
+        self.cache.register("a", {"size": 1})
+        self.cache.get("a")
+        self.cache.get("b")
+        self.assertEqual(1, self.cache.stats.hits)
+        self.assertEqual(1, self.cache.stats.misses)
+        self.assertEqual(0.5, self.cache.stats.hit_ratio())
+
+    def test_janitor(self):
+        cache = LRUCache(3, 100, 10, cleanup_interval=0.01, sizeof=lambda _: 1)
+        self.addCleanup(cache.close)
+        cache.register("a", {})
+        self.now = 10
+        for _ in range(100):
+            if len(cache) == 0:
+                break
+            cache._closed.wait(0.01)
+        self.assertEqual(0, len(cache))
+
+
+class DeepSizeofTest(TestCase):
+    def test_nested(self):
+        data = {"entries": [{"title": "x" * 1000}]}
+        self.assertGreater(deep_sizeof(data), 1000)
+        self.assertGreater(deep_sizeof(data), deep_sizeof({"entries": []}))
+
+
+class PersistentCacheTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = str(Path(tmp_dir.name) / "test.cache")
+        self.now = 1000
+        patcher = patch("OpenCast.infra.data.cache.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = self.open()
+
+    def open(self):
+        cache = PersistentCache(self.path, max_entries=2, ttl=100, negative_ttl=10)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_register(self):
+        self.cache.register("key", [{"title": "title"}])
+        self.assertEqual([{"title": "title"}], self.cache.get("key"))
+        self.assertEqual(1, self.cache.stats.hits)
+
+    def test_persistence(self):
+        self.cache.register("key", [1])
+        self.cache.close()
+        self.assertEqual([1], self.open().get("key"))
+
+    def test_expiry(self):
+        self.cache.register("key", [1])
+        self.cache.register("empty", [])
+        self.now += 10
+        self.assertIsNone(self.cache.get("empty"))
+        self.assertEqual([1], self.cache.get("key"))
+        self.now += 90
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(2, self.cache.stats.misses)
+
+    def test_evict_least_recently_used(self):
+        self.cache.register("a", [1])
+        self.now += 1
+        self.cache.register("b", [2])
+        self.now += 1
+        self.cache.get("a")
+        self.cache.register("c", [3])
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual([1], self.cache.get("a"))
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual(1, self.cache.stats.evictions)
+
+
+class SingleFlightTest(TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.started = Event()
+        self.release = Event()
+        self.executions = 0
+
+    def slow_call(self, result="result"):
+        def impl():
+            self.executions += 1
+            self.started.set()
+            self.release.wait()
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return impl
+
+    def run_concurrently(self, func, count):
+        results = []
+
+        def call():
+            try:
+                results.append(self.flight.do("key", func))
+            except Exception as e:
+                results.append(e)
+
+        leader = Thread(target=call)
+        leader.start()
+        self.started.wait()
+        followers = [Thread(target=call) for _ in range(count - 1)]
+        for thread in followers:
+            thread.start()
+        while self.flight.stats.calls < count:
+            self.started.wait(0.001)
+        self.release.set()
+        for thread in [leader, *followers]:
+            thread.join()
+        return results
+
+    def test_do(self):
+        self.assertEqual(("result", False), self.flight.do("key", lambda: "result"))
+        self.assertEqual(("other", False), self.flight.do("key", lambda: "other"))
+        self.assertEqual(0, self.flight.stats.shared)
+
+    def test_do_concurrent(self):
+        results = self.run_concurrently(self.slow_call(), 5)
+        self.assertEqual(1, self.executions)
+        self.assertEqual(
+            sorted([("result", False)] + [("result", True)] * 4), sorted(results)
+        )
+        self.assertEqual(5, self.flight.stats.calls)
+        self.assertEqual(4, self.flight.stats.shared)
+        self.assertEqual(0.8, self.flight.stats.shared_ratio())
+
+    def test_do_concurrent_error(self):
+        error = RuntimeError("error")
+        results = self.run_concurrently(self.slow_call(error), 3)
+        self.assertEqual(1, self.executions)
+        self.assertEqual([error] * 3, results)
@@ -0,0 +1,150 @@
+import tempfile
+from pathlib import Path
+from test.util import TestCase
+from threading import RLock
+from unittest.mock import patch
+
+from OpenCast.infra.data.journal import JournalDatabase
+
+
+class JournalDatabaseTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = Path(tmp_dir.name) / "test.journal"
+        self.snapshot_path = Path(tmp_dir.name) / "test.journal.snapshot"
+        self.database = self.connect()
+        self.table = self.database.table("test")
+
+    def connect(self, snapshot_changes=1000):
+        database = JournalDatabase(str(self.path), RLock(), snapshot_changes)
+        self.addCleanup(database.close)
+        return database
+
+    def reopen(self):
+        # Simulate a crash, the journal is not compacted
+        self.database._log.close()
+        return self.connect()
+
+    def test_insert(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.assertTrue(self.table.contains("1"))
+        self.assertEqual({"id": "1", "name": "first"}, self.table.get("1"))
+
+    def test_update(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.update({"id": "1", "name": "updated"})
+        self.assertEqual({"id": "1", "name": "updated"}, self.table.get("1"))
+
+    def test_remove(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.remove("1")
+        self.assertFalse(self.table.contains("1"))
+        self.assertIsNone(self.table.get("1"))
+
+    def test_get_many(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.insert({"id": "2", "name": "second"})
+        self.assertEqual(
+            [{"id": "2", "name": "second"}, None, {"id": "1", "name": "first"}],
+            self.table.get_many(["2", "3", "1"]),
+        )
+
+    def test_search(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.insert({"id": "2", "name": "second"})
+        results = self.table.search(lambda doc: doc["name"] == "second")
+        self.assertEqual([{"id": "2", "name": "second"}], results)
+
+    def test_replay(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.insert({"id": "2", "name": "second"})
+        self.table.update({"id": "1", "name": "updated"})
+        self.table.remove("2")
+        database = self.reopen()
+        self.assertEqual([{"id": "1", "name": "updated"}], database.table("test").all())
+
+    def test_transaction(self):
+        with self.database.transaction():
+            self.table.insert({"id": "1"})
+            self.table.insert({"id": "2"})
+        self.assertEqual(1, len(self.path.read_bytes().splitlines()))
+        self.assertEqual(2, len(self.reopen().table("test").all()))
+
+    def test_transaction_rollback(self):
+        self.table.insert({"id": "1", "name": "first"})
+        with self.assertRaises(RuntimeError):
+            with self.database.transaction():
+                self.table.update({"id": "1", "name": "updated"})
+                self.table.insert({"id": "2"})
+                raise RuntimeError()
+        self.assertEqual([{"id": "1", "name": "first"}], self.table.all())
+        self.assertEqual(self.table.all(), self.reopen().table("test").all())
+
+    def test_append_failure(self):
+        with patch("OpenCast.infra.data.journal.os.fsync", side_effect=OSError()):
+            with self.assertRaises(OSError):
+                self.table.insert({"id": "1"})
+        self.assertFalse(self.table.contains("1"))
+        self.table.insert({"id": "2"})
+        self.assertEqual([{"id": "2"}], self.reopen().table("test").all())
+
+    def test_append_failure_after_snapshot(self):
+        database = self.connect(snapshot_changes=1)
+        table = database.table("test")
+        table.insert({"id": "1"})
+        with patch("OpenCast.infra.data.journal.os.fsync", side_effect=OSError()):
+            with self.assertRaises(OSError):
+                table.insert({"id": "2"})
+        self.assertEqual(0, self.path.stat().st_size)
+
+        table.insert({"id": "3"})
+        database._log.close()
+        self.assertEqual([{"id": "1"}, {"id": "3"}], self.connect().table("test").all())
+
+    def test_corrupted_tail(self):
+        self.table.insert({"id": "1"})
+        self.table.insert({"id": "2"})
+        self.database._log.close()
+        content = self.path.read_bytes()
+        self.path.write_bytes(content[:-5])
+
+        database = self.connect()
+        self.assertEqual([{"id": "1"}], database.table("test").all())
+        database.table("test").insert({"id": "3"})
+        database._log.close()
+        self.assertEqual([{"id": "1"}, {"id": "3"}], self.connect().table("test").all())
+
+    def test_checksum_mismatch(self):
+        self.table.insert({"id": "1"})
+        self.database._log.close()
+        self.path.write_bytes(self.path.read_bytes().replace(b'"1"', b'"2"'))
+        self.assertEqual([], self.connect().table("test").all())
+
+    def test_snapshot(self):
+        database = self.connect(snapshot_changes=2)
+        table = database.table("test")
+        table.insert({"id": "1"})
+        self.assertFalse(self.snapshot_path.exists())
+        table.insert({"id": "2"})
+        self.assertTrue(self.snapshot_path.exists())
+        self.assertEqual(0, self.path.stat().st_size)
+
+        table.insert({"id": "3"})
+        database._log.close()
+        self.assertEqual(3, len(self.connect().table("test").all()))
+
+    def test_snapshot_stale_journal(self):
+        # A crash between writing the snapshot and truncating the journal
+        self.table.insert({"id": "1"})
+        journal = self.path.read_bytes()
+        self.database.close()
+        self.path.write_bytes(journal)
+        self.assertEqual([{"id": "1"}], self.connect().table("test").all())
+
+    def test_close_compacts(self):
+        self.table.insert({"id": "1"})
+        self.database.close()
+        self.assertTrue(self.snapshot_path.exists())
+        self.assertEqual(0, self.path.stat().st_size)
+        self.assertEqual([{"id": "1"}], self.connect().table("test").all())
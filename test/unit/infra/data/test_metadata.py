@@ -0,0 +1,120 @@
+import tempfile
+from pathlib import Path
+from test.util import TestCase
+from unittest.mock import patch
+
+from OpenCast.infra.data.metadata import MetadataStore, merge_volatile, split_volatile
+from OpenCast.infra.media.extraction import compact_metadata
+
+
+class MetadataStoreTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = str(Path(tmp_dir.name) / "test.metadata")
+        self.now = 1000
+        for module in ("cache", "metadata"):
+            patcher = patch(
+                f"OpenCast.infra.data.{module}.time", side_effect=lambda: self.now
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.store = self.open()
+        self.metadata = {
+            "extractor_key": "Youtube",
+            "title": "title",
+            "duration": 300,
+            "url": "https://stream/signed",
+        }
+
+    def open(self, max_size=10_000):
+        store = MetadataStore(
+            self.path, max_size, ttls={"default": 100, "YoutubeTab": 10}, volatile_ttl=5
+        )
+        self.addCleanup(store.close)
+        return store
+
+    def test_register(self):
+        self.store.register("key", self.metadata)
+        self.assertEqual(self.metadata, self.store.get("key"))
+        self.assertEqual(1, self.store.stats.hits)
+
+    def test_get_unknown(self):
+        self.assertIsNone(self.store.get("key"))
+        self.assertEqual(1, self.store.stats.misses)
+
+    def test_persistence(self):
+        self.store.register("key", self.metadata)
+        self.store.close()
+        store = self.open()
+        self.assertEqual(self.metadata, store.get("key"))
+        self.assertGreater(store.size, 0)
+
+    def test_volatile_expiry(self):
+        self.store.register("key", self.metadata)
+        self.now += 5
+        self.assertIsNone(self.store.get("key"))
+        stable = self.store.get("key", stable_only=True)
+        self.assertEqual(
+            {"extractor_key": "Youtube", "title": "title", "duration": 300}, stable
+        )
+
+    def test_extractor_ttl(self):
+        self.store.register("video", self.metadata)
+        self.store.register(
+            "playlist", {**self.metadata, "extractor_key": "YoutubeTab"}
+        )
+        self.now += 10
+        self.assertIsNone(self.store.get("playlist", stable_only=True))
+        self.assertIsNotNone(self.store.get("video", stable_only=True))
+        self.now += 90
+        self.assertIsNone(self.store.get("video", stable_only=True))
+
+    def test_extractor_ttl_compacted(self):
+        # The metadata extracted in worker processes is compacted
+        metadata = {**self.metadata, "extractor_key": "YoutubeTab", "formats": []}
+        self.store.register("playlist", compact_metadata(metadata))
+        self.now += 10
+        self.assertIsNone(self.store.get("playlist", stable_only=True))
+
+    def test_evict_least_recently_used(self):
+        self.store.register("a", self.metadata)
+        size = self.store.size
+        self.store.close()
+        store = self.open(max_size=2 * size)
+        store.register("b", self.metadata)
+        self.now += 1
+        store.get("a")
+        store.register("c", self.metadata)
+        self.assertIsNone(store.get("b"))
+        self.assertIsNotNone(store.get("a"))
+        self.assertEqual(1, store.stats.evictions)
+        self.assertEqual(2 * size, store.size)
+
+    def test_clean_on_open(self):
+        self.store.register("key", self.metadata)
+        self.store.close()
+        self.now += 100
+        self.assertEqual(0, self.open().size)
+
+    def test_register_uncacheable(self):
+        self.store.register("key", {**self.metadata, "obj": object()})
+        self.assertIsNone(self.store.get("key"))
+
+
+class VolatileSplitTest(TestCase):
+    def test_split_entries(self):
+        metadata = {
+            "_type": "playlist",
+            "entries": [
+                {"title": "a", "url": "a"},
+                None,
+                {"title": "b", "formats": []},
+            ],
+        }
+        stable, volatile = split_volatile(metadata)
+        self.assertEqual(
+            {"_type": "playlist", "entries": [{"title": "a"}, None, {"title": "b"}]},
+            stable,
+        )
+        self.assertEqual(metadata, merge_volatile(stable, volatile))
@@ -0,0 +1,84 @@
+import tempfile
+from pathlib import Path
+from test.util import TestCase
+from threading import RLock
+from unittest.mock import patch
+
+from tinydb import TinyDB
+from tinydb.storages import JSONStorage
+
+from OpenCast.infra.data.journal import JournalDatabase
+from OpenCast.infra.data.migration import (
+    migrate_json_to_journal,
+    migrate_json_to_sqlite,
+)
+from OpenCast.infra.data.sqlite import SQLiteDatabase
+
+
+class MigrationTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.json_path = str(Path(tmp_dir.name) / "test.db")
+        self.sqlite_path = str(Path(tmp_dir.name) / "test.sqlite")
+        self.journal_path = str(Path(tmp_dir.name) / "test.journal")
+        self.tmp_dir = Path(tmp_dir.name)
+
+    def files(self):
+        return sorted(path.name for path in self.tmp_dir.iterdir())
+
+    def make_source(self):
+        source = TinyDB(self.json_path, storage=JSONStorage)
+        source.table("Video").insert_multiple([{"id": "1"}, {"id": "2"}])
+        source.table("Player").insert({"id": "3", "volume": 70})
+        source.close()
+
+    def test_migrate_json_to_sqlite(self):
+        self.make_source()
+        migrate_json_to_sqlite(self.json_path, self.sqlite_path)
+
+        database = SQLiteDatabase(self.sqlite_path, RLock())
+        self.addCleanup(database.close)
+        self.assertEqual([{"id": "1"}, {"id": "2"}], database.table("Video").all())
+        self.assertEqual([{"id": "3", "volume": 70}], database.table("Player").all())
+
+    def test_migrate_json_to_sqlite_interrupted(self):
+        self.make_source()
+        with patch("OpenCast.infra.data.migration.structlog") as structlog_mock:
+            structlog_mock.get_logger.return_value.info.side_effect = RuntimeError()
+            with self.assertRaises(RuntimeError):
+                migrate_json_to_sqlite(self.json_path, self.sqlite_path)
+
+        # Nothing is left to be mistaken for a migrated database
+        self.assertEqual(["test.db"], self.files())
+
+        migrate_json_to_sqlite(self.json_path, self.sqlite_path)
+        database = SQLiteDatabase(self.sqlite_path, RLock())
+        self.addCleanup(database.close)
+        self.assertEqual([{"id": "1"}, {"id": "2"}], database.table("Video").all())
+
+    def test_migrate_json_to_journal(self):
+        self.make_source()
+        migrate_json_to_journal(self.json_path, self.journal_path)
+
+        database = JournalDatabase(self.journal_path, RLock())
+        self.addCleanup(database.close)
+        self.assertEqual([{"id": "1"}, {"id": "2"}], database.table("Video").all())
+        self.assertEqual([{"id": "3", "volume": 70}], database.table("Player").all())
+
+    def test_migrate_json_to_journal_interrupted(self):
+        self.make_source()
+        with patch("OpenCast.infra.data.migration.structlog") as structlog_mock:
+            structlog_mock.get_logger.return_value.info.side_effect = RuntimeError()
+            with self.assertRaises(RuntimeError):
+                migrate_json_to_journal(self.json_path, self.journal_path)
+
+        self.assertEqual(["test.db"], self.files())
+
+        migrate_json_to_journal(self.json_path, self.journal_path)
+        self.assertEqual(
+            ["test.db", "test.journal", "test.journal.snapshot"], self.files()
+        )
+        database = JournalDatabase(self.journal_path, RLock())
+        self.addCleanup(database.close)
+        self.assertEqual([{"id": "1"}, {"id": "2"}], database.table("Video").all())
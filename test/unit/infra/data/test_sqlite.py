@@ -0,0 +1,87 @@
+import tempfile
+from pathlib import Path
+from test.util import TestCase
+from threading import RLock
+
+from OpenCast.infra.data.sqlite import SQLiteDatabase, SQLiteTable
+
+
+class SQLiteDatabaseTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = str(Path(tmp_dir.name) / "test.sqlite")
+        self.database = self.connect()
+        self.table = self.database.table("test")
+
+    def connect(self):
+        database = SQLiteDatabase(self.path, RLock())
+        self.addCleanup(database.close)
+        return database
+
+    def test_insert(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.assertTrue(self.table.contains("1"))
+        self.assertEqual({"id": "1", "name": "first"}, self.table.get("1"))
+
+    def test_update(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.update({"id": "1", "name": "updated"})
+        self.assertEqual({"id": "1", "name": "updated"}, self.table.get("1"))
+
+    def test_remove(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.remove("1")
+        self.assertFalse(self.table.contains("1"))
+        self.assertIsNone(self.table.get("1"))
+
+    def test_get_many(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.insert({"id": "2", "name": "second"})
+        self.assertEqual(
+            [{"id": "2", "name": "second"}, None, {"id": "1", "name": "first"}],
+            self.table.get_many(["2", "3", "1"]),
+        )
+
+    def test_get_many_chunked(self):
+        ids = [str(i) for i in range(SQLiteTable.MAX_PARAMETERS + 1)]
+        with self.database.transaction():
+            for id_ in ids:
+                self.table.insert({"id": id_})
+        documents = self.table.get_many(ids[::-1])
+        self.assertEqual(ids[::-1], [doc["id"] for doc in documents])
+
+    def test_all_ordered(self):
+        for id_ in ["2", "1", "3"]:
+            self.table.insert({"id": id_})
+        self.table.update({"id": "2", "name": "updated"})
+        self.assertEqual(["2", "1", "3"], [doc["id"] for doc in self.table.all()])
+
+    def test_search(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.table.insert({"id": "2", "name": "second"})
+        results = self.table.search(lambda doc: doc["name"] == "second")
+        self.assertEqual([{"id": "2", "name": "second"}], results)
+
+    def test_tables(self):
+        self.database.table("other")
+        self.assertEqual({"test", "other"}, self.database.tables())
+
+    def test_persistence(self):
+        self.table.insert({"id": "1", "name": "first"})
+        self.database.close()
+        database = self.connect()
+        self.assertEqual({"id": "1", "name": "first"}, database.table("test").get("1"))
+
+    def test_transaction(self):
+        with self.database.transaction():
+            self.table.insert({"id": "1"})
+            self.table.insert({"id": "2"})
+        self.assertEqual(2, len(self.connect().table("test").all()))
+
+    def test_transaction_rollback(self):
+        with self.assertRaises(RuntimeError):
+            with self.database.transaction():
+                self.table.insert({"id": "1"})
+                raise RuntimeError()
+        self.assertFalse(self.table.contains("1"))
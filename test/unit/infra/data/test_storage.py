@@ -0,0 +1,144 @@
+import json
+import tempfile
+from pathlib import Path
+from test.util import TestCase
+from threading import RLock
+from time import monotonic, sleep
+from unittest.mock import patch
+
+from tinydb.storages import MemoryStorage
+
+from OpenCast.infra.data.storage import BufferedJSONStorage, TransactionMiddleware
+
+
+def wait_until(predicate, timeout=1.0):
+    deadline = monotonic() + timeout
+    while not predicate() and monotonic() < deadline:
+        sleep(0.01)
+
+
+class BufferedJSONStorageTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = Path(tmp_dir.name) / "test.db"
+
+    def make_storage(self, flush_interval=60, flush_changes=100):
+        storage = BufferedJSONStorage(
+            str(self.path), RLock(), flush_interval, flush_changes
+        )
+        self.addCleanup(storage.close)
+        return storage
+
+    def read_file(self):
+        content = self.path.read_text()
+        return json.loads(content) if content else None
+
+    def test_read_empty(self):
+        storage = self.make_storage()
+        self.assertIsNone(storage.read())
+
+    def test_read_existing(self):
+        self.path.write_text(json.dumps({"table": {"1": {"id": "1"}}}))
+        storage = self.make_storage()
+        self.assertEqual({"table": {"1": {"id": "1"}}}, storage.read())
+
+    def test_write_buffered(self):
+        storage = self.make_storage()
+        storage.write({"table": {}})
+        self.assertEqual({"table": {}}, storage.read())
+        self.assertIsNone(self.read_file())
+
+    def test_flush(self):
+        storage = self.make_storage()
+        storage.write({"table": {"1": {"id": "1"}}})
+        storage.flush()
+        self.assertEqual({"table": {"1": {"id": "1"}}}, self.read_file())
+        self.assertFalse(self.path.with_name("test.db.tmp").exists())
+
+    def test_flush_on_change_count(self):
+        storage = self.make_storage(flush_changes=2)
+        with patch.object(storage, "_write_file") as write_file:
+            storage.write({"table": {}})
+            storage.write({"table": {"1": {"id": "1"}}})
+            wait_until(lambda: write_file.called)
+            write_file.assert_called_once_with(
+                json.dumps({"table": {"1": {"id": "1"}}})
+            )
+
+    def test_flush_on_interval(self):
+        storage = self.make_storage(flush_interval=0.01)
+        with patch.object(storage, "_write_file") as write_file:
+            storage.write({"table": {}})
+            wait_until(lambda: write_file.called)
+            write_file.assert_called_once_with(json.dumps({"table": {}}))
+
+    def test_flush_error(self):
+        storage = self.make_storage()
+        storage.write({"table": {}})
+        with patch.object(storage, "_write_file", side_effect=OSError("full")):
+            storage.flush()
+        self.assertIsNone(self.read_file())
+
+        storage.flush()
+        self.assertEqual({"table": {}}, self.read_file())
+
+    def test_close(self):
+        storage = self.make_storage()
+        storage.write({"table": {}})
+        storage.close()
+        self.assertEqual({"table": {}}, self.read_file())
+        self.assertFalse(storage._flusher.is_alive())
+
+
+class TransactionMiddlewareTest(TestCase):
+    def setUp(self):
+        self.middleware = TransactionMiddleware(MemoryStorage)()
+        self.storage = self.middleware.storage
+
+    def test_write_outside_transaction(self):
+        self.middleware.write({"table": {}})
+        self.assertEqual({"table": {}}, self.storage.read())
+
+    def test_transaction(self):
+        with patch.object(self.storage, "write") as write:
+            with self.middleware.transaction():
+                self.middleware.write({"table": {"1": {}}})
+                self.assertEqual({"table": {"1": {}}}, self.middleware.read())
+                self.middleware.write({"table": {"1": {}, "2": {}}})
+                write.assert_not_called()
+            write.assert_called_once_with({"table": {"1": {}, "2": {}}})
+
+    def test_transaction_read_once(self):
+        self.storage.write({"table": {}})
+        with patch.object(self.storage, "read", return_value={}) as read:
+            with self.middleware.transaction():
+                self.middleware.read()
+                self.middleware.read()
+            read.assert_called_once()
+
+    def test_transaction_error_keeps_live_data(self):
+        self.storage.write({"table": {"1": {"name": "first"}}})
+        with self.assertRaises(RuntimeError):
+            with self.middleware.transaction():
+                data = self.middleware.read()
+                data["table"]["1"]["name"] = "updated"
+                data["table"]["2"] = {"name": "second"}
+                self.middleware.write(data)
+                raise RuntimeError()
+        self.assertEqual({"table": {"1": {"name": "first"}}}, self.storage.read())
+
+    def test_nested_transaction(self):
+        with patch.object(self.storage, "write") as write:
+            with self.middleware.transaction():
+                with self.middleware.transaction():
+                    self.middleware.write({"table": {}})
+                write.assert_not_called()
+            write.assert_called_once_with({"table": {}})
+
+    def test_transaction_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.middleware.transaction():
+                self.middleware.write({"table": {}})
+                raise RuntimeError()
+        self.assertIsNone(self.storage.read())
@@ -0,0 +1,96 @@
+from test.util import TestCase
+from unittest.mock import patch
+
+from OpenCast.infra.media.bandwidth import BandwidthGovernor
+
+
+class BandwidthGovernorTest(TestCase):
+    def setUp(self):
+        self.clock = 0
+        patcher = patch(
+            "OpenCast.infra.media.bandwidth.monotonic", side_effect=lambda: self.clock
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        patcher = patch("OpenCast.infra.media.bandwidth.sleep")
+        self.addCleanup(patcher.stop)
+        self.sleep = patcher.start()
+
+        self.governor = BandwidthGovernor(rate=1000, stream_reserve=600)
+
+    def test_unlimited(self):
+        governor = BandwidthGovernor(rate=0, stream_reserve=0)
+        governor.consume(10**9)
+        self.sleep.assert_not_called()
+
+    def test_consume(self):
+        self.governor.consume(500)
+        self.sleep.assert_called_once_with(0.5)
+
+        # Concurrent downloads queue behind the debt
+        self.governor.consume(500)
+        self.sleep.assert_called_with(1.0)
+
+    def test_consume_refilled(self):
+        self.clock = 10
+        self.governor.consume(1000)
+        self.sleep.assert_not_called()
+        self.governor.consume(100)
+        self.sleep.assert_called_once_with(0.1)
+
+    def test_stream_reserve(self):
+        self.governor.set_streaming(True)
+        self.governor.consume(400)
+        self.sleep.assert_called_once_with(1.0)
+
+    def test_stream_reserve_floor(self):
+        self.governor.configure(stream_reserve=5000)
+        self.governor.set_streaming(True)
+        self.governor.consume(100)
+        self.sleep.assert_called_once_with(1.0)
+
+    def test_stream_reserve_unlimited(self):
+        with patch("OpenCast.infra.media.bandwidth.structlog") as structlog_mock:
+            logger = structlog_mock.get_logger.return_value
+            governor = BandwidthGovernor(rate=0, stream_reserve=600)
+            logger.warning.assert_called_once()
+
+            logger.reset_mock()
+            governor.configure(rate=1000)
+            logger.warning.assert_not_called()
+            governor.configure(rate=0)
+            logger.warning.assert_called_once()
+
+    def test_configure(self):
+        self.governor.configure(rate=2000)
+        self.governor.consume(1000)
+        self.sleep.assert_called_once_with(0.5)
+
+        self.sleep.reset_mock()
+        self.governor.configure(rate=0)
+        self.governor.consume(1000)
+        self.sleep.assert_not_called()
+
+    def test_meter(self):
+        meter = self.governor.meter()
+        meter(None)
+        meter(5000)  # Resumed download, the bytes on disk are not consumed
+        self.sleep.assert_not_called()
+        meter(5500)
+        self.sleep.assert_called_once_with(0.5)
+        meter(100)  # Next file of the download
+        meter(300)
+        self.sleep.assert_called_with(0.7)
+
+    def test_status(self):
+        self.governor.set_streaming(True)
+        self.assertEqual(
+            {
+                "rate": 1000,
+                "stream_reserve": 600,
+                "streaming": True,
+                "available_rate": 400,
+            },
+            self.governor.status(),
+        )
@@ -1,13 +1,114 @@
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from test.util import TestCase
+from threading import Event, Thread
+from urllib.parse import parse_qs, urlparse
 
+from OpenCast.infra.data.cache import PersistentCache
 from OpenCast.infra.media.deezer import Deezer
 
 
-class DeezerTest(TestCase):
-    def setUp(self) -> None:
-        self.deezer = Deezer()
+class StubDeezer(ThreadingHTTPServer):
+    """Answer the searches with a result naming the queried terms"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.queries = []
+        self.release = Event()
+        self.release.set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.release.wait()
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        self.server.queries.append(query)
+        data = [] if "unknown" in query else [{"title": query}]
+        body = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-    def test_search_w_artist_album(self):
-        # https://stackoverflow.com/questions/46450545/testing-aiohttp-client-with-unittest-mock-patch
-        # TODO: learn how to Mock the client session
+    def log_message(self, *args):
         pass
+
+
+class DeezerTest(TestCase):
+    def setUp(self):
+        self.server = StubDeezer()
+        thread = Thread(target=self.server.serve_forever, args=(0.01,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_path = str(Path(tmp_dir.name) / "deezer.cache")
+        self.cache = self.make_cache()
+        self.deezer = self.make_deezer(self.cache)
+
+    def make_cache(self):
+        cache = PersistentCache(self.cache_path, 10, ttl=100, negative_ttl=10)
+        self.addCleanup(cache.close)
+        return cache
+
+    def make_deezer(self, cache=None):
+        deezer = Deezer(cache, root_url=self.server.url)
+        self.addCleanup(deezer.close)
+        return deezer
+
+    def test_search(self):
+        self.assertEqual(
+            [{"title": 'artist:"artist" album:"album"'}],
+            self.deezer.search("artist", "album"),
+        )
+        self.assertEqual(
+            [{"title": 'artist:"artist"'}], self.deezer.search("artist", None)
+        )
+
+    def test_search_cached(self):
+        self.deezer.search("artist", "album")
+        self.deezer.search("artist", "album")
+        self.assertEqual(1, len(self.server.queries))
+
+    def test_search_cached_across_restarts(self):
+        self.deezer.search("artist", "album")
+        self.cache.close()
+        deezer = self.make_deezer(self.make_cache())
+        deezer.search("artist", "album")
+        self.assertEqual(1, len(self.server.queries))
+
+    def test_search_negative_cached(self):
+        self.assertEqual([], self.deezer.search("unknown", None))
+        self.assertEqual([], self.deezer.search("unknown", None))
+        self.assertEqual(1, len(self.server.queries))
+
+    def test_search_without_cache(self):
+        deezer = self.make_deezer()
+        deezer.search("artist", "album")
+        deezer.search("artist", "album")
+        self.assertEqual(2, len(self.server.queries))
+
+    def test_search_concurrent(self):
+        self.server.release.clear()
+        terms = [("artist", "album")] * 4 + [("other", None)] * 4
+        with ThreadPoolExecutor(max_workers=len(terms)) as executor:
+            futures = [executor.submit(self.deezer.search, *term) for term in terms]
+            while self.deezer._flight.stats.calls < len(terms):
+                self.server.release.wait(0.001)
+            self.server.release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(2, len(self.server.queries))
+        self.assertEqual([results[0]] * 4, results[:4])
+        self.assertEqual([results[4]] * 4, results[4:])
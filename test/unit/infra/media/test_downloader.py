@@ -1,13 +1,23 @@
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from queue import Queue
 from test.util import TestCase
-from unittest.mock import Mock, patch
+from threading import Event, Thread
+from unittest.mock import MagicMock, Mock, call, patch
 
 from OpenCast.domain.service.identity import IdentityService
+from OpenCast.infra.event.downloader import DownloadInfo
 from OpenCast.infra.media.downloader import (
     Downloader,
     DownloadError,
     DownloadSuccess,
     Logger,
 )
+from OpenCast.infra.media.format import FormatPolicy
+from OpenCast.infra.media.progress import ProgressThrottle
+from OpenCast.infra.media.scheduler import DownloadScheduler, Priority
+from OpenCast.infra.media.ydl_pool import YoutubeDLPool
 
 
 class LoggerTest(TestCase):
@@ -92,12 +102,12 @@ class LoggerTest(TestCase):
 
 class DownloaderTest(TestCase):
     def setUp(self):
-        patcher = patch("OpenCast.infra.media.downloader.YoutubeDL")
+        patcher = patch("OpenCast.infra.media.ydl_pool.YoutubeDL")
         self.addCleanup(patcher.stop)
         ydl_cls_mock = patcher.start()
         self.ydl = ydl_cls_mock.return_value
 
-        def execute_handler(handler, *args):
+        def execute_handler(handler, *args, **kwargs):
             handler(*args)
 
         self.executor = Mock()
@@ -117,6 +127,104 @@ class DownloaderTest(TestCase):
         self.downloader.download_video(op_id, video_id, "url", "/tmp/media.mp4")
 
         self.dispatcher.dispatch.assert_called_with(DownloadSuccess(op_id))
+        self.assertEqual(
+            {"priority": Priority.BACKGROUND, "key": video_id, "host": ""},
+            self.executor.submit.call_args.kwargs,
+        )
+
+    @patch("OpenCast.infra.media.downloader.Path")
+    def test_download_video_format(self, path_cls):
+        path_cls.return_value.exists.return_value = True
+        policy = Mock()
+        policy.select.return_value = "best[height<=?720]"
+        downloader = Downloader(
+            self.executor, self.cache, self.dispatcher, format_policy=policy
+        )
+
+        def download(_):
+            for hook in self.ydl._progress_hooks:
+                hook({"status": "finished", "downloaded_bytes": 100, "elapsed": 2})
+
+        self.ydl.download.side_effect = download
+        op_id = IdentityService.random()
+        video_id = IdentityService.id_video("url")
+        downloader.download_video(op_id, video_id, "url", "/tmp/media.mp4")
+
+        self.ydl.build_format_selector.assert_called_with("best[height<=?720]")
+        policy.record.assert_called_once_with(100, 2)
+        self.dispatcher.dispatch.assert_called_with(
+            DownloadSuccess(op_id, "best[height<=?720]")
+        )
+
+    @patch("OpenCast.infra.media.downloader.Path")
+    def test_download_video_progress(self, path_cls):
+        path_cls.return_value.exists.return_value = True
+        throttle = ProgressThrottle(rate=0.001)
+        self.addCleanup(throttle.close)
+        downloader = Downloader(
+            self.executor, self.cache, self.dispatcher, progress_throttle=throttle
+        )
+
+        def download(_):
+            (hook,) = self.ydl._progress_hooks
+            for downloaded in range(0, 100, 10):
+                hook(
+                    {
+                        "status": "downloading",
+                        "total_bytes": 100,
+                        "downloaded_bytes": downloaded,
+                    }
+                )
+            hook({"status": "finished", "total_bytes": 100, "downloaded_bytes": 100})
+
+        self.ydl.download.side_effect = download
+        op_id = IdentityService.random()
+        video_id = IdentityService.id_video("url")
+        downloader.download_video(op_id, video_id, "url", "/tmp/media.mp4")
+
+        # The intermediate reports are coalesced, the final one is delivered
+        self.assertEqual(
+            [
+                call(DownloadInfo(op_id, video_id, 100, 100)),
+                call(DownloadSuccess(op_id)),
+            ],
+            self.dispatcher.dispatch.call_args_list,
+        )
+
+    @patch("OpenCast.infra.media.downloader.Path")
+    def test_download_video_governed(self, path_cls):
+        path_cls.return_value.exists.return_value = True
+        governor = MagicMock()
+        downloader = Downloader(
+            self.executor, self.cache, self.dispatcher, governor=governor
+        )
+
+        def download(_):
+            (hook,) = self.ydl._progress_hooks
+            hook({"status": "downloading", "downloaded_bytes": 10})
+
+        self.ydl.download.side_effect = download
+        op_id = IdentityService.random()
+        video_id = IdentityService.id_video("url")
+        downloader.download_video(op_id, video_id, "http://host/media", "/tmp/m.mp4")
+
+        self.assertEqual("host", self.executor.submit.call_args.kwargs["host"])
+        governor.meter.return_value.assert_called_once_with(10)
+
+    def test_download_video_priority(self):
+        op_id = IdentityService.random()
+        video_id = IdentityService.id_video("url")
+        self.downloader.download_video(
+            op_id, video_id, "url", "/tmp/media.mp4", priority=Priority.NEXT
+        )
+        self.assertEqual(
+            Priority.NEXT, self.executor.submit.call_args.kwargs["priority"]
+        )
+
+        self.downloader.reprioritize_video(video_id, Priority.INTERACTIVE)
+        self.executor.reprioritize.assert_called_once_with(
+            video_id, Priority.INTERACTIVE
+        )
 
     def test_download_video_error(self):
         self.ydl.download.side_effect = RuntimeError("error")
@@ -189,3 +297,282 @@ class DownloaderTest(TestCase):
         self.assertEqual(
             None, self.downloader.download_metadata("url", process_ie_data=True)
         )
+
+    def test_download_metadata_extractor(self):
+        metadata = {"url": "url", "title": "title"}
+        extractor = Mock()
+        extractor.extract.return_value = metadata
+        downloader = Downloader(
+            self.executor, self.cache, self.dispatcher, extractor=extractor
+        )
+        self.assertEqual(metadata, downloader.download_metadata("url", True))
+        extractor.extract.assert_called_once_with("url", True)
+        self.cache.register.assert_called_once_with("urlTrue", metadata)
+        self.ydl.extract_info.assert_not_called()
+
+    def test_iterate_playlist(self):
+        def entries():
+            yield {"_type": "url", "url": "url1"}
+            yield None
+            yield {"_type": "url", "url": "url2"}
+
+        self.ydl.extract_info.return_value = {"_type": "playlist", "entries": entries()}
+        self.assertEqual(
+            [{"_type": "url", "url": "url1"}, {"_type": "url", "url": "url2"}],
+            list(self.downloader.iterate_playlist("playlist")),
+        )
+        self.ydl.extract_info.assert_called_once_with(
+            "playlist", download=False, process=False
+        )
+
+    def test_iterate_playlist_error(self):
+        def entries():
+            yield {"_type": "url", "url": "url1"}
+            raise RuntimeError("page error")
+
+        self.ydl.extract_info.return_value = {"_type": "playlist", "entries": entries()}
+        self.assertEqual(
+            [{"_type": "url", "url": "url1"}],
+            list(self.downloader.iterate_playlist("playlist")),
+        )
+
+    def test_download_metadata_cached(self):
+        metadata = {"url": "url", "title": "title"}
+        self.cache.get.return_value = metadata
+        self.assertEqual(
+            metadata, self.downloader.download_metadata("url", process_ie_data=True)
+        )
+        self.ydl.extract_info.assert_not_called()
+
+    def test_download_metadata_persistent(self):
+        metadata = {"url": "url", "title": "title"}
+        store = Mock()
+        store.get.return_value = None
+        downloader = Downloader(
+            self.executor, self.cache, self.dispatcher, metadata_store=store
+        )
+        self.ydl.extract_info.return_value = metadata
+        downloader.download_metadata("url", process_ie_data=True)
+        store.register.assert_called_once_with("urlTrue", metadata)
+
+        store.get.return_value = {"title": "title"}
+        self.assertEqual(
+            {"title": "title"},
+            downloader.download_metadata("url", True, stable_only=True),
+        )
+        store.get.assert_called_with("urlTrue", True)
+        self.assertEqual(1, self.ydl.extract_info.call_count)
+
+    def test_download_metadata_fresh(self):
+        metadata = {"url": "fresh_url", "title": "title"}
+        store = Mock()
+        downloader = Downloader(
+            self.executor, self.cache, self.dispatcher, metadata_store=store
+        )
+        self.cache.get.return_value = {"url": "stale_url"}
+        self.ydl.extract_info.return_value = metadata
+        self.assertEqual(
+            metadata, downloader.download_metadata("url", True, fresh=True)
+        )
+        self.cache.get.assert_not_called()
+        store.get.assert_not_called()
+        # The fresh metadata replace the stale ones
+        self.cache.register.assert_called_once_with("urlTrue", metadata)
+        store.register.assert_called_once_with("urlTrue", metadata)
+
+    def test_download_metadata_registered_meanwhile(self):
+        metadata = {"url": "url", "title": "title"}
+        self.cache.get.side_effect = [None, metadata]
+        self.assertEqual(
+            metadata, self.downloader.download_metadata("url", process_ie_data=True)
+        )
+        self.ydl.extract_info.assert_not_called()
+
+    @patch("OpenCast.infra.media.downloader.Path")
+    def test_download_video_attach(self, path_cls):
+        path_cls.return_value.exists.return_value = True
+        self.executor.submit = Mock()
+        video_id = IdentityService.id_video("url")
+        op_ids = [IdentityService.random() for _ in range(3)]
+        self.downloader.download_video(op_ids[0], video_id, "url", "/tmp/media.mp4")
+        self.downloader.download_video(
+            op_ids[1], video_id, "url", "/tmp/media.mp4", priority=Priority.NEXT
+        )
+        other_id = IdentityService.id_video("other")
+        self.downloader.download_video(op_ids[2], other_id, "other", "/tmp/media.mp4")
+
+        self.executor.submit.assert_called_once()
+        self.executor.reprioritize.assert_called_once_with(video_id, Priority.NEXT)
+
+        handler = self.executor.submit.call_args.args[0]
+        handler()
+        self.dispatcher.dispatch.assert_has_calls(
+            [call(DownloadSuccess(op_id)) for op_id in op_ids]
+        )
+        self.ydl.download.assert_called_once_with(["url"])
+
+        # A completed download is not attached to
+        self.downloader.download_video(op_ids[0], video_id, "url", "/tmp/media.mp4")
+        self.assertEqual(2, self.executor.submit.call_count)
+
+
+class DownloaderFormatTest(TestCase):
+    FORMATS = [
+        {
+            "format_id": "audio",
+            "url": "http://audio",
+            "ext": "m4a",
+            "vcodec": "none",
+            "acodec": "mp4a.40.2",
+            "filesize": 100,
+        },
+        {
+            "format_id": "720p",
+            "url": "http://720p",
+            "ext": "mp4",
+            "vcodec": "avc1.4d401f",
+            "acodec": "none",
+            "height": 720,
+            "fps": 30,
+            "filesize": 1000,
+        },
+        {
+            "format_id": "1080p",
+            "url": "http://1080p",
+            "ext": "mp4",
+            "vcodec": "avc1.640028",
+            "acodec": "none",
+            "height": 1080,
+            "fps": 30,
+            "filesize": 2000,
+        },
+    ]
+
+    def setUp(self):
+        self.ydl_pool = YoutubeDLPool()
+        self.addCleanup(self.ydl_pool.close)
+
+    def make_downloader(self, policy=None):
+        return Downloader(
+            Mock(), Mock(), Mock(), ydl_pool=self.ydl_pool, format_policy=policy
+        )
+
+    def test_expected_size(self):
+        policy = FormatPolicy(max_height=720, max_fps=30, codecs=["avc1"])
+        downloader = self.make_downloader(policy)
+        metadata = {"formats": self.FORMATS, "filesize_approx": 2100}
+        # The video format selected for the device and the audio format
+        self.assertEqual(1100, downloader.expected_size(metadata))
+
+    def test_expected_size_without_formats(self):
+        policy = FormatPolicy(max_height=720, max_fps=30, codecs=["avc1"])
+        downloader = self.make_downloader(policy)
+        self.assertEqual(2100, downloader.expected_size({"filesize_approx": 2100}))
+        self.assertEqual(0, downloader.expected_size({}))
+
+    def test_expected_size_without_policy(self):
+        downloader = self.make_downloader()
+        metadata = {"formats": self.FORMATS, "filesize": 2100}
+        self.assertEqual(2100, downloader.expected_size(metadata))
+
+
+class MediaServer(ThreadingHTTPServer):
+    """Serve a media file supporting range requests"""
+
+    DATA = bytes(range(256)) * 2048
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MediaHandler)
+        self.ranges = []
+        self.release = Event()
+        self.release.set()
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server_address[1]}/{name}.mp4"
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.release.wait()
+        self.server.ranges.append(self.headers.get("Range"))
+        start = 0
+        if self.headers.get("Range") is not None:
+            start = int(self.headers["Range"].split("=")[1].split("-")[0])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(self.server.DATA) - 1}/{len(self.server.DATA)}",
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(len(self.server.DATA) - start))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        self.wfile.write(self.server.DATA[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloaderServerTest(TestCase):
+    def setUp(self):
+        self.server = MediaServer()
+        thread = Thread(target=self.server.serve_forever, args=(0.01,), daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = Path(tmp_dir.name)
+
+        self.scheduler = DownloadScheduler(max_workers=2, aging_interval=60)
+        self.addCleanup(self.scheduler.shutdown)
+        self.events = Queue()
+        dispatcher = Mock()
+        dispatcher.dispatch.side_effect = self.events.put
+        self.downloader = Downloader(self.scheduler, Mock(), dispatcher)
+
+    def download(self, name, dest, video_id=None):
+        op_id = IdentityService.random()
+        video_id = video_id or IdentityService.id_video(name)
+        self.downloader.download_video(
+            op_id, video_id, self.server.url(name), str(dest)
+        )
+        return op_id
+
+    def wait_completion(self, op_ids):
+        pending = set(op_ids)
+        while pending:
+            event = self.events.get(timeout=5)
+            if isinstance(event, (DownloadSuccess, DownloadError)):
+                self.assertIsInstance(event, DownloadSuccess)
+                pending.remove(event.id)
+
+    def test_download(self):
+        dest = self.tmp_dir / "media.mp4"
+        self.wait_completion([self.download("media", dest)])
+        self.assertEqual(MediaServer.DATA, dest.read_bytes())
+
+    def test_resume_partial_download(self):
+        dest = self.tmp_dir / "media.mp4"
+        Path(f"{dest}.part").write_bytes(MediaServer.DATA[:100000])
+        self.wait_completion([self.download("media", dest)])
+        self.assertEqual(MediaServer.DATA, dest.read_bytes())
+        self.assertIn("bytes=100000-", self.server.ranges)
+
+    def test_deduplicate_inflight_download(self):
+        dest = self.tmp_dir / "single.mp4"
+        self.wait_completion([self.download("single", dest)])
+        single_requests = len(self.server.ranges)
+        self.server.ranges.clear()
+
+        self.server.release.clear()
+        video_id = IdentityService.id_video("media")
+        dest = self.tmp_dir / "media.mp4"
+        op_ids = [self.download("media", dest, video_id) for _ in range(3)]
+        self.server.release.set()
+        self.wait_completion(op_ids)
+        self.assertEqual(single_requests, len(self.server.ranges))
+        self.assertEqual(MediaServer.DATA, dest.read_bytes())
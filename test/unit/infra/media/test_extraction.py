@@ -0,0 +1,92 @@
+from concurrent.futures import Future
+from multiprocessing import get_context
+from test.util import TestCase
+from threading import Thread
+from unittest.mock import Mock, patch
+
+from OpenCast.infra.media import extraction
+from OpenCast.infra.media.extraction import MetadataExtractor, compact_metadata
+
+
+class CompactMetadataTest(TestCase):
+    def test_compact(self):
+        metadata = {
+            "title": "title",
+            "duration": 300,
+            "protocol": "https",
+            "formats": [{"url": "format_url"}],
+            "description": "description",
+        }
+        self.assertEqual(
+            {"title": "title", "duration": 300, "protocol": "https"},
+            compact_metadata(metadata),
+        )
+
+    def test_compact_playlist(self):
+        metadata = {
+            "_type": "playlist",
+            "title": "playlist",
+            "entries": [
+                {"webpage_url": "url1", "formats": [], "duration": 10},
+                None,
+            ],
+        }
+        self.assertEqual(
+            {
+                "_type": "playlist",
+                "title": "playlist",
+                "entries": [{"webpage_url": "url1"}, None],
+            },
+            compact_metadata(metadata),
+        )
+
+    def test_compact_lazy_playlist(self):
+        metadata = {"_type": "playlist", "entries": iter([{"webpage_url": "url"}])}
+        self.assertEqual({"_type": "playlist"}, compact_metadata(metadata))
+
+
+class MetadataExtractorTest(TestCase):
+    def setUp(self):
+        patcher = patch("OpenCast.infra.media.extraction.YoutubeDL")
+        self.addCleanup(patcher.stop)
+        self.ydl_cls = patcher.start()
+        self.ydl = self.ydl_cls.return_value
+
+    def test_worker_extract(self):
+        self.ydl.extract_info.return_value = {"title": "title", "formats": []}
+        extraction._init_worker({"quiet": True})
+        self.ydl_cls.assert_called_once_with({"quiet": True})
+        self.assertEqual({"title": "title"}, extraction._extract("url", True))
+        self.ydl.extract_info.assert_called_once_with(
+            "url", download=False, process=True
+        )
+
+    def test_worker_extract_none(self):
+        self.ydl.extract_info.return_value = None
+        extraction._init_worker({})
+        self.assertEqual(None, extraction._extract("url", False))
+
+    def test_extract(self):
+        # Forked workers inherit the patched YoutubeDL
+        self.ydl.extract_info.return_value = {"title": "title", "formats": []}
+        extractor = MetadataExtractor(1, {}, mp_context=get_context("fork"))
+        self.addCleanup(extractor.close)
+        self.assertEqual({"title": "title"}, extractor.extract("url", True))
+
+    def test_close_cancels_pending(self):
+        executor = Mock()
+        executor.submit.return_value = future = Future()
+        with patch.object(MetadataExtractor, "_make_executor", return_value=executor):
+            extractor = MetadataExtractor(1, {})
+
+        results = []
+        thread = Thread(target=lambda: results.append(extractor.extract("url", True)))
+        thread.start()
+        while not executor.submit.called:
+            thread.join(0.01)
+
+        extractor.close()
+        thread.join()
+        self.assertTrue(future.cancelled())
+        self.assertEqual([None], results)
+        executor.shutdown.assert_called_once_with(wait=False)
@@ -0,0 +1,69 @@
+from test.util import TestCase
+
+from OpenCast.infra.media.format import FormatPolicy
+
+
+class FormatPolicyTest(TestCase):
+    def setUp(self):
+        self.policy = FormatPolicy(max_height=1080, max_fps=30, codecs=["avc1"])
+
+    def test_select_without_measurement(self):
+        video = "bestvideo[height<=?1080][fps<=?30][vcodec^=avc1]"
+        self.assertEqual(
+            f"{video}+bestaudio[ext=m4a]/{video}+bestaudio"
+            "/best[height<=?1080][fps<=?30]/best",
+            self.policy.select(),
+        )
+
+    def test_select_codecs_by_preference(self):
+        policy = FormatPolicy(max_height=720, max_fps=60, codecs=["hev1", "avc1"])
+        selectors = policy.select().split("/")
+        self.assertEqual(
+            "bestvideo[height<=?720][fps<=?60][vcodec^=hev1]+bestaudio[ext=m4a]",
+            selectors[0],
+        )
+        self.assertEqual(
+            "bestvideo[height<=?720][fps<=?60][vcodec^=avc1]+bestaudio[ext=m4a]",
+            selectors[2],
+        )
+
+    def test_select_any_codec(self):
+        policy = FormatPolicy(max_height=480, max_fps=30, codecs=[])
+        self.assertTrue(
+            policy.select().startswith(
+                "bestvideo[height<=?480][fps<=?30]+bestaudio[ext=m4a]/"
+            )
+        )
+
+    def test_throughput(self):
+        self.assertIsNone(self.policy.throughput())
+        self.policy.record(1000, 2)
+        self.policy.record(3000, 2)
+        self.assertEqual(1000, self.policy.throughput())
+
+    def test_throughput_ignore_incomplete(self):
+        self.policy.record(None, 2)
+        self.policy.record(1000, None)
+        self.policy.record(1000, 0)
+        self.assertIsNone(self.policy.throughput())
+
+    def test_throughput_window(self):
+        policy = FormatPolicy(max_height=1080, max_fps=30, codecs=[], window=2)
+        policy.record(100, 1)
+        policy.record(1000, 1)
+        policy.record(1000, 1)
+        self.assertEqual(1000, policy.throughput())
+
+    def test_height_lowered_by_throughput(self):
+        # Fast enough to download 720p twice faster than it plays
+        self.policy.record(620_000, 1)
+        self.assertEqual(720, self.policy.max_height())
+        self.assertIn("[height<=?720]", self.policy.select())
+
+    def test_height_capped_by_device(self):
+        self.policy.record(100_000_000, 1)
+        self.assertEqual(1080, self.policy.max_height())
+
+    def test_height_lowest_on_slow_network(self):
+        self.policy.record(1000, 1)
+        self.assertEqual(240, self.policy.max_height())
@@ -0,0 +1,49 @@
+from test.util import TestCase
+from threading import Event
+
+from OpenCast.infra.media.progress import ProgressThrottle
+
+
+class ProgressThrottleTest(TestCase):
+    def make_throttle(self, rate):
+        throttle = ProgressThrottle(rate)
+        self.addCleanup(throttle.close)
+        return throttle
+
+    def test_flush_latest(self):
+        throttle = self.make_throttle(rate=0.001)
+        delivered = []
+        for i in range(100):
+            throttle.report("download", delivered.append, i)
+        throttle.flush("download")
+        self.assertEqual([99], delivered)
+
+        throttle.flush("download")
+        self.assertEqual([99], delivered)
+
+    def test_flush_per_download(self):
+        throttle = self.make_throttle(rate=0.001)
+        delivered = []
+        throttle.report("first", delivered.append, "first")
+        throttle.report("second", delivered.append, "second")
+        throttle.flush("second")
+        self.assertEqual(["second"], delivered)
+
+    def test_periodic_delivery(self):
+        throttle = self.make_throttle(rate=100)
+        delivered = Event()
+        throttle.report("download", lambda _: delivered.set(), 1)
+        self.assertTrue(delivered.wait(1))
+
+    def test_delivery_error(self):
+        throttle = self.make_throttle(rate=0.001)
+
+        def fail(_):
+            raise RuntimeError()
+
+        delivered = []
+        throttle.report("first", fail, 1)
+        throttle.flush("first")
+        throttle.report("first", delivered.append, 2)
+        throttle.flush("first")
+        self.assertEqual([2], delivered)
@@ -0,0 +1,212 @@
+from test.util import TestCase
+from threading import Event
+from unittest.mock import patch
+
+from OpenCast.infra.media.scheduler import DownloadScheduler, Priority
+
+
+class DownloadSchedulerTest(TestCase):
+    def setUp(self):
+        self.clock = 0
+        patcher = patch(
+            "OpenCast.infra.media.scheduler.monotonic", side_effect=lambda: self.clock
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        self.scheduler = DownloadScheduler(max_workers=1, aging_interval=10)
+        self.addCleanup(self.scheduler.shutdown)
+        self.order = []
+
+        # Occupy the worker while the jobs are submitted
+        self.release = Event()
+        self.addCleanup(self.release.set)  # Unblock the worker before the shutdown
+        self.started = Event()
+        self.blocker = self.scheduler.submit(self.block)
+        self.started.wait()
+
+    def block(self):
+        self.started.set()
+        self.release.wait()
+
+    def job(self, name, priority=Priority.BACKGROUND):
+        return self.scheduler.submit(
+            self.order.append, name, priority=priority, key=name
+        )
+
+    def run_jobs(self, futures):
+        self.release.set()
+        for future in futures:
+            future.result(timeout=1)
+
+    def test_priority_order(self):
+        futures = [
+            self.job("first"),
+            self.job("second"),
+            self.job("next", Priority.NEXT),
+            self.job("interactive", Priority.INTERACTIVE),
+        ]
+        self.run_jobs(futures)
+        self.assertEqual(["interactive", "next", "first", "second"], self.order)
+
+    def test_aging(self):
+        futures = [self.job("background")]
+        self.clock = 15
+        futures.append(self.job("next", Priority.NEXT))
+        # The background job waited enough to be promoted to the next class
+        self.run_jobs(futures)
+        self.assertEqual(["background", "next"], self.order)
+
+    def test_aging_limit(self):
+        futures = [self.job(i) for i in range(5)]
+        self.clock = 100
+        futures.append(self.job("next", Priority.NEXT))
+        futures.append(self.job("interactive", Priority.INTERACTIVE))
+        # The aged batch is never served before the video to play now
+        self.run_jobs(futures)
+        self.assertEqual(["interactive", 0, 1, 2, 3, 4, "next"], self.order)
+
+    def test_reprioritize(self):
+        futures = [self.job("first"), self.job("second"), self.job("third")]
+        self.assertTrue(self.scheduler.reprioritize("third", Priority.INTERACTIVE))
+        self.assertFalse(self.scheduler.reprioritize("unknown", Priority.INTERACTIVE))
+        self.run_jobs(futures)
+        self.assertEqual(["third", "first", "second"], self.order)
+
+    def test_reprioritize_keeps_submission_order(self):
+        futures = [
+            self.job("first"),
+            self.job("second", Priority.NEXT),
+            self.job("third", Priority.NEXT),
+        ]
+        self.scheduler.reprioritize("first", Priority.NEXT)
+        self.run_jobs(futures)
+        self.assertEqual(["first", "second", "third"], self.order)
+
+    def test_reprioritize_never_demotes(self):
+        futures = [
+            self.job("first", Priority.NEXT),
+            self.job("second", Priority.INTERACTIVE),
+        ]
+        self.assertTrue(self.scheduler.reprioritize("second", Priority.BACKGROUND))
+        self.run_jobs(futures)
+        self.assertEqual(["second", "first"], self.order)
+
+    def test_reprioritize_started(self):
+        future = self.job("first")
+        self.run_jobs([future])
+        self.assertFalse(self.scheduler.reprioritize("first", Priority.INTERACTIVE))
+
+    def test_depth(self):
+        futures = [
+            self.job("first"),
+            self.job("second"),
+            self.job("interactive", Priority.INTERACTIVE),
+        ]
+        self.assertEqual(
+            {"interactive": 1, "next": 0, "background": 2, "running": 1},
+            self.scheduler.depth(),
+        )
+        self.run_jobs(futures)
+        self.blocker.result(timeout=1)
+        self.assertEqual(
+            {"interactive": 0, "next": 0, "background": 0, "running": 0},
+            self.scheduler.depth(),
+        )
+
+    def test_host_limit(self):
+        scheduler = DownloadScheduler(max_workers=2, aging_interval=10, max_host_jobs=1)
+        self.addCleanup(scheduler.shutdown)
+        started = Event()
+        release = Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        blocker = scheduler.submit(block, host="host")
+        started.wait(timeout=1)
+
+        # The worker left is not held by the saturated host
+        pending = scheduler.submit(self.order.append, "host", host="host")
+        other = scheduler.submit(
+            self.order.append, "other", priority=Priority.NEXT, host="other"
+        )
+        other.result(timeout=1)
+        self.assertEqual(["other"], self.order)
+        self.assertEqual({"host": 1}, scheduler.hosts())
+        self.assertFalse(pending.done())
+
+        release.set()
+        blocker.result(timeout=1)
+        pending.result(timeout=1)
+        self.assertEqual(["other", "host"], self.order)
+        self.assertEqual({}, scheduler.hosts())
+
+    def test_host_limit_keeps_priorities(self):
+        scheduler = DownloadScheduler(max_workers=1, aging_interval=10, max_host_jobs=1)
+        self.addCleanup(scheduler.shutdown)
+        release = Event()
+        started = Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        blocker = scheduler.submit(block, host="host")
+        started.wait(timeout=1)
+        futures = [
+            scheduler.submit(self.order.append, "background", host="host"),
+            scheduler.submit(
+                self.order.append,
+                "interactive",
+                priority=Priority.INTERACTIVE,
+                host="host",
+            ),
+        ]
+        release.set()
+        blocker.result(timeout=1)
+        for future in futures:
+            future.result(timeout=1)
+        self.assertEqual(["interactive", "background"], self.order)
+
+    def test_idle_workers(self):
+        scheduler = DownloadScheduler(max_workers=3, aging_interval=10)
+        self.addCleanup(scheduler.shutdown)
+        self.assertEqual(3, scheduler.idle_workers())
+
+        started = Event()
+        release = Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        future = scheduler.submit(block)
+        started.wait(timeout=1)
+        self.assertEqual(2, scheduler.idle_workers())
+        release.set()
+        future.result(timeout=1)
+        self.assertEqual(3, scheduler.idle_workers())
+
+    def test_idle_workers_with_pending_jobs(self):
+        futures = [self.job("first"), self.job("second")]
+        self.assertEqual(0, self.scheduler.idle_workers())
+        self.run_jobs(futures)
+
+    def test_error(self):
+        def fail():
+            raise RuntimeError("error")
+
+        future = self.scheduler.submit(fail)
+        self.release.set()
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=1)
+
+    def test_shutdown(self):
+        future = self.job("first")
+        self.release.set()
+        self.scheduler.shutdown()
+        self.assertTrue(future.cancelled() or future.done())
+        with self.assertRaises(RuntimeError):
+            self.job("second")
@@ -0,0 +1,109 @@
+from test.util import TestCase
+from threading import Barrier, Thread
+
+from OpenCast.infra.media.ydl_pool import YoutubeDLPool
+
+INFO = {"id": "id", "title": "title", "ext": "mp4"}
+
+
+class YoutubeDLPoolTest(TestCase):
+    def setUp(self):
+        self.pool = YoutubeDLPool()
+        self.addCleanup(self.pool.close)
+
+    def test_reuse_per_profile(self):
+        with self.pool.acquire("video", {"quiet": True}) as ydl:
+            pass
+        with self.pool.acquire("video", {"quiet": True}) as reused:
+            self.assertIs(ydl, reused)
+        with self.pool.acquire("metadata", {"quiet": True}) as other:
+            self.assertIsNot(ydl, other)
+        self.assertEqual(2, self.pool.stats.created)
+        self.assertEqual(1, self.pool.stats.reused)
+
+    def test_instance_per_thread(self):
+        instances = []
+
+        def acquire():
+            with self.pool.acquire("video", {"quiet": True}) as ydl:
+                instances.append(ydl)
+
+        threads = [Thread(target=acquire) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIsNot(instances[0], instances[1])
+
+    def test_concurrent_overrides(self):
+        options = {"quiet": True, "format": "best"}
+        barrier = Barrier(2)
+        results = {}
+
+        def acquire(name):
+            with self.pool.acquire(
+                "video", options, outtmpl=f"/tmp/{name}.mp4", format=name
+            ) as ydl:
+                # Both calls hold their instance with their overrides applied
+                barrier.wait(timeout=5)
+                results[name] = (ydl.prepare_filename(INFO), ydl.params["format"])
+                barrier.wait(timeout=5)
+
+        threads = [Thread(target=acquire, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(("/tmp/a.mp4", "a"), results["a"])
+        self.assertEqual(("/tmp/b.mp4", "b"), results["b"])
+        self.assertEqual({"quiet": True, "format": "best"}, options)
+
+    def test_nested_acquire(self):
+        with self.pool.acquire("video", {"quiet": True}) as ydl:
+            with self.pool.acquire("video", {"quiet": True}) as nested:
+                self.assertIsNot(ydl, nested)
+
+    def test_overrides_restored(self):
+        def hook(_):
+            pass
+
+        options = {"quiet": True, "outtmpl": "/tmp/%(id)s.%(ext)s"}
+        with self.pool.acquire(
+            "subtitle", options, [hook], outtmpl="/tmp/dest.mp4", subtitlesformat="vtt"
+        ) as ydl:
+            self.assertEqual("/tmp/dest.mp4", ydl.prepare_filename(INFO))
+            self.assertEqual("vtt", ydl.params["subtitlesformat"])
+            self.assertEqual([hook], ydl._progress_hooks)
+
+        with self.pool.acquire("subtitle", options) as ydl:
+            self.assertEqual("/tmp/id.mp4", ydl.prepare_filename(INFO))
+            self.assertNotIn("subtitlesformat", ydl.params)
+            self.assertEqual([], ydl._progress_hooks)
+
+    def test_format_override(self):
+        formats = [
+            {"format_id": "low", "url": "http://low", "ext": "mp4", "height": 360},
+            {"format_id": "high", "url": "http://high", "ext": "mp4", "height": 1080},
+        ]
+
+        def select(ydl):
+            selected = ydl.format_selector({"formats": formats})
+            return [fmt["format_id"] for fmt in selected]
+
+        options = {"quiet": True, "format": "best"}
+        with self.pool.acquire("video", options, format="best[height<=480]") as ydl:
+            self.assertEqual("best[height<=480]", ydl.params["format"])
+            self.assertEqual(["low"], select(ydl))
+
+        with self.pool.acquire("video", options) as ydl:
+            self.assertEqual("best", ydl.params["format"])
+            self.assertEqual(["high"], select(ydl))
+
+    def test_overrides_restored_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.acquire("video", {"quiet": True}, outtmpl="/tmp/dest.mp4"):
+                raise RuntimeError()
+
+        with self.pool.acquire("video", {"quiet": True}) as ydl:
+            self.assertNotEqual("/tmp/dest.mp4", ydl.prepare_filename(INFO))
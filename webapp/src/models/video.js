@@ -6,6 +6,7 @@ const VideoState = {
   COLLECTING: "COLLECTING",
   PLAYING: "PLAYING",
   READY: "READY",
+  EVICTED: "EVICTED",
 };
 
 export default class Video {
@@ -21,6 +22,7 @@ export default class Video {
   album_id = null;
   thumbnail = "";
   location = "";
+  downloadFormat = null;
   streams = {};
   subtitle = "";
   downloadRatio = 0;
@@ -40,6 +42,7 @@ export default class Video {
     this.album_id = state.album_id;
     this.thumbnail = state.thumbnail;
     this.location = state.location;
+    this.downloadFormat = state.download_format;
     this.streams = state.streams;
     this.subtitle = state.subtitle;
     this.state = state.state;